@@ -0,0 +1,70 @@
+"""Load test the async order chain against a latency-injecting payment stub.
+
+Usage: python -m benchmarks.bench_async_chain [--orders 500]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.async_chain import AsyncOrderProcessorChain
+from src.patterns.chain import OrderProcessorChain, PaymentProcessor
+from src.patterns.singleton import EquipmentInventory
+
+
+def make_equipment() -> Equipment:
+    specs = EquipmentSpecs("50", "100x50x50", "Steel", "Black", "150", "12")
+    return Equipment("Bench item", "Benchmark item", 100.0, "Bench", specs)
+
+
+async def run_async(order_count: int, delay: float) -> float:
+    """Return wall time to push ``order_count`` concurrent orders through."""
+    async def stub_gateway(order):
+        await asyncio.sleep(delay)
+        return True
+
+    equipment = make_equipment()
+    EquipmentInventory().add_equipment(equipment, order_count)
+    chain = AsyncOrderProcessorChain(payment_handler=stub_gateway)
+    orders = [Order(equipment=equipment, quantity=1, customer_id=f"C{i}") for i in range(order_count)]
+    started = time.perf_counter()
+    await asyncio.gather(*(chain.process_order(order) for order in orders))
+    return time.perf_counter() - started
+
+
+def run_sync(order_count: int, delay: float) -> float:
+    class BlockingPayment(PaymentProcessor):
+        def _validate(self, order):
+            time.sleep(delay)
+            return super()._validate(order)
+
+    equipment = make_equipment()
+    EquipmentInventory().add_equipment(equipment, order_count)
+    chain = OrderProcessorChain()
+    chain.payment_processor = BlockingPayment()
+    chain.stock_validator.set_next(chain.payment_processor).set_next(chain.order_fulfillment)
+    started = time.perf_counter()
+    for i in range(order_count):
+        chain.process_order(Order(equipment=equipment, quantity=1, customer_id=f"C{i}"))
+    return order_count / (time.perf_counter() - started)
+
+
+def main(order_count: int) -> None:
+    logging.disable(logging.WARNING)
+    # With N orders in flight the async wall time should stay close to one
+    # stage latency, i.e. per-order cost does not grow with latency.
+    print(f"{'latency':>8} {'async wall':>11} {'overhead':>9} {'sync orders/s':>14}")
+    for delay_ms in (0, 5, 20, 50, 100):
+        delay = delay_ms / 1000
+        sync_count = max(1, min(order_count, int(2 / delay) if delay else order_count))
+        async_wall = asyncio.run(run_async(order_count, delay))
+        sync_rate = run_sync(sync_count, delay)
+        print(f"{delay_ms:>6}ms {async_wall * 1000:>9.1f}ms {(async_wall - delay) * 1000:>7.1f}ms "
+              f"{sync_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=500)
+    main(parser.parse_args().orders)
@@ -0,0 +1,93 @@
+"""Benchmark request concurrency under slow queries: sync-in-async vs async engine.
+
+Usage: python -m benchmarks.bench_async_db [--requests 32] [--steps 300000]
+
+Each simulated request runs one slow query (a recursive CTE counting to
+``--steps``) from a coroutine, like an ``async def`` endpoint would:
+
+  sync-in-async  sync session called directly; blocks the event loop
+  threadpool     sync session via run_in_threadpool
+  async engine   AsyncSession on sqlite+aiosqlite (needs greenlet and aiosqlite)
+
+"loop lag" is the worst delay seen by a 5 ms heartbeat task, i.e. how long
+other requests could not even be accepted.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+from src.patterns.async_database import async_available, create_async_database_engine
+from src.patterns.database_singleton import create_database_engine
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE counter(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < :steps) "
+    "SELECT count(*) FROM counter"
+)
+
+
+async def measure(label: str, request, count: int) -> None:
+    lag = 0.0
+    running = True
+
+    async def heartbeat():
+        nonlocal lag
+        while running:
+            expected = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - expected)
+
+    monitor = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await monitor
+    print(f"{label:<14} {count} requests: {elapsed:6.2f}s ({count / elapsed:6.1f} req/s), "
+          f"loop lag {lag * 1000:7.1f} ms")
+
+
+async def run(count: int, steps: int, pool_size: int) -> None:
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_database_engine(url, pool_size=pool_size)
+    sessions = sessionmaker(bind=engine)
+
+    def sync_query() -> int:
+        with sessions() as session:
+            return session.execute(SLOW_QUERY, {"steps": steps}).scalar()
+
+    async def blocking_request():
+        return sync_query()
+
+    async def threadpool_request():
+        return await run_in_threadpool(sync_query)
+
+    await measure("sync-in-async", blocking_request, count)
+    await measure("threadpool", threadpool_request, count)
+
+    if not async_available(url):
+        print("async engine   skipped: install \"sqlalchemy[asyncio]\" and aiosqlite")
+        return
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    async_engine = create_async_database_engine(url, pool_size=pool_size)
+    async_sessions = async_sessionmaker(async_engine)
+
+    async def async_request():
+        async with async_sessions() as session:
+            return (await session.execute(SLOW_QUERY, {"steps": steps})).scalar()
+
+    await measure("async engine", async_request, count)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--steps", type=int, default=300_000, help="CTE rows per query")
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.steps, args.pool_size))
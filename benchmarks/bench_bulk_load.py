@@ -0,0 +1,72 @@
+"""Benchmark loading equipment and orders into SQLite: row by row vs bulk upserts.
+
+Usage: python -m benchmarks.bench_bulk_load [--skus 50000] [--orders 100000] [--chunk-size 10000]
+
+"row-by-row" is ``SqlRepository.add_equipment``/``add_order`` with one
+transaction per call (timed on a sample and extrapolated).  "bulk" is
+``bulk_add_equipment``/``bulk_add_orders``: chunked ``executemany`` of
+``INSERT ... ON CONFLICT`` with one transaction per chunk, with and without
+deferring the secondary indexes.  Rows count table rows, so an equipment
+item is three rows (equipment, specs, stock).  Data is generated up front
+and not timed.
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.data_generator import WorkloadGenerator
+from src.patterns.database_singleton import create_database_engine
+from src.patterns.repository import SqlRepository
+
+ROWS_PER_ITEM = 3
+
+
+def fresh_repository() -> SqlRepository:
+    return SqlRepository(create_database_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bulk.db')}"))
+
+
+def report(label: str, rows: int, elapsed: float) -> None:
+    print(f"{label:<34} {rows:>9,} rows in {elapsed:6.2f}s: {rows / elapsed:>9,.0f} rows/s")
+
+
+def row_by_row(catalog, orders, sample: int) -> None:
+    repository = fresh_repository()
+    started = time.perf_counter()
+    for item in catalog[:sample]:
+        repository.add_equipment(item, 10)
+    report("row-by-row equipment", sample * ROWS_PER_ITEM, time.perf_counter() - started)
+    started = time.perf_counter()
+    for order in orders[:sample]:
+        repository.add_order(order)
+    report("row-by-row orders", sample, time.perf_counter() - started)
+    repository.engine.dispose()
+
+
+def bulk(catalog, orders, chunk_size: int, defer_indexes: bool) -> None:
+    label = "bulk, deferred indexes" if defer_indexes else "bulk"
+    repository = fresh_repository()
+    started = time.perf_counter()
+    repository.bulk_add_equipment(((item, 10) for item in catalog), chunk_size, defer_indexes)
+    equipment_time = time.perf_counter() - started
+    report(f"{label} equipment", len(catalog) * ROWS_PER_ITEM, equipment_time)
+    started = time.perf_counter()
+    repository.bulk_add_orders(orders, chunk_size, defer_indexes)
+    order_time = time.perf_counter() - started
+    report(f"{label} orders", len(orders), order_time)
+    report(f"{label} total", len(catalog) * ROWS_PER_ITEM + len(orders), equipment_time + order_time)
+    repository.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=50_000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--sample", type=int, default=2_000, help="rows timed for row-by-row")
+    args = parser.parse_args()
+    generator = WorkloadGenerator(args.skus, seed=1)
+    catalog = list(generator.equipment())
+    orders = list(generator.orders(args.orders, catalog))
+    row_by_row(catalog, orders, args.sample)
+    for defer in (False, True):
+        bulk(catalog, orders, args.chunk_size, defer)
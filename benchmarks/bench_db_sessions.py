@@ -0,0 +1,94 @@
+"""Benchmark concurrent reads/writes: shared session vs pooled per-thread sessions.
+
+Usage: python -m benchmarks.bench_db_sessions [--threads 8] [--ops 2000] [--write-ratio 0.2]
+
+"shared" is the previous setup: default engine without pragmas and one
+session shared by all threads (behind a lock, since a session is not
+thread-safe).  "pooled" uses ``create_database_engine`` (WAL,
+synchronous=NORMAL, mmap) with one session per thread.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from src.patterns.database_singleton import create_database_engine
+
+SCHEMA = "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL)"
+
+
+def seed(engine, rows: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(text(SCHEMA))
+        connection.execute(text("INSERT INTO items (id, name, price) VALUES (:id, :name, :price)"),
+                           [{"id": i, "name": f"Item {i}", "price": 10.0 + i} for i in range(rows)])
+
+
+def worker(session_for, lock, ops: int, rows: int, write_ratio: float, seed_value: int, counts) -> None:
+    rng = random.Random(seed_value)
+    reads = writes = 0
+    for _ in range(ops):
+        with lock:
+            session = session_for()
+            if rng.random() < write_ratio:
+                session.execute(text("UPDATE items SET price = price + 1 WHERE id = :id"),
+                                {"id": rng.randrange(rows)})
+                session.commit()
+                writes += 1
+            else:
+                session.execute(text("SELECT name, price FROM items WHERE id = :id"),
+                                {"id": rng.randrange(rows)}).fetchone()
+                session.commit()
+                reads += 1
+    counts.append((reads, writes))
+
+
+class _NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def run_case(label: str, threads: int, ops: int, rows: int, write_ratio: float) -> None:
+    directory = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    if label == "shared":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        shared = sessionmaker(bind=engine)()
+        session_for, lock = (lambda: shared), threading.Lock()
+    else:
+        engine = create_database_engine(url, pool_size=threads)
+        sessions = scoped_session(sessionmaker(bind=engine))
+        session_for, lock = sessions, _NoLock()
+    seed(engine, rows)
+
+    counts = []
+    workers = [threading.Thread(target=worker, args=(session_for, lock, ops, rows, write_ratio, i, counts))
+               for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    reads = sum(count[0] for count in counts)
+    writes = sum(count[1] for count in counts)
+    print(f"{label:<7} {threads} threads: {(reads + writes) / elapsed:>9,.0f} ops/s "
+          f"({reads / elapsed:,.0f} reads/s, {writes / elapsed:,.0f} writes/s)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=2000, help="operations per thread")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+    for case in ("shared", "pooled"):
+        run_case(case, args.threads, args.ops, args.rows, args.write_ratio)
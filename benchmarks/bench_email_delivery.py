@@ -0,0 +1,46 @@
+"""Benchmark SMTP delivery: connection per message vs pooled batching.
+
+Runs against the in-process SMTP stub (``tests.stubs.smtp_stub``).
+
+Usage: python -m benchmarks.bench_email_delivery [--messages 2000] [--pool 4] [--latency 0.0005]
+"""
+import argparse
+import logging
+import smtplib
+import time
+from tests.stubs.smtp_stub import StubSMTPServer
+from src.models.order import Order
+from src.patterns.email_delivery import SMTPConnectionPool, SMTPEmailNotifier, build_message
+
+
+def run(messages: int, pool_size: int, latency: float) -> None:
+    logging.disable(logging.WARNING)
+    orders = [Order(equipment=None, quantity=0, customer_id=f"CUST{i}",
+                    customer_email=f"user{i}@example.com") for i in range(messages)]
+    with StubSMTPServer(latency=latency) as server:
+        started = time.perf_counter()
+        for order in orders:
+            with smtplib.SMTP(server.host, server.port) as connection:
+                connection.send_message(build_message(order, ["paid"], "orders@sport-store.local"))
+        baseline = messages / (time.perf_counter() - started)
+        print(f"{'per-message connection':<24} {baseline:8,.0f} msg/s ({server.connections} connections)")
+
+    with StubSMTPServer(latency=latency) as server:
+        notifier = SMTPEmailNotifier(SMTPConnectionPool(server.host, server.port, size=pool_size))
+        started = time.perf_counter()
+        for order in orders:
+            notifier.update(order, "paid")
+        notifier.close()
+        pooled = messages / (time.perf_counter() - started)
+        assert len(server.messages) == messages
+        print(f"{f'pool of {pool_size}, batches':<24} {pooled:8,.0f} msg/s ({server.connections} connections)")
+    print(f"speedup: {pooled / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--pool", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0005)
+    args = parser.parse_args()
+    run(args.messages, args.pool, args.latency)
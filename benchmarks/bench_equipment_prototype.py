@@ -0,0 +1,40 @@
+"""Benchmark basic-model builds: director path vs prototype registry clones.
+
+Usage: python -m benchmarks.bench_equipment_prototype [--builds 100000]
+"""
+import argparse
+import itertools
+import time
+from src.patterns.builder import EquipmentDirector, PowerRackBuilder, TreadmillBuilder
+from src.patterns.prototype import EquipmentPrototypeRegistry
+
+
+def run(builds: int) -> None:
+    requests = list(itertools.islice(
+        itertools.cycle(itertools.product(
+            (TreadmillBuilder, PowerRackBuilder), EquipmentDirector.get_available_colors()
+        )), builds
+    ))
+
+    started = time.perf_counter()
+    for builder_type, color in requests:
+        EquipmentDirector(builder_type()).build_basic_model(color)
+    director_seconds = time.perf_counter() - started
+
+    registry = EquipmentPrototypeRegistry()
+    started = time.perf_counter()
+    for builder_type, color in requests:
+        registry.build(builder_type, color)
+    registry_seconds = time.perf_counter() - started
+
+    print(f"builds:              {builds:,} ({len(registry)} templates)")
+    print(f"director:            {builds / director_seconds:,.0f} builds/s")
+    print(f"prototype registry:  {builds / registry_seconds:,.0f} builds/s")
+    print(f"speedup:             {director_seconds / registry_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--builds", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.builds)
@@ -0,0 +1,52 @@
+"""Benchmark event dispatch with 100 subscribers spread over 20 topics.
+
+Compares broadcast (every observer sees every event and filters itself)
+with topic-indexed subscriptions.
+
+Usage: python -m benchmarks.bench_event_bus [--events 100000]
+"""
+import argparse
+import logging
+import time
+from src.models.order import Order
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+TOPICS = [f"topic{index}" for index in range(20)]
+SUBSCRIBERS = 100
+
+
+class FilteringObserver(OrderObserver):
+    """Broadcast-style observer that ignores other topics itself."""
+    def __init__(self, topic: str):
+        self.topic = topic
+        self.handled = 0
+
+    def update(self, order: Order, event_type: str) -> None:
+        if event_type == self.topic:
+            self.handled += 1
+
+
+def run(events: int) -> None:
+    logging.disable(logging.INFO)
+    order = Order(equipment=None, quantity=0, customer_id="CUST001")
+    stream = [TOPICS[index % len(TOPICS)] for index in range(events)]
+    for label, indexed in (("broadcast", False), ("topic index", True)):
+        system = NotificationSystem()
+        observers = [FilteringObserver(TOPICS[index % len(TOPICS)]) for index in range(SUBSCRIBERS)]
+        for observer in observers:
+            if indexed:
+                system.subscribe(observer, observer.topic)
+            else:
+                system.attach(observer)
+        started = time.perf_counter()
+        for event_type in stream:
+            system.notify(order, event_type)
+        elapsed = time.perf_counter() - started
+        handled = sum(observer.handled for observer in observers)
+        print(f"{label:<12} {elapsed / events * 1e6:7.2f} us per event, {handled:,} deliveries handled")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100000)
+    run(parser.parse_args().events)
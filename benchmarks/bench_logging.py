@@ -0,0 +1,75 @@
+"""Benchmark order throughput with logging off, inline and queued.
+
+Each order runs through the order chain, which logs every notification.
+"inline" writes from the calling thread like ``logging.basicConfig``;
+"queued" uses ``configure_logging`` (QueueHandler + listener thread).
+``--sink-latency`` adds a per-record write delay, standing in for a
+terminal, pipe or log shipper that blocks.
+
+Usage: python -m benchmarks.bench_logging [--orders 5000] [--sink-latency 0.0001]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from src.logging_setup import configure_logging, stop_logging
+from src.models.order import Order
+from src.patterns.chain import OrderProcessorChain
+from src.patterns.observer import EmailNotifier, NotificationSystem, SMSNotifier
+
+
+class SlowFileHandler(logging.FileHandler):
+    """File handler whose writes block for a fixed time."""
+    def __init__(self, path: str, latency: float):
+        super().__init__(path)
+        self.latency = latency
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def run_orders(orders: int) -> float:
+    system = NotificationSystem()
+    system.attach(EmailNotifier())
+    system.attach(SMSNotifier())
+    chain = OrderProcessorChain(system)
+    batch = [Order(equipment=None, quantity=0, customer_id=f"CUST{i}", customer_email="c@example.com",
+                   customer_name="Customer") for i in range(orders)]
+    started = time.perf_counter()
+    for order in batch:
+        chain.process_order(order)
+        system.notify(order, "created")
+    return orders / (time.perf_counter() - started)
+
+
+def run(orders: int, latency: float) -> None:
+    root = logging.getLogger()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.log")
+
+        root.setLevel(logging.WARNING)
+        print(f"{'off':<8} {run_orders(orders):10,.0f} orders/s")
+
+        inline = SlowFileHandler(path, latency)
+        root.addHandler(inline)
+        root.setLevel(logging.INFO)
+        print(f"{'inline':<8} {run_orders(orders):10,.0f} orders/s")
+        root.removeHandler(inline)
+        inline.close()
+
+        configure_logging(handler=SlowFileHandler(path, latency))
+        print(f"{'queued':<8} {run_orders(orders):10,.0f} orders/s")
+        configure_logging(handler=SlowFileHandler(path, latency), sample_rates={"src.patterns.observer": 0.01})
+        print(f"{'sampled':<8} {run_orders(orders):10,.0f} orders/s")
+        stop_logging()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--sink-latency", type=float, default=0.0001)
+    args = parser.parse_args()
+    run(args.orders, args.sink_latency)
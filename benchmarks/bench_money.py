@@ -0,0 +1,70 @@
+"""Benchmark the integer-cents strategy path against the old float formula.
+
+Both sides price the same lines through ``calculate_price_cents`` /
+``calculate_price`` of a ``BulkPricingStrategy``: "cents" is the code the
+app runs, "float" is that strategy with the float arithmetic it used before
+the money kernel.  The raw ``line_totals`` kernel is timed for reference.
+
+Usage: python -m benchmarks.bench_money [--lines 200000] [--rounds 5]
+"""
+import argparse
+import random
+import time
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.money import line_totals, to_cents
+from src.patterns.strategy import BulkPricingStrategy
+
+
+class FloatBulkPricing(BulkPricingStrategy):
+    """``BulkPricingStrategy`` with its previous float arithmetic."""
+
+    def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        base_total = equipment.base_price * quantity
+        if quantity >= self.threshold:
+            return base_total - base_total * (self.discount_percent / 100)
+        return base_total
+
+
+def make_equipment(rng: random.Random, count: int):
+    specs = EquipmentSpecs("75.0", "200x100x220", "Steel", "Black", "150.0", "12")
+    return [Equipment(name=f"Item {index}", description="Benchmark item",
+                      base_price=round(rng.uniform(5, 5000), 2), category="Bench", specs=specs)
+            for index in range(count)]
+
+
+def run(lines: int, rounds: int = 5) -> None:
+    rng = random.Random(42)
+    catalog = make_equipment(rng, 1000)
+    items = [catalog[rng.randrange(len(catalog))] for _ in range(lines)]
+    quantities = [rng.randint(1, 20) for _ in range(lines)]
+    unit_cents = [to_cents(item.base_price) for item in items]
+    cents_strategy = BulkPricingStrategy(discount_percent=12.5)
+    float_strategy = FloatBulkPricing(discount_percent=12.5)
+
+    jobs = {
+        "float": lambda: [float_strategy.calculate_price(item, quantity)
+                          for item, quantity in zip(items, quantities)],
+        "cents": lambda: [cents_strategy.calculate_price_cents(item, quantity)
+                          for item, quantity in zip(items, quantities)],
+        "kernel": lambda: line_totals(unit_cents, quantities, 10000 - 1250),
+    }
+    # Rounds interleave the jobs so machine noise hits them alike
+    results = dict.fromkeys(jobs, float("inf"))
+    for _ in range(rounds):
+        for label, job in jobs.items():
+            started = time.perf_counter()
+            job()
+            results[label] = min(results[label], time.perf_counter() - started)
+    for label, best in results.items():
+        print(f"{label:<6} {lines:,} lines in {best:.3f}s ({lines / best / 1e6:.2f}M lines/s)")
+    print(f"cents/float time ratio: {results['cents'] / results['float']:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.lines, arguments.rounds)
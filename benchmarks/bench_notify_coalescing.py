@@ -0,0 +1,51 @@
+"""Benchmark backend calls per order with and without event coalescing.
+
+Usage: python -m benchmarks.bench_notify_coalescing [--orders 10000]
+"""
+import argparse
+import logging
+import time
+from src.models.order import Order
+from src.patterns.coalescing import EventCoalescer
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+EVENTS = ("stock_validated", "paid", "fulfilled", "created")
+
+
+class CountingBackend(OrderObserver):
+    """Observer that counts messages it would send."""
+    def __init__(self):
+        self.sent = 0
+
+    def update(self, order: Order, event_type: str) -> None:
+        self.sent += 1
+
+    def update_digest(self, order: Order, event_types) -> None:
+        self.sent += 1
+
+
+def run(orders: int) -> None:
+    logging.disable(logging.INFO)
+    batch = [Order(equipment=None, quantity=0, customer_id=f"CUST{i}") for i in range(orders)]
+    calls = {}
+    for label, coalescer in (("per-event", None), ("coalesced", EventCoalescer(window=0.5))):
+        system = NotificationSystem(coalescer=coalescer)
+        backends = [CountingBackend(), CountingBackend()]
+        for backend in backends:
+            system.attach(backend)
+        started = time.perf_counter()
+        for order in batch:
+            for event_type in EVENTS:
+                system.notify(order, event_type)
+        system.flush()
+        elapsed = time.perf_counter() - started
+        calls[label] = sum(backend.sent for backend in backends)
+        print(f"{label:<10} {calls[label] / orders:.2f} backend calls per order, "
+              f"{elapsed / orders * 1e6:.1f} us notify time per order")
+    print(f"reduction: {calls['per-event'] / calls['coalesced']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=10000)
+    run(parser.parse_args().orders)
@@ -0,0 +1,50 @@
+"""Benchmark notify latency with slow observers, inline vs background dispatch.
+
+Usage: python -m benchmarks.bench_notify_dispatch [--orders 200] [--delay 0.002]
+"""
+import argparse
+import logging
+import time
+from src.models.order import Order
+from src.patterns.dispatcher import ObserverDispatcher
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+EVENTS = ("stock_validated", "paid", "fulfilled", "created")
+
+
+class SlowBackend(OrderObserver):
+    """Observer with a fixed backend latency."""
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def update(self, order: Order, event_type: str) -> None:
+        time.sleep(self.delay)
+
+
+def run(orders: int, delay: float) -> None:
+    logging.disable(logging.INFO)
+    batch = [Order(equipment=None, quantity=0, customer_id=f"CUST{i}") for i in range(orders)]
+    for label, dispatcher in (("inline", None), ("dispatcher", ObserverDispatcher(maxsize=10000))):
+        system = NotificationSystem(dispatcher)
+        system.attach(SlowBackend(delay))
+        system.attach(SlowBackend(delay))
+        started = time.perf_counter()
+        for order in batch:
+            for event_type in EVENTS:
+                system.notify(order, event_type)
+        request_time = time.perf_counter() - started
+        system.flush()
+        total = time.perf_counter() - started
+        print(f"{label:<10} notify per order {request_time / orders * 1000:7.3f} ms, "
+              f"all delivered after {total:.2f}s")
+        if dispatcher is not None:
+            print(f"{'':<10} max queue depth {max(lane['max_depth'] for lane in dispatcher.metrics()['observers'].values())}")
+            dispatcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.002)
+    args = parser.parse_args()
+    run(args.orders, args.delay)
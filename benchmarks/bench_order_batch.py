@@ -0,0 +1,53 @@
+"""Benchmark OrderProcessorChain.process_many against the per-order loop.
+
+Usage: python -m benchmarks.bench_order_batch [--orders 10000] [--skus 50]
+"""
+import argparse
+import logging
+import random
+import time
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.chain import OrderProcessorChain
+from src.patterns.singleton import EquipmentInventory
+
+
+def make_catalog(skus: int):
+    specs = EquipmentSpecs("50", "100x50x50", "Steel", "Black", "150", "12")
+    return [Equipment(f"Item {i}", "Benchmark item", 100.0 + i, "Bench", specs) for i in range(skus)]
+
+
+def make_orders(catalog, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [Order(equipment=rng.choice(catalog), quantity=rng.randint(1, 3), customer_id=f"C{i}")
+            for i in range(count)]
+
+
+def run(order_count: int, skus: int) -> None:
+    logging.disable(logging.INFO)
+    inventory = EquipmentInventory()
+    catalog = make_catalog(skus)
+    chain = OrderProcessorChain()
+
+    for label in ("per-order loop", "process_many"):
+        inventory.clear()
+        for item in catalog:
+            inventory.add_equipment(item, order_count * 3)
+        orders = make_orders(catalog, order_count)
+        started = time.perf_counter()
+        if label == "process_many":
+            results = chain.process_many(orders)
+        else:
+            results = [chain.process_order(order) for order in orders]
+        elapsed = time.perf_counter() - started
+        print(f"{label:<15} {order_count:,} orders / {skus} SKUs: {elapsed:.3f}s "
+              f"({order_count / elapsed:,.0f} orders/s, {sum(results):,} ok)")
+    inventory.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--skus", type=int, default=50)
+    args = parser.parse_args()
+    run(args.orders, args.skus)
@@ -0,0 +1,54 @@
+"""Benchmark the payment gateway client against the stub gateway.
+
+By default the stub runs in-process through ``httpx.ASGITransport``; pass
+``--url`` to target a stub started with
+``uvicorn tests.stubs.payment_stub:app --port 8100``.
+
+Usage: python -m benchmarks.bench_payment_gateway [--charges 1000] [--url URL]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import httpx
+from tests.stubs.payment_stub import create_stub_gateway
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.payment_gateway import CircuitBreaker, PaymentGatewayClient
+
+
+async def run_scenario(charges: int, latency: float, failure_rate: float, url: str = None) -> None:
+    if url:
+        async with httpx.AsyncClient(base_url=url) as admin:
+            await admin.post("/config", json={"latency": latency, "failure_rate": failure_rate})
+        transport = None
+    else:
+        transport = httpx.ASGITransport(app=create_stub_gateway(latency, failure_rate, seed=1))
+
+    specs = EquipmentSpecs("50", "100x50x50", "Steel", "Black", "150", "12")
+    equipment = Equipment("Bench item", "Benchmark item", 100.0, "Bench", specs)
+    orders = [Order(equipment=equipment, quantity=1, customer_id=f"C{i}") for i in range(charges)]
+    breaker = CircuitBreaker(failure_threshold=20, reset_timeout=0.5)
+    client = PaymentGatewayClient(url or "http://stub", max_concurrency=64, timeout=1.0,
+                                  breaker=breaker, transport=transport)
+    started = time.perf_counter()
+    async with client:
+        results = await asyncio.gather(*(client(order) for order in orders))
+    elapsed = time.perf_counter() - started
+    print(f"latency={latency * 1000:>5.0f}ms failures={failure_rate:>4.0%}: "
+          f"{charges / elapsed:>8,.0f} charges/s, {sum(results):,}/{charges:,} approved, "
+          f"breaker={breaker.state}")
+
+
+def main(charges: int, url: str) -> None:
+    logging.disable(logging.ERROR)
+    for latency, failure_rate in ((0.0, 0.0), (0.01, 0.0), (0.05, 0.0), (0.01, 0.2), (0.01, 1.0)):
+        asyncio.run(run_scenario(charges, latency, failure_rate, url))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--charges", type=int, default=1000)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+    main(args.charges, args.url)
@@ -0,0 +1,41 @@
+"""Benchmark promo code store memory and lookup latency.
+
+Usage: python -m benchmarks.bench_promo_codes [--codes 10000000]
+"""
+import argparse
+import time
+import tracemalloc
+from src.patterns.promo_codes import PromoCodeStore
+
+
+def run(codes: int, lookups: int) -> None:
+    tracemalloc.start()
+    store = PromoCodeStore(expected_codes=codes)
+    started = time.perf_counter()
+    store.bulk_add((f"CAMPAIGN-{i:010d}", 10.0, None, 1) for i in range(codes))
+    load_seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = store.memory_stats()
+    print(f"codes loaded:        {codes:,} in {load_seconds:.1f}s")
+    print(f"bytes per code:      {current / codes:.1f} (arrays {stats['array_bytes'] / codes:.1f}, "
+          f"bloom {stats['bloom_bytes'] / codes:.2f}, k={stats['bloom_hash_count']})")
+
+    hits = [f"CAMPAIGN-{(i * 7919) % codes:010d}" for i in range(lookups)]
+    misses = [f"BOT-{i:010d}" for i in range(lookups)]
+    for label, sample in (("valid lookup", hits), ("invalid lookup", misses)):
+        started = time.perf_counter()
+        for code in sample:
+            store.get_discount(code)
+        elapsed = time.perf_counter() - started
+        print(f"{label + ':':<20} {elapsed / lookups * 1e9:.0f} ns/op")
+    print(f"bloom rejections:    {store.bloom_rejections:,} of {lookups:,} invalid")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--codes", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.codes, args.lookups)
@@ -0,0 +1,40 @@
+"""Generate a synthetic catalog and order stream as NDJSON.
+
+Usage: python scripts/generate_workload.py --skus 1000000 --orders 5000000 \
+           --catalog catalog.ndjson --orders-out orders.ndjson [--seed 42] [--skew 1.1]
+
+Items and orders are streamed to disk, so memory stays flat at any size.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_generator import WorkloadGenerator, write_ndjson  # noqa: E402
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of SKU popularity")
+    parser.add_argument("--catalog", help="write catalog items to this file")
+    parser.add_argument("--orders-out", help="write orders to this file")
+    args = parser.parse_args(argv)
+
+    generator = WorkloadGenerator(args.skus, seed=args.seed, skew=args.skew)
+    if args.catalog:
+        started = time.perf_counter()
+        count = write_ndjson((item.to_dict() for item in generator.equipment()), args.catalog)
+        print(f"{count:,} items written to {args.catalog} in {time.perf_counter() - started:.1f}s")
+    if args.orders and args.orders_out:
+        started = time.perf_counter()
+        count = write_ndjson(generator.order_records(args.orders), args.orders_out)
+        print(f"{count:,} orders written to {args.orders_out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Summarize spans exported by ``NDJSONSpanExporter``.
+
+Usage: python scripts/span_report.py spans.ndjson [--folded stacks.txt]
+
+Prints a per-stage latency table; ``--folded`` also writes folded stacks
+that can be fed to ``flamegraph.pl`` or speedscope.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.patterns.tracing import load_spans, stage_summary, folded_stacks  # noqa: E402
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--folded", help="write folded stacks to this file")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.path)
+    summary = stage_summary(spans)
+    print(f"{'span':<40} {'count':>8} {'total ms':>10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, row in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<40} {row['count']:>8} {row['total_ms']:>10.2f} {row['mean_ms']:>9.3f} "
+              f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f}")
+
+    if args.folded:
+        with open(args.folded, "w", encoding="utf-8") as file:
+            for stack, self_us in sorted(folded_stacks(spans).items()):
+                file.write(f"{stack} {self_us}\n")
+        print(f"Folded stacks written to {args.folded}")
+
+
+if __name__ == "__main__":
+    main()
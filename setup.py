@@ -3,13 +3,17 @@ from setuptools import setup, find_packages
 setup(
     name="sport-equipment-store",
     version="1.0.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=[
         "fastapi==0.109.2",
         "uvicorn==0.27.1",
         "pytest==8.0.0",
         "pytest-cov==4.1.0",
         "httpx==0.26.0",
-        "python-multipart==0.0.9"
+        "python-multipart==0.0.9",
+        "SQLAlchemy==2.1.4",
+        "aiosqlite==0.22.1",
+        "greenlet==3.5.6",
+        "sortedcontainers==2.4.0"
     ],
 ) 
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import List
+import logging
+import os
+import re
+from typing import List, Optional
 from uuid import uuid4
-from datetime import datetime
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import ValidationError  # Add this import
 from src.api.models import (
     EquipmentCreate,
@@ -11,7 +14,8 @@ from src.api.models import (
     DecorationRequest,
     CreateOrderModel,
     OrderModel,
-    OrderResponse
+    OrderResponse,
+    OrderEventModel
 )
 from src.models.equipment import Equipment, EquipmentSpecs
 from src.models.order import Order
@@ -22,23 +26,160 @@ from src.patterns.decorator import (
     InsuranceDecorator
 )
 from src.patterns.singleton import EquipmentInventory
-from src.patterns.chain import OrderProcessorChain
+from src.patterns.async_chain import AsyncOrderProcessorChain, approve_payment
+from src.patterns.payment_gateway import PaymentGatewayClient
 from src.patterns.observer import NotificationSystem, EmailNotifier, SMSNotifier
+from src.patterns.dispatcher import ObserverDispatcher, DROP_OLDEST
+from src.patterns.coalescing import EventCoalescer
+from src.patterns.event_history import EventHistory
+from src.patterns.price_cache import price_cache
+from src.patterns.pricing_calendar import season_calendar
+from src.patterns.tracing import tracer, NDJSONSpanExporter
+from src.patterns.saga import SqlSagaLog
+from src.patterns.outbox import Outbox, OutboxRelay
+from src.patterns.database_singleton import create_database_engine
+from src.patterns.async_database import AsyncDatabase
+from src.patterns.repository import SqlRepository
 from src.data_init import initialize_sample_data
+from src.logging_setup import configure_logging, parse_sample_rates, stop_logging
 
 EQUIPMENT_NOT_FOUND_MESSAGE = "Equipment not found"
 
 app = FastAPI()
 
-# Initialize sample data
-initialize_sample_data()
+# INVENTORY_BACKEND=sql keeps equipment, stock and orders in the store
+# database; sample data is then only loaded into an empty database
+if os.environ.get("INVENTORY_BACKEND", "memory") == "sql":
+    EquipmentInventory().use_repository(SqlRepository())
+    if not EquipmentInventory().list_equipment(limit=1).items:
+        initialize_sample_data()
+else:
+    # Initialize sample data
+    initialize_sample_data()
 
-# Initialize notification system
-notification_system = NotificationSystem()
+# Initialize notification system; observers run on background workers so
+# slow email/SMS backends stay off the request path, and each order's events
+# are coalesced into one digest per observer
+notification_system = NotificationSystem(
+    ObserverDispatcher(
+        maxsize=int(os.environ.get("NOTIFY_QUEUE_SIZE", "1000")),
+        policy=os.environ.get("NOTIFY_OVERFLOW_POLICY", DROP_OLDEST),
+        workers=int(os.environ.get("NOTIFY_WORKERS", "1")),
+        spill_dir=os.environ.get("NOTIFY_SPILL_DIR", "notify-spill")
+    ),
+    EventCoalescer(window=float(os.environ.get("NOTIFY_COALESCE_WINDOW", "0.5"))),
+    EventHistory(capacity=int(os.environ.get("EVENT_HISTORY_CAPACITY", "100000")))
+)
 email_notifier = EmailNotifier()
 sms_notifier = SMSNotifier()
-notification_system.attach(email_notifier)
-notification_system.attach(sms_notifier)
+notification_system.attach(email_notifier, lane="email")
+notification_system.attach(sms_notifier, lane="sms")
+
+# Order processing chain is stateless, so it is built once and shared;
+# the async variant lets I/O-bound stages yield to the event loop
+payment_gateway_url = os.environ.get("PAYMENT_GATEWAY_URL")
+payment_gateway = PaymentGatewayClient(payment_gateway_url) if payment_gateway_url else None
+# Stage history is persisted when a saga database is configured, so orders
+# interrupted by a restart are resumed or compensated at startup
+saga_database_url = os.environ.get("SAGA_DATABASE_URL")
+saga_log = SqlSagaLog(create_database_engine(saga_database_url)) if saga_database_url else None
+order_processor_chain = AsyncOrderProcessorChain(
+    notification_system,
+    payment_gateway or approve_payment,
+    refund_handler=payment_gateway.refund if payment_gateway else None,
+    saga_log=saga_log,
+    blocking_inventory=EquipmentInventory().repository.blocking
+)
+
+# "created" notifications go through a durable outbox in the store database
+# and are delivered by a background relay.  On the SQL backend the outbox
+# row commits in the order's own transaction, so a stored order always has
+# its event; the in-memory backend keeps no orders across a crash anyway.
+# The relay runs the observers itself, so a row is only marked delivered
+# once they have handled it.  The table is created at startup, not on import.
+outbox = Outbox(create_tables=False)
+outbox_relay = OutboxRelay(outbox, notification_system.notify_now)
+
+# Export spans as NDJSON when a path is configured
+span_export_path = os.environ.get("SPAN_EXPORT_PATH")
+span_exporter = NDJSONSpanExporter(span_export_path) if span_export_path else None
+if span_exporter is not None:
+    tracer.add_exporter(span_exporter)
+TRACE_ID_PATTERN = re.compile(r"[0-9A-Za-z-]{1,64}")
+
+async def inventory_call(method, *args):
+    """Call an inventory method, in the threadpool when its backend does blocking I/O."""
+    if EquipmentInventory().repository.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+async def store_order(order: Order) -> None:
+    """Store an order with its "created" outbox row, off the event loop."""
+    def record_created(connection) -> None:
+        outbox.add(order, "created", connection)
+
+    await run_in_threadpool(EquipmentInventory().add_order, order, record_created)
+
+@app.on_event("startup")
+async def start_logging():
+    """Move log I/O to a background listener.
+
+    LOG_SAMPLE_RATES thins out chatty loggers, e.g. "src.patterns.observer=0.01".
+    """
+    configure_logging(
+        level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper()),
+        json_format=os.environ.get("LOG_FORMAT", "json") == "json",
+        sample_rates=parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", ""))
+    )
+
+@app.on_event("startup")
+async def start_pricing_calendar():
+    """Switch the seasonal pricing snapshot at each season boundary."""
+    season_calendar.start()
+
+@app.on_event("startup")
+async def recover_orders():
+    """Create the outbox table, then finish or unwind orders left in flight by a previous run."""
+    await run_in_threadpool(outbox.create_tables)
+    if saga_log is not None:
+        for recovery in await order_processor_chain.recover():
+            # Resumed orders never reached create_order's bookkeeping
+            if recovery.completed:
+                await store_order(recovery.order)
+    outbox_relay.start()
+
+@app.on_event("shutdown")
+async def drain_notifications():
+    """Deliver buffered and queued notifications before exiting."""
+    outbox_relay.stop(timeout=5.0)
+    season_calendar.stop()
+    notification_system.coalescer.stop(timeout=5.0)
+    notification_system.flush(timeout=5.0)
+    notification_system.dispatcher.close(timeout=5.0)
+    if payment_gateway is not None:
+        await payment_gateway.aclose()
+    await AsyncDatabase().dispose()
+    if span_exporter is not None:
+        tracer.remove_exporter(span_exporter)
+        span_exporter.close()
+    stop_logging()
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Wrap every request in a trace span and return its trace ID."""
+    # Client trace IDs are echoed back, so anything unexpected gets a fresh one
+    trace_header = request.headers.get("X-Trace-Id")
+    if trace_header is not None and not TRACE_ID_PATTERN.fullmatch(trace_header):
+        trace_header = None
+    with tracer.trace(trace_header) as trace_id:
+        with tracer.span(f"{request.method} unmatched") as span:
+            response = await call_next(request)
+            # Name spans after the route template so histograms stay bounded
+            route = request.scope.get("route")
+            if route is not None:
+                span.name = f"{request.method} {route.path}"
+    response.headers["X-Trace-Id"] = trace_id
+    return response
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
@@ -53,22 +194,50 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/metrics/price-cache")
+async def price_cache_metrics():
+    """Price cache hit-ratio metrics."""
+    return price_cache.stats()
+
+@app.get("/metrics/notifications")
+async def notification_metrics():
+    """Notification queue depth, delivery and coalescing counters."""
+    coalescer = notification_system.coalescer
+    return {
+        **notification_system.dispatcher.metrics(),
+        "coalescing": {**coalescer.stats, "pending_orders": coalescer.pending}
+    }
+
+@app.get("/metrics/outbox")
+async def outbox_metrics():
+    """Outbox relay counters, pending rows and lag."""
+    return await run_in_threadpool(outbox_relay.metrics)
+
+@app.get("/metrics/spans")
+async def span_metrics():
+    """Per-stage duration histograms."""
+    return tracer.histograms()
+
 @app.post("/equipment/", response_model=EquipmentResponse)
 async def create_equipment(equipment_data: EquipmentCreate):
     """Create new equipment."""
     # Convert API specs to domain specs
     specs = equipment_data.specs.to_domain()
     
-    equipment = Equipment(
-        name=equipment_data.name,
-        description=equipment_data.description,
-        base_price=equipment_data.base_price,
-        category=equipment_data.category,
-        specs=specs
-    )
+    try:
+        equipment = Equipment(
+            name=equipment_data.name,
+            description=equipment_data.description,
+            base_price=equipment_data.base_price,
+            category=equipment_data.category,
+            specs=specs,
+            attributes=equipment_data.attributes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     inventory = EquipmentInventory()
-    inventory.add_equipment(equipment, 1)
+    await inventory_call(inventory.add_equipment, equipment, 1)
     
     return equipment
 
@@ -76,7 +245,7 @@ async def create_equipment(equipment_data: EquipmentCreate):
 async def decorate_equipment(equipment_id: str, decoration: DecorationRequest):
     """Decorate equipment with additional features."""
     inventory = EquipmentInventory()
-    equipment = inventory.get_equipment(equipment_id)
+    equipment = await inventory_call(inventory.get_equipment, equipment_id)
     
     if not equipment:
         raise HTTPException(status_code=404, detail=EQUIPMENT_NOT_FOUND_MESSAGE)
@@ -104,7 +273,11 @@ async def decorate_equipment(equipment_id: str, decoration: DecorationRequest):
         raise HTTPException(status_code=400, detail="Invalid decoration type")
     
     # Update equipment in inventory
-    inventory.update_equipment(equipment_id, decorated)
+    try:
+        await inventory_call(inventory.update_equipment, equipment_id, decorated)
+    except ValueError as e:
+        # The SQL backend cannot store decorator layers
+        raise HTTPException(status_code=400, detail=str(e))
     
     return decorated
 
@@ -112,13 +285,13 @@ async def decorate_equipment(equipment_id: str, decoration: DecorationRequest):
 async def get_equipment():
     """Get all equipment."""
     inventory = EquipmentInventory()
-    return list(inventory._equipment_items.values())
+    return await inventory_call(inventory.get_all_equipment)
 
 @app.get("/equipment/{equipment_id}", response_model=EquipmentResponse)
 async def get_equipment_by_id(equipment_id: str):
     """Get equipment by ID."""
     inventory = EquipmentInventory()
-    equipment = inventory.get_equipment(equipment_id)
+    equipment = await inventory_call(inventory.get_equipment, equipment_id)
     if not equipment:
         raise HTTPException(status_code=404, detail=EQUIPMENT_NOT_FOUND_MESSAGE)
     return equipment
@@ -128,7 +301,7 @@ async def create_order(order_data: CreateOrderModel):
     """Create a new order."""
     try:
         inventory = EquipmentInventory()
-        equipment = inventory.get_equipment(order_data.equipment_id)
+        equipment = await inventory_call(inventory.get_equipment, order_data.equipment_id)
         
         if not equipment:
             raise HTTPException(status_code=404, detail=EQUIPMENT_NOT_FOUND_MESSAGE)
@@ -150,15 +323,12 @@ async def create_order(order_data: CreateOrderModel):
         )
         
         # Process order through chain
-        processor_chain = OrderProcessorChain()
-        if not processor_chain.process_order(order):
+        if not await order_processor_chain.process_order(order):
             raise HTTPException(status_code=400, detail="Order processing failed")
         
-        # Add order to inventory
-        inventory.add_order(order)
-        
-        # Notify observers about the new order
-        notification_system.notify(order, "created")
+        # Add order to inventory and record its notification in the outbox
+        await store_order(order)
+        outbox_relay.wake()
         
         return OrderResponse(
             id=order.id,
@@ -166,7 +336,7 @@ async def create_order(order_data: CreateOrderModel):
             customer_id=order.customer_id,
             quantity=order.quantity,
             status=order.status,
-            created_at=datetime.now()
+            created_at=order.created_at
         )
         
     except ValidationError as e:
@@ -175,21 +345,47 @@ async def create_order(order_data: CreateOrderModel):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/orders", response_model=List[OrderModel])
-async def get_orders(customer_id: str = None):
-    """Get all orders or orders for a specific customer."""
+async def get_orders(response: Response, customer_id: str = None, status: str = None,
+                     limit: Optional[int] = None, after: Optional[str] = None):
+    """Get all orders or orders for a specific customer.
+
+    With ``limit`` the orders are paged; the cursor of the next page is
+    returned in the ``X-Next-Cursor`` header and passed back as ``after``.
+    """
     inventory = EquipmentInventory()
-    orders = []
-    
-    for order in inventory.get_all_orders():
-        if customer_id is None or order.customer_id == customer_id:
-            orders.append(OrderModel(
-                id=order.id,
-                customer_id=order.customer_id,
-                equipment_id=order.equipment.id if order.equipment else None,
-                quantity=order.quantity,
-                total_amount=order.get_total_price(),
-                status=order.status,
-                created_at=datetime.now()  # For simplicity, using current time
-            ))
-    
-    return orders
\ No newline at end of file
+    if limit is None:
+        orders = [order for order in await inventory_call(inventory.get_all_orders)
+                  if (customer_id is None or order.customer_id == customer_id)
+                  and (status is None or order.status == status)]
+    else:
+        try:
+            page = await inventory_call(inventory.list_orders, customer_id, status, after, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        orders = page.items
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return [
+        OrderModel(
+            id=order.id,
+            customer_id=order.customer_id,
+            equipment_id=order.equipment.id if order.equipment else None,
+            quantity=order.quantity,
+            total_amount=order.get_total_price(),
+            status=order.status,
+            created_at=order.created_at
+        )
+        for order in orders
+    ]
+
+@app.get("/orders/{order_id}/timeline", response_model=List[OrderEventModel])
+async def get_order_timeline(order_id: str):
+    """Recorded events of an order, oldest first."""
+    events = notification_system.history.timeline(order_id)
+    if not events and await inventory_call(EquipmentInventory().get_order, order_id) is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return [
+        OrderEventModel(event_type=event.event_type, timestamp=event.timestamp)
+        for event in events
+    ]
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, validator
 from datetime import datetime
 from src.models.equipment import EquipmentSpecs
@@ -85,6 +85,11 @@ class OrderResponse(BaseModel):
     status: str
     created_at: datetime
 
+class OrderEventModel(BaseModel):
+    """API model for one entry of an order's timeline."""
+    event_type: str
+    timestamp: datetime
+
 class DecorationInfo(BaseModel):
     type: str  # "warranty", "installation", "maintenance", "insurance"
     years: Optional[int] = None  # For warranty
@@ -109,6 +114,7 @@ class EquipmentCreate(BaseModel):
     base_price: float
     category: str
     specs: EquipmentSpecsAPI
+    attributes: Dict[str, Union[bool, int, float]] = {}
 
 class EquipmentResponse(BaseModel):
     """API model for equipment response."""
@@ -118,6 +124,7 @@ class EquipmentResponse(BaseModel):
     base_price: float
     category: str
     specs: EquipmentSpecsAPI
+    attributes: Dict[str, Union[bool, int, float]] = {}
 
     @classmethod
     def from_domain(cls, equipment):
@@ -128,7 +135,8 @@ class EquipmentResponse(BaseModel):
             description=equipment.description,
             base_price=equipment.base_price,
             category=equipment.category,
-            specs=EquipmentSpecsAPI.from_domain(equipment.specs)
+            specs=EquipmentSpecsAPI.from_domain(equipment.specs),
+            attributes=equipment.attributes
         )
 
 class DecorationRequest(BaseModel):
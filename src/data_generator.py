@@ -0,0 +1,231 @@
+"""Synthetic catalog and order workloads.
+
+``WorkloadGenerator`` streams a seeded catalog of ``Equipment`` built with
+the equipment builders, and an order stream whose SKU popularity follows a
+Zipf distribution.  Everything is produced lazily, so a million-SKU catalog
+can be written to NDJSON without keeping the items in memory::
+
+    generator = WorkloadGenerator(skus=1_000_000, seed=42)
+    write_ndjson((item.to_dict() for item in generator.equipment()), "catalog.ndjson")
+    write_ndjson(generator.order_records(5_000_000), "orders.ndjson")
+
+SKU IDs depend only on the SKU's position, so order records can reference
+the catalog without generating it.
+"""
+import json
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple, Type
+from src.models.equipment import Equipment
+from src.models.order import Order
+from src.patterns.builder import BLACK_RED_COLOR, EquipmentBuilder, PowerRackBuilder, TreadmillBuilder
+from src.patterns.singleton import EquipmentInventory
+
+
+@dataclass(frozen=True)
+class ProductKind:
+    """Distribution parameters for one kind of product."""
+    name: str
+    category: str
+    builder: Type[EquipmentBuilder]
+    share: float  # fraction of the catalog
+    median_price: float
+    price_sigma: float  # spread of the log-normal price
+    weight_kg: Tuple[float, float]
+    dimensions_cm: Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]
+    materials: Tuple[str, ...]
+    max_user_weight_kg: Tuple[int, int]
+    warranty_months: Tuple[int, ...]
+
+
+PRODUCT_KINDS = (
+    ProductKind("Treadmill", "Cardio", TreadmillBuilder, 0.14, 1400.0, 0.45, (60, 160),
+                ((170, 220), (70, 95), (130, 160)), ("Steel", "Steel/Aluminium"), (120, 200), (12, 24, 36)),
+    ProductKind("Exercise Bike", "Cardio", EquipmentBuilder, 0.12, 550.0, 0.5, (25, 70),
+                ((90, 140), (50, 70), (110, 150)), ("Steel/Plastic", "Aluminium/Plastic"), (110, 160), (12, 24)),
+    ProductKind("Rowing Machine", "Cardio", EquipmentBuilder, 0.06, 900.0, 0.4, (25, 60),
+                ((200, 260), (50, 65), (40, 110)), ("Aluminium", "Wood", "Steel"), (120, 180), (12, 24)),
+    ProductKind("Power Rack", "Strength", PowerRackBuilder, 0.08, 1200.0, 0.4, (80, 250),
+                ((120, 160), (120, 160), (200, 240)), ("Heavy Gauge Steel", "Steel"), (300, 500), (24, 36, 60)),
+    ProductKind("Weight Bench", "Strength", EquipmentBuilder, 0.15, 280.0, 0.5, (15, 60),
+                ((110, 190), (45, 70), (40, 130)), ("Steel", "Steel/Vinyl"), (150, 350), (12, 24)),
+    ProductKind("Dumbbell Set", "Free Weights", EquipmentBuilder, 0.25, 150.0, 0.7, (5, 90),
+                ((30, 60), (15, 40), (15, 30)), ("Cast Iron", "Rubber/Steel", "Chrome Steel"), (150, 300), (12, 24)),
+    ProductKind("Kettlebell", "Free Weights", EquipmentBuilder, 0.20, 60.0, 0.6, (4, 48),
+                ((15, 35), (15, 30), (20, 40)), ("Cast Iron", "Vinyl/Iron"), (150, 300), (12,)),
+)
+
+BRANDS = ("Titan", "Apex", "Kinetic", "Ironclad", "Stride", "Vertex", "Nordic", "Pulse", "Forge", "Summit")
+COLOR_WEIGHTS = {"Black": 0.45, "Gray": 0.15, "Silver": 0.12, "White": 0.1, "Red": 0.07,
+                 "Blue": 0.06, BLACK_RED_COLOR: 0.05}
+
+
+class ZipfSampler:
+    """Zipf-distributed ranks in ``1..n`` using constant memory.
+
+    Rank ``k`` is drawn with probability proportional to ``1 / k**exponent``.
+    Uses Hörmann and Derflinger's rejection-inversion method, so no
+    per-rank table is needed even for millions of ranks.
+    """
+
+    def __init__(self, n: int, exponent: float = 1.1, rng: Optional[random.Random] = None):
+        """Initialize sampler."""
+        if n <= 0:
+            raise ValueError("Number of ranks must be positive")
+        if exponent <= 0:
+            raise ValueError("Exponent must be positive")
+        self.n = n
+        self.exponent = exponent
+        self._rng = rng or random.Random()
+        self._h_integral_x1 = self._h_integral(1.5) - 1.0
+        self._h_integral_n = self._h_integral(n + 0.5)
+        self._s = 2.0 - self._h_integral_inverse(self._h_integral(2.5) - self._h(2.0))
+
+    def _h(self, x: float) -> float:
+        return math.exp(-self.exponent * math.log(x))
+
+    def _h_integral(self, x: float) -> float:
+        log_x = math.log(x)
+        return _expm1_over_x((1.0 - self.exponent) * log_x) * log_x
+
+    def _h_integral_inverse(self, x: float) -> float:
+        t = x * (1.0 - self.exponent)
+        if t < -1.0:
+            # Limit the value to the domain of log1p, as rounding may push it out
+            t = -1.0
+        return math.exp(_log1p_over_x(t) * x)
+
+    def sample(self) -> int:
+        """One rank."""
+        while True:
+            u = self._h_integral_n + self._rng.random() * (self._h_integral_x1 - self._h_integral_n)
+            x = self._h_integral_inverse(u)
+            k = min(max(int(x + 0.5), 1), self.n)
+            if k - x <= self._s or u >= self._h_integral(k + 0.5) - self._h(k):
+                return k
+
+
+def _expm1_over_x(x: float) -> float:
+    return math.expm1(x) / x if abs(x) > 1e-8 else 1.0 + x / 2.0
+
+
+def _log1p_over_x(x: float) -> float:
+    return math.log1p(x) / x if abs(x) > 1e-8 else 1.0 - x / 2.0
+
+
+class WorkloadGenerator:
+    """Seeded, streaming generator of catalog items and orders."""
+
+    def __init__(self, skus: int, seed: int = 0, skew: float = 1.1,
+                 kinds: Sequence[ProductKind] = PRODUCT_KINDS):
+        """Initialize generator; ``skew`` is the Zipf exponent of SKU popularity."""
+        if skus <= 0:
+            raise ValueError("Number of SKUs must be positive")
+        self.skus = skus
+        self.seed = seed
+        self.skew = skew
+        self.kinds = tuple(kinds)
+        self._kind_weights = [kind.share for kind in self.kinds]
+        self._colors = list(COLOR_WEIGHTS)
+        self._color_weights = list(COLOR_WEIGHTS.values())
+
+    @staticmethod
+    def sku_id(index: int) -> str:
+        """ID of the SKU at ``index`` (0-based)."""
+        return f"SKU-{index:08d}"
+
+    def _build(self, index: int, kind: ProductKind, rng: random.Random) -> Equipment:
+        brand = rng.choice(BRANDS)
+        builder = kind.builder()
+        builder.set_name(f"{brand} {kind.name} {rng.randint(100, 999)}")
+        builder.set_description(f"{brand} {kind.name.lower()} for home and gym use")
+        price = rng.lognormvariate(math.log(kind.median_price), kind.price_sigma)
+        builder.set_base_price(max(4.99, round(price) - 0.01))
+        builder.set_category(kind.category)
+        builder.set_weight(round(rng.uniform(*kind.weight_kg), 1))
+        builder.set_dimensions("x".join(str(rng.randint(*bounds)) for bounds in kind.dimensions_cm))
+        builder.set_material(rng.choice(kind.materials))
+        builder.set_color(rng.choices(self._colors, self._color_weights)[0])
+        builder.set_max_user_weight(float(rng.randint(*kind.max_user_weight_kg)))
+        builder.set_warranty_months(rng.choice(kind.warranty_months))
+        if isinstance(builder, TreadmillBuilder):
+            builder.set_max_speed(float(rng.choice((16, 18, 20, 22, 25))))
+            builder.set_incline_levels(rng.choice((0, 10, 12, 15, 20)))
+            builder.set_motor_power(round(rng.uniform(1.5, 4.5), 1))
+        elif isinstance(builder, PowerRackBuilder):
+            builder.set_weight_capacity(float(rng.randrange(300, 1001, 50)))
+            builder.set_has_safety_bars(rng.random() < 0.8)
+            builder.set_has_pull_up_bar(rng.random() < 0.6)
+        equipment = builder.build()
+        equipment.id = self.sku_id(index)
+        return equipment
+
+    def equipment(self) -> Iterator[Equipment]:
+        """Stream the catalog, one validated item at a time."""
+        rng = random.Random(f"{self.seed}:catalog")
+        for index in range(self.skus):
+            kind = rng.choices(self.kinds, self._kind_weights)[0]
+            yield self._build(index, kind, rng)
+
+    def _order_stream(self, count: int, customers: Optional[int]) -> Iterator[Tuple[str, int, int, int]]:
+        """(order ID, SKU index, quantity, customer number) tuples."""
+        if count < 0:
+            raise ValueError("Order count cannot be negative")
+        rng = random.Random(f"{self.seed}:orders")
+        # The most popular SKUs are the first ones in the catalog
+        popularity = ZipfSampler(self.skus, self.skew, rng)
+        customers = customers or max(1, count // 4)
+        for _ in range(count):
+            order_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            quantity = 1 if rng.random() < 0.8 else rng.randint(2, 5)
+            yield order_id, popularity.sample() - 1, quantity, rng.randrange(customers)
+
+    def order_records(self, count: int, customers: Optional[int] = None) -> Iterator[dict]:
+        """Stream orders as ``POST /orders`` payloads plus an ``id``."""
+        for order_id, index, quantity, customer in self._order_stream(count, customers):
+            yield {"id": order_id, "equipment_id": self.sku_id(index), "quantity": quantity,
+                   **_customer_fields(customer)}
+
+    def orders(self, count: int, catalog: Sequence[Equipment], customers: Optional[int] = None) -> Iterator[Order]:
+        """Stream ``Order`` objects for an already generated ``catalog``."""
+        if len(catalog) != self.skus:
+            raise ValueError("Catalog size does not match the number of SKUs")
+        for order_id, index, quantity, customer in self._order_stream(count, customers):
+            yield Order(id=order_id, equipment=catalog[index], quantity=quantity,
+                        **_customer_fields(customer))
+
+
+def _customer_fields(customer: int) -> dict:
+    return {
+        "customer_id": f"CUST-{customer:07d}",
+        "customer_email": f"customer{customer}@example.com",
+        "shipping_address": f"{customer % 500 + 1} Main Street, Kyiv"
+    }
+
+
+def populate_inventory(items: Iterable[Equipment], inventory: Optional[EquipmentInventory] = None,
+                       stock: Callable[[Equipment], int] = lambda item: 10) -> int:
+    """Bulk load streamed items into the inventory; returns the number added."""
+    inventory = inventory or EquipmentInventory()
+    return inventory.bulk_add_equipment((item, stock(item)) for item in items)
+
+
+def write_ndjson(records: Iterable[dict], path: str) -> int:
+    """Write one JSON object per line; returns the number of lines."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[dict]:
+    """Stream records written by ``write_ndjson``."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
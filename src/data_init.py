@@ -84,7 +84,8 @@ def initialize_sample_data():
         }
     ]
     
-    # Add equipment to inventory
+    # Add equipment to inventory in one bulk load
+    items = []
     for data in equipment_data:
         specs = data["specs"]
         equipment = Equipment(
@@ -102,4 +103,5 @@ def initialize_sample_data():
                 warranty_months=specs["warranty_months"]
             )
         )
-        inventory.add_equipment(equipment, quantity=5)  # Add 5 units of each equipment 
\ No newline at end of file
+        items.append((equipment, 5))  # Add 5 units of each equipment
+    inventory.bulk_add_equipment(items)
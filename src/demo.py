@@ -265,4 +265,6 @@ def demonstrate_all_patterns() -> str:
     return "\n".join(output)
 
 if __name__ == "__main__":
+    import logging
+    logging.basicConfig(level=logging.INFO)
     print(demonstrate_all_patterns()) 
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""Application logging setup.
+
+``configure_logging`` installs a ``QueueHandler`` on the root logger so
+request threads and the event loop only enqueue records; a
+``QueueListener`` thread formats them (as JSON by default) and writes them
+out.  ``SamplingFilter`` keeps one in N records of chatty loggers at INFO
+and below, so high-frequency events do not flood the output.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, TextIO
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including ``extra`` fields such as order_id."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every Nth record per logger at or below ``max_level``.
+
+    ``rates`` maps logger name prefixes to the fraction of records kept,
+    e.g. ``{"src.patterns.observer": 0.01}``; the longest prefix wins.
+    """
+
+    def __init__(self, rates: Dict[str, float], max_level: int = logging.INFO):
+        """Initialize sampling filter."""
+        super().__init__()
+        for name, rate in rates.items():
+            if not 0 < rate <= 1:
+                raise ValueError(f"Sample rate for {name} must be in (0, 1]")
+        self.max_level = max_level
+        self._every = {name: max(1, round(1 / rate)) for name, rate in rates.items()}
+        self._resolved: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _every_for(self, name: str) -> int:
+        every = self._resolved.get(name)
+        if every is None:
+            matches = [prefix for prefix in self._every if name == prefix or name.startswith(prefix + ".")]
+            every = self._every[max(matches, key=len)] if matches else 1
+            self._resolved[name] = every
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        every = self._every_for(record.name)
+        if every == 1:
+            return True
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+        return count % every == 0
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, since they may change after the call, but
+        # skip the formatter; the copy keeps other handlers' record intact
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"logger=rate,logger=rate"`` into a rates dictionary."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        if not rate:
+            raise ValueError(f"Invalid sample rate entry: {item}")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(level: int = logging.INFO, json_format: bool = True,
+                      sample_rates: Optional[Dict[str, float]] = None,
+                      stream: Optional[TextIO] = None,
+                      handler: Optional[logging.Handler] = None) -> logging.handlers.QueueListener:
+    """Route all logging through a queue and a background listener.
+
+    Calling it again replaces the previous setup.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    if handler is None:
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"
+        ))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(log_queue)
+    if sample_rates:
+        _queue_handler.addFilter(SamplingFilter(sample_rates))
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and remove the queue handler."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,6 +1,38 @@
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Tuple, Union, Any
 import uuid
+from src.models.money import to_cents
+
+# Filterable equipment attributes and their value types; builders fill the
+# ones that apply to their equipment type
+ATTRIBUTE_TYPES: Dict[str, type] = {
+    "max_speed": float,
+    "incline_levels": int,
+    "motor_power": float,
+    "weight_capacity": float,
+    "has_safety_bars": bool,
+    "has_pull_up_bar": bool
+}
+
+AttributeValue = Union[int, float, bool]
+
+
+def normalize_attributes(attributes: Dict[str, Any]) -> Dict[str, AttributeValue]:
+    """Validate attribute names and coerce values to their declared types."""
+    normalized = {}
+    for name, value in attributes.items():
+        attribute_type = ATTRIBUTE_TYPES.get(name)
+        if attribute_type is None:
+            raise ValueError(f"Unknown equipment attribute: {name}")
+        if attribute_type is bool:
+            if not isinstance(value, bool):
+                raise ValueError(f"Attribute {name} must be a boolean")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Attribute {name} must be a number")
+        elif attribute_type is int and value != int(value):
+            raise ValueError(f"Attribute {name} must be an integer")
+        normalized[name] = attribute_type(value)
+    return normalized
 
 @dataclass
 class EquipmentSpecs:
@@ -75,7 +107,9 @@ class Equipment:
     category: str = "General"
     specs: EquipmentSpecs = field(default_factory=lambda: EquipmentSpecs())
     id: Optional[str] = None
+    attributes: Dict[str, AttributeValue] = field(default_factory=dict)
     _pricing_strategy = None
+    _version = 0
 
     def __post_init__(self):
         """Валідація після ініціалізації"""
@@ -104,12 +138,47 @@ class Equipment:
         if not isinstance(self.specs, EquipmentSpecs):
             raise ValueError("Specs must be an instance of EquipmentSpecs")
 
+        self.attributes = normalize_attributes(self.attributes or {})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Keep ``base_price_cents`` in step with ``base_price``."""
+        object.__setattr__(self, name, value)
+        if name == "base_price":
+            # Invalid prices are rejected by __post_init__, not here
+            try:
+                cents = to_cents(value)
+            except (ArithmeticError, TypeError, ValueError):
+                cents = None
+            object.__setattr__(self, "base_price_cents", cents)
+
+    def clone(self) -> 'Equipment':
+        """Copy with its own specs and a fresh ID.
+
+        Skips ``__post_init__`` validation, so only clone instances that
+        were validated when created.
+        """
+        # Copy instance dicts directly; copy.copy goes through __reduce_ex__
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        specs = clone.specs = object.__new__(type(self.specs))
+        specs.__dict__.update(self.specs.__dict__)
+        clone.attributes = dict(self.attributes)
+        clone.id = str(uuid.uuid4())
+        clone._version = 0
+        return clone
+
     def get_price(self) -> float:
         """Отримати ціну обладнання"""
         if self._pricing_strategy:
             return self._pricing_strategy.calculate_price(self)
         return self.base_price
 
+    def get_price_cents(self) -> int:
+        """Отримати ціну обладнання в центах"""
+        if self._pricing_strategy:
+            return self._pricing_strategy.calculate_price_cents(self)
+        return self.base_price_cents
+
     @property
     def final_price(self) -> float:
         """Отримати кінцеву ціну з урахуванням всіх модифікацій"""
@@ -127,7 +196,8 @@ class Equipment:
             "description": self.description,
             "base_price": self.base_price,
             "category": self.category,
-            "specs": self.specs.dict()
+            "specs": self.specs.dict(),
+            "attributes": dict(self.attributes)
         }
         return result
     
@@ -149,7 +219,8 @@ class Equipment:
             description=data["description"],
             base_price=float(data["base_price"]),
             category=data["category"],
-            specs=specs
+            specs=specs,
+            attributes=data.get("attributes") or {}
         )
 
     def dict(self) -> Dict[str, Any]:
@@ -159,7 +230,8 @@ class Equipment:
             "description": self.description,
             "base_price": self.base_price,
             "category": self.category,
-            "specs": self.specs.dict()
+            "specs": self.specs.dict(),
+            "attributes": dict(self.attributes)
         }
 
     def get_description(self) -> str:
@@ -168,4 +240,17 @@ class Equipment:
 
     def set_pricing_strategy(self, strategy) -> None:
         """Set pricing strategy."""
-        self._pricing_strategy = strategy 
\ No newline at end of file
+        self._pricing_strategy = strategy
+
+    def price_fingerprint(self) -> Optional[Tuple]:
+        """Hashable description of everything get_price depends on.
+
+        Returns None when the price cannot be cached (e.g. the strategy
+        has no fingerprint).
+        """
+        strategy_fingerprint = None
+        if self._pricing_strategy:
+            strategy_fingerprint = self._pricing_strategy.fingerprint()
+            if strategy_fingerprint is None:
+                return None
+        return (type(self).__name__, self.base_price, strategy_fingerprint) 
\ No newline at end of file
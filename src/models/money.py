@@ -0,0 +1,141 @@
+"""Integer-cents money kernel.
+
+Amounts are plain ``int`` values in minor units (cents).  Percentages and
+multipliers are expressed in basis points (1% = 100 bp, x1.0 = 10000 bp) so
+every price operation is an integer multiply followed by one explicitly
+rounded division.  Results are therefore exact and reproducible, which makes
+them safe to cache and compare.
+"""
+from decimal import Decimal, ROUND_HALF_UP as _DECIMAL_HALF_UP, ROUND_HALF_EVEN as _DECIMAL_HALF_EVEN
+from decimal import ROUND_DOWN as _DECIMAL_DOWN, ROUND_UP as _DECIMAL_UP
+from decimal import ROUND_FLOOR as _DECIMAL_FLOOR, ROUND_CEILING as _DECIMAL_CEILING
+from math import gcd
+from typing import List, Sequence, Tuple
+
+CENTS_PER_UNIT = 100
+BP_SCALE = 10000
+
+ROUND_HALF_UP = "half_up"
+ROUND_HALF_EVEN = "half_even"
+ROUND_DOWN = "down"
+ROUND_UP = "up"
+ROUND_FLOOR = "floor"
+ROUND_CEILING = "ceiling"
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+DEFAULT_ROUNDING = ROUND_HALF_UP
+
+_DECIMAL_MODES = {
+    ROUND_HALF_UP: _DECIMAL_HALF_UP,
+    ROUND_HALF_EVEN: _DECIMAL_HALF_EVEN,
+    ROUND_DOWN: _DECIMAL_DOWN,
+    ROUND_UP: _DECIMAL_UP,
+    ROUND_FLOOR: _DECIMAL_FLOOR,
+    ROUND_CEILING: _DECIMAL_CEILING
+}
+_CENT = Decimal("0.01")
+
+
+def divide(numerator: int, denominator: int, rounding: str = DEFAULT_ROUNDING) -> int:
+    """Divide two integers rounding the quotient with the given mode."""
+    if denominator <= 0:
+        raise ValueError("Denominator must be positive")
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder == 0 or rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    negative = numerator < 0
+    if rounding == ROUND_DOWN:
+        return quotient + 1 if negative else quotient
+    if rounding == ROUND_UP:
+        return quotient if negative else quotient + 1
+
+    twice = remainder * 2
+    if twice < denominator:
+        return quotient
+    if twice > denominator:
+        return quotient + 1
+    if rounding == ROUND_HALF_UP:
+        return quotient if negative else quotient + 1
+    if rounding == ROUND_HALF_EVEN:
+        return quotient + (quotient & 1)
+    raise ValueError(f"Unknown rounding mode: {rounding}")
+
+
+def to_cents(amount, rounding: str = DEFAULT_ROUNDING) -> int:
+    """Convert a decimal amount (float, int, str or Decimal) to cents."""
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    if isinstance(amount, float):
+        scaled = amount * CENTS_PER_UNIT
+        nearest = round(scaled)
+        # Prices with at most two decimals land within float noise of an
+        # integer; anything else goes through Decimal to honour ``rounding``.
+        if abs(scaled - nearest) < 1e-6:
+            return int(nearest)
+        amount = repr(amount)
+    if rounding not in _DECIMAL_MODES:
+        raise ValueError(f"Unknown rounding mode: {rounding}")
+    try:
+        value = Decimal(amount)
+    except ArithmeticError:
+        raise ValueError("Amount must be a valid number")
+    return int(value.quantize(_CENT, rounding=_DECIMAL_MODES[rounding]) * CENTS_PER_UNIT)
+
+
+def from_cents(cents: int) -> float:
+    """Convert cents to a float amount for display and legacy APIs."""
+    return cents / CENTS_PER_UNIT
+
+
+def percent_to_bp(percent: float) -> int:
+    """Convert a percentage (e.g. 12.5) to basis points (1250)."""
+    return round(percent * 100)
+
+
+def scale(cents: int, rate_bp: int, rounding: str = DEFAULT_ROUNDING) -> int:
+    """Multiply an amount by ``rate_bp / 10000`` (10000 bp = x1.0)."""
+    if rounding == ROUND_HALF_UP and cents >= 0:
+        return (cents * rate_bp + BP_SCALE // 2) // BP_SCALE
+    return divide(cents * rate_bp, BP_SCALE, rounding)
+
+
+def scale_terms(rate_bp: int) -> Tuple[int, int, int]:
+    """Precompute ``(numerator, half, denominator)`` for a fixed rate.
+
+    ``(cents * numerator + half) // denominator`` equals ``scale(cents,
+    rate_bp)`` for non-negative amounts; the rate is reduced to lowest terms
+    so hot loops multiply and divide by small ints.
+    """
+    divisor = gcd(rate_bp, BP_SCALE)
+    denominator = BP_SCALE // divisor
+    return 2 * rate_bp // divisor, denominator, 2 * denominator
+
+
+def apply_discount(cents: int, percent: float, rounding: str = DEFAULT_ROUNDING) -> int:
+    """Reduce an amount by ``percent``."""
+    return scale(cents, BP_SCALE - percent_to_bp(percent), rounding)
+
+
+def apply_markup(cents: int, percent: float, rounding: str = DEFAULT_ROUNDING) -> int:
+    """Increase an amount by ``percent``."""
+    return scale(cents, BP_SCALE + percent_to_bp(percent), rounding)
+
+
+def line_totals(unit_cents: Sequence[int], quantities: Sequence[int], rate_bp: int = BP_SCALE,
+                rounding: str = DEFAULT_ROUNDING) -> List[int]:
+    """Price a batch of non-negative lines: ``unit * quantity`` scaled by ``rate_bp``."""
+    if rounding == ROUND_HALF_UP:
+        half = BP_SCALE // 2
+        return [(unit * quantity * rate_bp + half) // BP_SCALE
+                for unit, quantity in zip(unit_cents, quantities)]
+    return [divide(unit * quantity * rate_bp, BP_SCALE, rounding)
+            for unit, quantity in zip(unit_cents, quantities)]
+
+
+def format_cents(cents: int) -> str:
+    """Format cents as ``1234.50``."""
+    sign = "-" if cents < 0 else ""
+    whole, fraction = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{whole}.{fraction:02d}"
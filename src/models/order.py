@@ -1,8 +1,11 @@
 """Order model implementation."""
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 from src.models.equipment import Equipment
+from src.models.money import from_cents
+from src.patterns.price_cache import price_cache
 
 @dataclass
 class Order:
@@ -17,6 +20,7 @@ class Order:
     id: Optional[str] = None
     items: list = field(default_factory=list)
     notes: list = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
 
     def __post_init__(self):
         """Initialize order."""
@@ -37,9 +41,13 @@ class Order:
 
     def get_total_price(self) -> float:
         """Get total price of the order."""
+        return from_cents(self.get_total_price_cents())
+
+    def get_total_price_cents(self) -> int:
+        """Get total price of the order in cents."""
         if not self.equipment:
-            return 0.0
-        return self.equipment.get_price() * self.quantity
+            return 0
+        return price_cache.get_price_cents(self.equipment) * self.quantity
 
     def update_status(self, status: str) -> None:
         """Update order status."""
@@ -56,7 +64,8 @@ class Order:
             "customer_email": self.customer_email,
             "shipping_address": self.shipping_address,
             "status": self.status,
-            "total_price": self.get_total_price()
+            "total_price": self.get_total_price(),
+            "created_at": self.created_at.isoformat()
         }
 
     @classmethod
@@ -71,7 +80,8 @@ class Order:
             customer_name=data.get("customer_name"),
             customer_email=data.get("customer_email"),
             shipping_address=data.get("shipping_address"),
-            status=data.get("status", "pending")
+            status=data.get("status", "pending"),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.now()
         )
 
     def __str__(self) -> str:
@@ -0,0 +1,77 @@
+"""SQLAlchemy ORM mapping for equipment, specs, stock and orders.
+
+The rows mirror the ``Equipment``, ``EquipmentSpecs`` and ``Order``
+dataclasses; ``SqlRepository`` (``src.patterns.repository``) converts
+between the two.  Composite indexes end with the primary key so the list
+queries can page with keyset conditions instead of OFFSET.
+"""
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import declarative_base, relationship
+
+Base = declarative_base()
+
+
+class EquipmentRow(Base):
+    """Equipment table."""
+    __tablename__ = "equipment"
+
+    id = Column(String(36), primary_key=True)
+    name = Column(String(200), nullable=False)
+    description = Column(Text, nullable=False)
+    base_price = Column(Float, nullable=False)
+    category = Column(String(100), nullable=False)
+    attributes = Column(JSON, nullable=False, default=dict)
+    version = Column(Integer, nullable=False, default=0)
+
+    specs = relationship("EquipmentSpecsRow", uselist=False, lazy="joined",
+                         cascade="all, delete-orphan")
+    stock = relationship("StockRow", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_equipment_price", "base_price", "id"),
+        Index("ix_equipment_category_price", "category", "base_price", "id"),
+    )
+
+
+class EquipmentSpecsRow(Base):
+    """Equipment specifications, one row per equipment."""
+    __tablename__ = "equipment_specs"
+
+    equipment_id = Column(String(36), ForeignKey("equipment.id", ondelete="CASCADE"), primary_key=True)
+    weight = Column(String(32), nullable=False)
+    dimensions = Column(String(64), nullable=False)
+    material = Column(String(100), nullable=False)
+    color = Column(String(64), nullable=False)
+    max_user_weight = Column(String(32), nullable=False)
+    warranty_months = Column(String(16), nullable=False)
+
+
+class StockRow(Base):
+    """Stock quantity per equipment."""
+    __tablename__ = "equipment_stock"
+
+    equipment_id = Column(String(36), ForeignKey("equipment.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+
+
+class OrderRow(Base):
+    """Orders table."""
+    __tablename__ = "orders"
+
+    id = Column(String(36), primary_key=True)
+    equipment_id = Column(String(36), ForeignKey("equipment.id"), index=True)
+    quantity = Column(Integer, nullable=False)
+    customer_id = Column(String(64), nullable=False)
+    customer_name = Column(String(200))
+    customer_email = Column(String(200))
+    shipping_address = Column(Text)
+    status = Column(String(32), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    equipment = relationship(EquipmentRow, lazy="joined")
+
+    __table_args__ = (
+        Index("ix_orders_created", "created_at", "id"),
+        Index("ix_orders_customer_created", "customer_id", "created_at", "id"),
+        Index("ix_orders_status_created", "status", "created_at", "id"),
+    )
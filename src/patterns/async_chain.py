@@ -0,0 +1,238 @@
+"""Async chain of responsibility for order processing.
+
+Mirrors ``src.patterns.chain`` with awaitable processors so stages that do
+I/O (payment gateways, remote stock services) yield to the event loop
+instead of blocking every other request.  Stages can have their own timeout,
+and independent checks can run concurrently through ``ParallelStage``.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+from src.models.order import Order
+from src.patterns.chain import OrderProcessor, StockValidator, OrderFulfillment, get_default_notification_system
+from src.patterns.observer import NotificationSystem
+from src.patterns.payment_gateway import PaymentGatewayError
+from src.patterns.tracing import tracer
+from src.patterns.saga import AsyncOrderSaga, Recovery
+
+logger = logging.getLogger(__name__)
+
+PaymentHandler = Callable[[Order], Awaitable[bool]]
+
+
+class AsyncOrderProcessor(ABC):
+    """Abstract base class for async order processors."""
+    def __init__(self, notification_system: Optional[NotificationSystem] = None,
+                 timeout: Optional[float] = None):
+        """Initialize async order processor."""
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout must be positive")
+        self._next_processor: Optional['AsyncOrderProcessor'] = None
+        self._notification_system = notification_system or get_default_notification_system()
+        self.timeout = timeout
+
+    def set_next(self, processor: 'AsyncOrderProcessor') -> 'AsyncOrderProcessor':
+        """Set next processor in chain."""
+        self._next_processor = processor
+        return processor
+
+    async def process(self, order: Order) -> bool:
+        """Process order through chain."""
+        if await self.run_stage(order):
+            if self._next_processor:
+                return await self._next_processor.process(order)
+            return True
+        return False
+
+    @property
+    def stage_name(self) -> str:
+        """Name used for this stage's tracing spans."""
+        return type(self).__name__
+
+    async def run_stage(self, order: Order) -> bool:
+        """Run this stage only, applying the stage timeout."""
+        with tracer.span(f"stage.{self.stage_name}", order_id=order.id if order else None):
+            if self.timeout is None:
+                return await self._validate(order)
+            try:
+                return await asyncio.wait_for(self._validate(order), self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning("%s timed out for order %s", self.stage_name, order.id if order else None)
+                return False
+
+    async def compensate(self, order: Order) -> bool:
+        """Undo this stage's effects after a later stage failed; no-op by default.
+
+        Returns False if the effects could not be undone.
+        """
+        return True
+
+    @abstractmethod
+    async def _validate(self, order: Order) -> bool:
+        """Validate order."""
+        pass
+
+
+class SyncStage(AsyncOrderProcessor):
+    """Adapts a synchronous ``OrderProcessor`` stage to the async chain.
+
+    CPU-only stages run inline; ``blocking=True`` moves the call to a worker
+    thread so blocking I/O does not stall the event loop.
+    """
+    def __init__(self, processor: OrderProcessor, blocking: bool = False,
+                 timeout: Optional[float] = None):
+        """Initialize sync stage adapter."""
+        super().__init__(processor._notification_system, timeout)
+        self.processor = processor
+        self.blocking = blocking
+
+    @property
+    def stage_name(self) -> str:
+        """Spans are named after the wrapped processor."""
+        return type(self.processor).__name__
+
+    async def _validate(self, order: Order) -> bool:
+        """Run the wrapped processor's validation."""
+        if self.blocking:
+            return await asyncio.to_thread(self.processor._validate, order)
+        return self.processor._validate(order)
+
+    async def compensate(self, order: Order) -> bool:
+        """Run the wrapped processor's compensation."""
+        if self.blocking:
+            return await asyncio.to_thread(self.processor.compensate, order)
+        return self.processor.compensate(order)
+
+
+class ParallelStage(AsyncOrderProcessor):
+    """Runs independent checks concurrently; passes only if all pass.
+
+    When a check fails, raises or the stage times out, the checks that
+    already passed are compensated before the stage fails.
+    """
+    def __init__(self, stages: List[AsyncOrderProcessor], timeout: Optional[float] = None):
+        """Initialize parallel stage."""
+        if not stages:
+            raise ValueError("Parallel stage needs at least one stage")
+        super().__init__(stages[0]._notification_system, timeout)
+        self.stages = list(stages)
+
+    async def _validate(self, order: Order) -> bool:
+        """Run all checks with ``asyncio.gather``."""
+        tasks = [asyncio.ensure_future(stage.run_stage(order)) for stage in self.stages]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Stage timeout: the checks are cancelled together with the gather
+            await self._compensate_passed(order, tasks)
+            raise
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not errors and all(results):
+            return True
+        await self._compensate_passed(order, tasks)
+        if errors:
+            raise errors[0]
+        return False
+
+    async def _compensate_passed(self, order: Order, tasks: List[asyncio.Future]) -> None:
+        """Undo the checks that passed, in reverse order."""
+        for stage, task in reversed(list(zip(self.stages, tasks))):
+            if not task.done() or task.cancelled() or task.exception() is not None or not task.result():
+                continue
+            try:
+                undone = await stage.compensate(order)
+            except Exception:
+                logger.exception("Compensating %s raised for order %s", stage.stage_name, order.id)
+                undone = False
+            if not undone:
+                logger.error("Could not undo %s for order %s", stage.stage_name, order.id)
+
+    async def compensate(self, order: Order) -> bool:
+        """Compensate the parallel checks in reverse order."""
+        results = [await stage.compensate(order) for stage in reversed(self.stages)]
+        return all(results)
+
+
+async def approve_payment(order: Order) -> bool:
+    """Default payment handler: every payment succeeds."""
+    return True
+
+
+class AsyncPaymentProcessor(AsyncOrderProcessor):
+    """Processes payment through an awaitable payment handler."""
+    def __init__(self, notification_system: Optional[NotificationSystem] = None,
+                 payment_handler: PaymentHandler = approve_payment,
+                 timeout: Optional[float] = None,
+                 refund_handler: Optional[PaymentHandler] = None):
+        """Initialize async payment processor."""
+        super().__init__(notification_system, timeout)
+        self._payment_handler = payment_handler
+        self._refund_handler = refund_handler
+
+    async def _validate(self, order: Order) -> bool:
+        """Validate payment."""
+        if not order or not order.customer_id:
+            return False
+        if not await self._payment_handler(order):
+            return False
+        order.status = "paid"
+        self._notification_system.notify(order, "paid")
+        return True
+
+    async def compensate(self, order: Order) -> bool:
+        """Refund the payment; the order keeps its status if the refund fails."""
+        if self._refund_handler is not None:
+            try:
+                refunded = await self._refund_handler(order)
+            except PaymentGatewayError as error:
+                logger.error("Refund for order %s not completed: %s", order.id, error)
+                refunded = False
+            if not refunded:
+                logger.warning("Refund for order %s failed; will be retried", order.id)
+                return False
+        order.status = "refunded"
+        self._notification_system.notify(order, "refunded")
+        return True
+
+
+class AsyncOrderProcessorChain:
+    """Async chain: stock validation, payment, fulfillment.
+
+    Runs as a saga like ``OrderProcessorChain``; ``refund_handler`` is
+    awaited when a paid order has to be compensated.
+    """
+    def __init__(self, notification_system: Optional[NotificationSystem] = None,
+                 payment_handler: PaymentHandler = approve_payment,
+                 payment_timeout: Optional[float] = None,
+                 refund_handler: Optional[PaymentHandler] = None,
+                 saga_log=None, blocking_inventory: bool = False):
+        """Initialize async order processor chain.
+
+        ``blocking_inventory`` runs the stock stages in worker threads, for
+        inventories backed by a database.
+        """
+        self.notification_system = notification_system or get_default_notification_system()
+        self.stock_validator = SyncStage(StockValidator(self.notification_system), blocking_inventory)
+        self.payment_processor = AsyncPaymentProcessor(
+            self.notification_system, payment_handler, payment_timeout, refund_handler
+        )
+        self.order_fulfillment = SyncStage(OrderFulfillment(self.notification_system), blocking_inventory)
+
+        # Set up chain
+        self.stock_validator.set_next(self.payment_processor)
+        self.payment_processor.set_next(self.order_fulfillment)
+        self.saga = AsyncOrderSaga(
+            [self.stock_validator, self.payment_processor, self.order_fulfillment], saga_log
+        )
+
+    async def process_order(self, order: Order) -> bool:
+        """Process order through chain."""
+        return await self.saga.execute(order)
+
+    async def recover(self) -> List[Recovery]:
+        """Resume or compensate orders left unfinished in the saga log.
+
+        Completed orders are returned for the caller to store.
+        """
+        return await self.saga.recover()
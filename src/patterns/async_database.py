@@ -0,0 +1,123 @@
+"""Async database access for ``async def`` endpoints.
+
+A synchronous SQLAlchemy call inside an ``async def`` endpoint blocks the
+event loop for the whole query.  ``AsyncDatabase`` runs the same database
+through SQLAlchemy's asyncio extension (``sqlite+aiosqlite`` for SQLite),
+and ``get_async_db`` is the matching per-request session dependency::
+
+    @app.get("/items")
+    async def items(db: AsyncSession = Depends(get_async_db)):
+        return (await db.execute(select(EquipmentRow))).scalars().all()
+
+The async path needs the ``greenlet`` and ``aiosqlite`` packages
+(``pip install "sqlalchemy[asyncio]" aiosqlite``); without them
+``async_available()`` is False and creating an engine raises ImportError.
+"""
+import importlib.util
+import os
+from typing import AsyncIterator
+from src.patterns.database_singleton import (
+    DEFAULT_DATABASE_URL,
+    SQLITE_MMAP_SIZE,
+    _is_memory_sqlite,
+    apply_sqlite_pragmas
+)
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+except ImportError:  # greenlet is not installed
+    create_async_engine = None
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+
+def async_database_url(url: str) -> str:
+    """Switch a sync database URL to its async driver, e.g. ``sqlite+aiosqlite``."""
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        raise ValueError(f"Invalid database URL: {url}")
+    dialect = scheme.split("+")[0]
+    driver = ASYNC_DRIVERS.get(dialect)
+    if driver is None:
+        raise ValueError(f"No async driver known for {dialect}")
+    return f"{dialect}+{driver}://{rest}"
+
+
+def async_available(url: str = DEFAULT_DATABASE_URL) -> bool:
+    """Whether the asyncio extension and the driver for ``url`` are installed."""
+    driver = async_database_url(url).split("://")[0].split("+")[1]
+    return create_async_engine is not None and importlib.util.find_spec(driver) is not None
+
+
+def create_async_database_engine(url: str, pool_size: int = 5, max_overflow: int = 10,
+                                 pool_timeout: float = 30.0,
+                                 mmap_size: int = SQLITE_MMAP_SIZE) -> "AsyncEngine":
+    """Async counterpart of ``create_database_engine``, with the same pool and pragmas."""
+    url = async_database_url(url)
+    if not async_available(url):
+        raise ImportError(
+            'Async database access needs "sqlalchemy[asyncio]" and the async driver '
+            f'({url.split("://")[0].split("+")[1]})'
+        )
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow,
+                                   pool_timeout=pool_timeout, pool_pre_ping=True)
+
+    if _is_memory_sqlite(url):
+        engine = create_async_engine(url, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow,
+                                     pool_timeout=pool_timeout)
+    apply_sqlite_pragmas(engine.sync_engine, mmap_size)
+    return engine
+
+
+class AsyncDatabase:
+    """Lazily created async engine and session factory for the store database."""
+
+    _instance = None
+
+    def __new__(cls):
+        """Create a new instance if one doesn't exist."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._engine = None
+            cls._instance._sessions = None
+        return cls._instance
+
+    def _create(self) -> None:
+        self._engine = create_async_database_engine(
+            os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL),
+            pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+        )
+        self._sessions = async_sessionmaker(self._engine, expire_on_commit=False)
+
+    @property
+    def engine(self) -> "AsyncEngine":
+        """Async engine for ``DATABASE_URL``, created on first use."""
+        if self._engine is None:
+            self._create()
+        return self._engine
+
+    def session(self) -> "AsyncSession":
+        """New async session; the caller closes it."""
+        if self._sessions is None:
+            self._create()
+        return self._sessions()
+
+    async def dispose(self) -> None:
+        """Close pooled connections."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = self._sessions = None
+
+
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    """Dependency for FastAPI yielding an async session per request."""
+    session = AsyncDatabase().session()
+    try:
+        yield session
+    finally:
+        await session.close()
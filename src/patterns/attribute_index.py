@@ -0,0 +1,141 @@
+"""Secondary indexes over equipment attributes.
+
+Numeric attributes are kept in ``SortedList``s of ``(value, id)`` pairs, so
+a range is found with two binary searches and adding or removing an item
+is logarithmic even when many items share a value; boolean attributes keep
+a set of IDs per value.  A
+query starts from its most selective condition and checks the remaining
+ones against the matched items only, so it never scans the whole inventory.
+"""
+import math
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+from sortedcontainers import SortedList
+from src.models.equipment import ATTRIBUTE_TYPES, AttributeValue, Equipment
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class AttributeIndex:
+    """Range indexes for numeric attributes and set indexes for flags."""
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        # Per numeric attribute: (value, equipment ID) pairs in sorted order
+        self._entries: Dict[str, SortedList] = {}
+        self._flags: Dict[Tuple[str, bool], Set[str]] = {}
+        self._attributes: Dict[str, Dict[str, AttributeValue]] = {}
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def add(self, equipment: Equipment) -> None:
+        """Index an item, replacing its previous entries."""
+        self.remove(equipment.id)
+        attributes = dict(equipment.attributes)
+        self._attributes[equipment.id] = attributes
+        for name, value in attributes.items():
+            if ATTRIBUTE_TYPES[name] is bool:
+                self._flags.setdefault((name, value), set()).add(equipment.id)
+                continue
+            self._entries.setdefault(name, SortedList()).add((value, equipment.id))
+
+    def add_many(self, items: Sequence[Equipment]) -> None:
+        """Index many items, sorting each affected value array once."""
+        names = set()
+        for equipment in items:
+            previous = self._attributes.pop(equipment.id, {})
+            for name, value in previous.items():
+                if ATTRIBUTE_TYPES[name] is bool:
+                    self._flags[(name, value)].discard(equipment.id)
+                else:
+                    names.add(name)
+            attributes = dict(equipment.attributes)
+            self._attributes[equipment.id] = attributes
+            for name, value in attributes.items():
+                if ATTRIBUTE_TYPES[name] is bool:
+                    self._flags.setdefault((name, value), set()).add(equipment.id)
+                else:
+                    names.add(name)
+        # Rebuilding from all indexed items also drops the replaced values
+        for name in names:
+            self._entries[name] = SortedList((attributes[name], equipment_id)
+                                             for equipment_id, attributes in self._attributes.items()
+                                             if name in attributes)
+
+    def remove(self, equipment_id: str) -> None:
+        """Drop an item from every index."""
+        attributes = self._attributes.pop(equipment_id, None)
+        if attributes is None:
+            return
+        for name, value in attributes.items():
+            if ATTRIBUTE_TYPES[name] is bool:
+                self._flags[(name, value)].discard(equipment_id)
+                continue
+            self._entries[name].remove((value, equipment_id))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._flags.clear()
+        self._attributes.clear()
+
+    def _bounds(self, name: str, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        entries = self._entries.get(name)
+        if entries is None:
+            return 0, 0
+        # One-element keys sort before every (value, id) pair with that value
+        start = 0 if low is None else entries.bisect_left((low,))
+        end = len(entries) if high is None else entries.bisect_left((math.nextafter(high, math.inf),))
+        return start, max(start, end)
+
+    def _range_ids(self, name: str, start: int, end: int) -> Iterable[str]:
+        entries = self._entries.get(name)
+        if entries is None:
+            return ()
+        return (equipment_id for _, equipment_id in entries.islice(start, end))
+
+    def query(self, ranges: Optional[Dict[str, Range]] = None,
+              flags: Optional[Dict[str, bool]] = None) -> Set[str]:
+        """IDs matching every inclusive ``(low, high)`` range and flag value.
+
+        ``None`` leaves a range side open.  Items without an attribute never
+        match a condition on it.
+        """
+        ranges, flags = ranges or {}, flags or {}
+        for name in list(ranges) + list(flags):
+            if name not in ATTRIBUTE_TYPES:
+                raise ValueError(f"Unknown equipment attribute: {name}")
+        for name in ranges:
+            if ATTRIBUTE_TYPES[name] is bool:
+                raise ValueError(f"Attribute {name} is a flag, not a range")
+        for name in flags:
+            if ATTRIBUTE_TYPES[name] is not bool:
+                raise ValueError(f"Attribute {name} is not a flag")
+        if not ranges and not flags:
+            return set(self._attributes)
+
+        # Start from the condition with the fewest matches
+        best_size, best_range, matched = None, None, set()
+        for name, (low, high) in ranges.items():
+            start, end = self._bounds(name, low, high)
+            if best_size is None or end - start < best_size:
+                best_size, best_range = end - start, (name, start, end)
+        for name, value in flags.items():
+            flagged = self._flags.get((name, value), set())
+            if best_size is None or len(flagged) < best_size:
+                best_size, best_range, matched = len(flagged), None, flagged
+        if best_range is not None:
+            name, start, end = best_range
+            matched = self._range_ids(name, start, end)
+
+        result = set()
+        for equipment_id in matched:
+            attributes = self._attributes[equipment_id]
+            if all(
+                name in attributes
+                and (low is None or attributes[name] >= low)
+                and (high is None or attributes[name] <= high)
+                for name, (low, high) in ranges.items()
+            ) and all(attributes.get(name) is value for name, value in flags.items()):
+                result.add(equipment_id)
+        return result
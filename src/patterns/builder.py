@@ -75,6 +75,10 @@ class EquipmentBuilder(ABC):
         self._warranty_months = str(months)
         return self
     
+    def _attributes(self) -> Dict[str, Union[int, float, bool]]:
+        """Filterable attributes that apply to this equipment type."""
+        return {}
+    
     def build(self) -> Equipment:
         """Build the equipment."""
         specs = EquipmentSpecs(
@@ -90,7 +94,8 @@ class EquipmentBuilder(ABC):
             description=self._description,
             base_price=self._base_price,
             category=self._category,
-            specs=specs
+            specs=specs,
+            attributes=self._attributes()
         )
 
 class TreadmillBuilder(EquipmentBuilder):
@@ -118,6 +123,13 @@ class TreadmillBuilder(EquipmentBuilder):
         """Set treadmill motor power."""
         self._motor_power = power
         return self
+    
+    def _attributes(self) -> Dict[str, Union[int, float, bool]]:
+        return {
+            "max_speed": self._max_speed,
+            "incline_levels": self._incline_levels,
+            "motor_power": self._motor_power
+        }
 
 class PowerRackBuilder(EquipmentBuilder):
     """Будівельник для силових рам"""
@@ -170,6 +182,13 @@ class PowerRackBuilder(EquipmentBuilder):
         """Встановлює наявність турніка"""
         self._has_pull_up_bar = bool(has_bar)
     
+    def _attributes(self) -> Dict[str, Union[int, float, bool]]:
+        return {
+            "weight_capacity": self._weight_capacity,
+            "has_safety_bars": self._has_safety_bars,
+            "has_pull_up_bar": self._has_pull_up_bar
+        }
+    
     def build(self) -> Equipment:
         """Створити обладнання"""
         specs = EquipmentSpecs(
@@ -185,7 +204,8 @@ class PowerRackBuilder(EquipmentBuilder):
             description=self._description,
             base_price=self._base_price,
             category=self._category,
-            specs=specs
+            specs=specs,
+            attributes=self._attributes()
         )
 
 class EquipmentDirector:
@@ -213,13 +233,13 @@ class EquipmentDirector:
             self._builder.set_name("Professional Treadmill")
             self._builder.set_description("Professional grade treadmill with advanced features")
             self._builder.set_base_price(1999.99)
-            self._builder.set_category()
+            self._builder.set_category("Cardio")
             self._builder.set_weight(125.0)
             self._builder.set_dimensions("200x85x140")
-            self._builder.set_material()
+            self._builder.set_material("Steel")
             self._builder.set_color(color if color in self.AVAILABLE_COLORS else "Black")
             self._builder.set_max_user_weight(180.0)
-            self._builder.set_warranty_months()
+            self._builder.set_warranty_months(12)
             self._builder.set_max_speed(20.0)
             self._builder.set_incline_levels(15)
             self._builder.set_motor_power(3.5)
@@ -238,6 +258,11 @@ class EquipmentDirector:
             self._builder.set_has_safety_bars(True)
             self._builder.set_has_pull_up_bar(True)
     
+    def build_basic_model(self, color: str = None) -> Equipment:
+        """Construct and build the basic model."""
+        self.construct_basic_model(color)
+        return self._builder.build()
+    
     @classmethod
     def get_available_colors(cls) -> Dict[str, str]:
         """Повертає словник доступних кольорів та їх описів"""
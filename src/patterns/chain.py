@@ -1,15 +1,36 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 from src.models.order import Order
 from src.patterns.singleton import EquipmentInventory
 from src.patterns.observer import NotificationSystem
+from src.patterns.tracing import tracer
+from src.patterns.saga import OrderSaga, Recovery
+
+logger = logging.getLogger(__name__)
+
+RefundHandler = Callable[[Order], bool]
+_default_notification_system: Optional[NotificationSystem] = None
+
+
+def get_default_notification_system() -> NotificationSystem:
+    """Shared notification system for processors built without one."""
+    global _default_notification_system
+    if _default_notification_system is None:
+        _default_notification_system = NotificationSystem()
+    return _default_notification_system
+
 
 class OrderProcessor(ABC):
-    """Abstract base class for order processors."""
-    def __init__(self):
+    """Abstract base class for order processors.
+
+    Processors keep no per-order state, so one chain can be built at startup
+    and shared by concurrent requests.
+    """
+    def __init__(self, notification_system: Optional[NotificationSystem] = None):
         """Initialize order processor."""
         self._next_processor = None
-        self._notification_system = NotificationSystem()
+        self._notification_system = notification_system or get_default_notification_system()
 
     def set_next(self, processor: 'OrderProcessor') -> 'OrderProcessor':
         """Set next processor in chain."""
@@ -18,17 +39,59 @@ class OrderProcessor(ABC):
 
     def process(self, order: Order) -> bool:
         """Process order through chain."""
-        if self._validate(order):
+        if self.run_stage(order):
             if self._next_processor:
                 return self._next_processor.process(order)
             return True
         return False
 
+    @property
+    def stage_name(self) -> str:
+        """Name used for tracing spans and saga history."""
+        return type(self).__name__
+
+    def run_stage(self, order: Order) -> bool:
+        """Run this stage only."""
+        with tracer.span(f"stage.{self.stage_name}", order_id=order.id if order else None):
+            return self._validate(order)
+
+    def run_stage_batch(self, orders: List[Order]) -> List[bool]:
+        """Run this stage only, for a batch of orders."""
+        with tracer.span(f"stage.{self.stage_name}", batch_size=len(orders)):
+            return self._validate_batch(orders)
+
+    def compensate(self, order: Order) -> bool:
+        """Undo this stage's effects after a later stage failed; no-op by default.
+
+        Returns False if the effects could not be undone.
+        """
+        return True
+
+    def process_batch(self, orders: List[Order]) -> List[bool]:
+        """Process a batch of orders stage by stage.
+
+        Each stage handles the whole batch before the surviving orders are
+        passed on, so stages can group work (e.g. per SKU).  Failed orders
+        are not compensated; ``OrderProcessorChain.process_many`` runs the
+        batch as a saga.
+        """
+        results = self.run_stage_batch(orders)
+        if self._next_processor:
+            passed = [order for order, ok in zip(orders, results) if ok]
+            if passed:
+                next_results = iter(self._next_processor.process_batch(passed))
+                results = [ok and next(next_results) for ok in results]
+        return results
+
     @abstractmethod
     def _validate(self, order: Order) -> bool:
         """Validate order."""
         pass
 
+    def _validate_batch(self, orders: List[Order]) -> List[bool]:
+        """Validate a batch of orders; defaults to one ``_validate`` per order."""
+        return [self._validate(order) for order in orders]
+
 class StockValidator(OrderProcessor):
     """Validates if equipment is in stock."""
     def _validate(self, order: Order) -> bool:
@@ -43,8 +106,35 @@ class StockValidator(OrderProcessor):
             return True
         return False
 
+    def _validate_batch(self, orders: List[Order]) -> List[bool]:
+        """Check stock once per SKU, reserving it in order sequence."""
+        inventory = EquipmentInventory()
+        available: Dict[str, int] = {}
+        results = []
+        for order in orders:
+            if not order or not order.equipment:
+                results.append(True)
+                continue
+            equipment_id = order.equipment.id
+            if equipment_id not in available:
+                available[equipment_id] = inventory.get_equipment_stock(equipment_id)
+            if available[equipment_id] >= order.quantity:
+                available[equipment_id] -= order.quantity
+                order.status = "stock_validated"
+                self._notification_system.notify(order, "stock_validated")
+                results.append(True)
+            else:
+                results.append(False)
+        return results
+
 class PaymentProcessor(OrderProcessor):
     """Processes payment for order."""
+    def __init__(self, notification_system: Optional[NotificationSystem] = None,
+                 refund_handler: Optional[RefundHandler] = None):
+        """Initialize payment processor; ``refund_handler`` returns whether it refunded."""
+        super().__init__(notification_system)
+        self._refund_handler = refund_handler
+
     def _validate(self, order: Order) -> bool:
         """Validate payment."""
         if not order:
@@ -58,6 +148,21 @@ class PaymentProcessor(OrderProcessor):
         self._notification_system.notify(order, "paid")
         return True
 
+    def compensate(self, order: Order) -> bool:
+        """Refund the payment; the order keeps its status if the refund fails."""
+        if self._refund_handler is not None:
+            try:
+                refunded = self._refund_handler(order)
+            except Exception:
+                logger.exception("Refund for order %s raised", order.id)
+                refunded = False
+            if not refunded:
+                logger.warning("Refund for order %s failed; will be retried", order.id)
+                return False
+        order.status = "refunded"
+        self._notification_system.notify(order, "refunded")
+        return True
+
 class OrderFulfillment(OrderProcessor):
     """Fulfills the order."""
     def _validate(self, order: Order) -> bool:
@@ -75,18 +180,70 @@ class OrderFulfillment(OrderProcessor):
             return True
         return False
 
+    def _validate_batch(self, orders: List[Order]) -> List[bool]:
+        """Decrement stock once per SKU for all paid orders."""
+        inventory = EquipmentInventory()
+        results = [bool(order) and order.status == "paid" for order in orders]
+        grouped: Dict[str, List[int]] = {}
+        for index, order in enumerate(orders):
+            if results[index] and order.equipment:
+                grouped.setdefault(order.equipment.id, []).append(index)
+
+        for indexes in grouped.values():
+            equipment = orders[indexes[0]].equipment
+            total = sum(orders[index].quantity for index in indexes)
+            if inventory.remove_equipment(equipment, total):
+                for index in indexes:
+                    orders[index].status = "fulfilled"
+                    self._notification_system.notify(orders[index], "fulfilled")
+            else:
+                # Stock changed since validation: fall back to per-order removal
+                for index in indexes:
+                    results[index] = self._validate(orders[index])
+        return results
+
+    def compensate(self, order: Order) -> bool:
+        """Release the removed stock back to the inventory."""
+        if order.equipment and order.status == "fulfilled":
+            EquipmentInventory().add_equipment(order.equipment, order.quantity)
+            order.status = "stock_released"
+            self._notification_system.notify(order, "stock_released")
+        return True
+
 class OrderProcessorChain:
-    """Chain of responsibility for order processing."""
-    def __init__(self):
+    """Chain of responsibility for order processing.
+
+    Orders run as a saga: if a stage fails, the completed stages are
+    compensated in reverse order.  Pass a ``saga_log`` to persist stage
+    history so ``recover`` can resume or unwind interrupted orders, and a
+    ``refund_handler`` to refund compensated payments.
+    """
+    def __init__(self, notification_system: Optional[NotificationSystem] = None, saga_log=None,
+                 refund_handler: Optional[RefundHandler] = None):
         """Initialize order processor chain."""
-        self.stock_validator = StockValidator()
-        self.payment_processor = PaymentProcessor()
-        self.order_fulfillment = OrderFulfillment()
+        self.notification_system = notification_system or get_default_notification_system()
+        self.stock_validator = StockValidator(self.notification_system)
+        self.payment_processor = PaymentProcessor(self.notification_system, refund_handler)
+        self.order_fulfillment = OrderFulfillment(self.notification_system)
 
         # Set up chain
         self.stock_validator.set_next(self.payment_processor)
         self.payment_processor.set_next(self.order_fulfillment)
+        self.saga = OrderSaga(
+            [self.stock_validator, self.payment_processor, self.order_fulfillment], saga_log
+        )
 
     def process_order(self, order: Order) -> bool:
         """Process order through chain."""
-        return self.stock_validator.process(order) 
\ No newline at end of file
+        return self.saga.execute(order)
+
+    def recover(self) -> List[Recovery]:
+        """Resume or compensate orders left unfinished in the saga log.
+
+        Completed orders are returned for the caller to store.
+        """
+        return self.saga.recover()
+
+    def process_many(self, orders: List[Order]) -> List[bool]:
+        """Process a batch of orders as sagas; returns one result per order."""
+        return self.saga.execute_batch(list(orders)) 
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Per-order event coalescing for notifications.
+
+An order normally fires stock_validated, paid, fulfilled and created in
+quick succession.  ``EventCoalescer`` buffers events per order ID and emits
+them as one digest when a terminal event arrives or when the order's window
+expires, so each observer sends one message per order instead of four.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TERMINAL_EVENTS = ("created", "refunded", "cancelled")
+
+Digest = Tuple[Any, List[str]]
+
+
+class EventCoalescer:
+    """Buffers order events and releases them as digests."""
+
+    def __init__(self, window: float = 0.5,
+                 terminal_events: Iterable[str] = DEFAULT_TERMINAL_EVENTS,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize coalescer."""
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        self.window = window
+        self.terminal_events = frozenset(terminal_events)
+        self._clock = clock
+        # order ID -> (deadline, order, events); insertion order is deadline order
+        self._buffers: 'OrderedDict[str, Tuple[float, Any, List[str]]]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self._deliver: Optional[Callable[[Any, List[str]], None]] = None
+        self._stopping = False
+        self.stats = {"events": 0, "digests": 0}
+
+    def add(self, order, event_type: str) -> Optional[Digest]:
+        """Buffer an event; returns the digest if it completed the order."""
+        with self._condition:
+            self.stats["events"] += 1
+            buffered = self._buffers.get(order.id)
+            if buffered is None:
+                buffered = (self._clock() + self.window, order, [])
+                self._buffers[order.id] = buffered
+                self._condition.notify()
+            buffered[2].append(event_type)
+            if event_type in self.terminal_events:
+                del self._buffers[order.id]
+                self.stats["digests"] += 1
+                return order, buffered[2]
+            return None
+
+    def expired(self, now: Optional[float] = None) -> List[Digest]:
+        """Remove and return digests whose window has passed."""
+        now = self._clock() if now is None else now
+        digests = []
+        with self._condition:
+            while self._buffers:
+                order_id, (deadline, order, events) = next(iter(self._buffers.items()))
+                if deadline > now:
+                    break
+                del self._buffers[order_id]
+                digests.append((order, events))
+            self.stats["digests"] += len(digests)
+        return digests
+
+    def drain(self) -> List[Digest]:
+        """Remove and return every buffered digest."""
+        with self._condition:
+            digests = [(order, events) for _, order, events in self._buffers.values()]
+            self._buffers.clear()
+            self.stats["digests"] += len(digests)
+        return digests
+
+    @property
+    def pending(self) -> int:
+        """Orders with buffered events."""
+        return len(self._buffers)
+
+    def start(self, deliver: Callable[[Any, List[str]], None]) -> None:
+        """Deliver expired digests from a background thread."""
+        with self._condition:
+            self._deliver = deliver
+            if self._flusher is None:
+                self._stopping = False
+                self._flusher = threading.Thread(target=self._run, name="notify-coalescer", daemon=True)
+                self._flusher.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread; buffered digests stay for ``drain``."""
+        with self._condition:
+            flusher, self._flusher = self._flusher, None
+            self._stopping = True
+            self._condition.notify()
+        if flusher is not None:
+            flusher.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                if self._buffers:
+                    deadline = next(iter(self._buffers.values()))[0]
+                    self._condition.wait(max(0.0, deadline - self._clock()))
+                else:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+            for order, events in self.expired():
+                try:
+                    self._deliver(order, events)
+                except Exception:
+                    # One failing observer must not stop delivery of the rest
+                    logger.exception("Delivering digest for order %s failed", order.id)
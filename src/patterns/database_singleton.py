@@ -1,60 +1,101 @@
 """Database singleton module for managing database connections."""
-from typing import Optional
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+import os
+from typing import Iterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy.pool import StaticPool
+from src.models.orm import Base
+
+DEFAULT_DATABASE_URL = "sqlite:///./sport_store.db"
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.endswith(":memory:") or url.rstrip("/") in ("sqlite:", "sqlite:/"))
+
+
+def apply_sqlite_pragmas(engine: Engine, mmap_size: int = SQLITE_MMAP_SIZE) -> None:
+    """Switch every new connection of a SQLite engine to WAL with memory-mapped reads."""
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        cursor.close()
+
+
+def create_database_engine(url: str, pool_size: int = 5, max_overflow: int = 10,
+                           pool_timeout: float = 30.0, mmap_size: int = SQLITE_MMAP_SIZE) -> Engine:
+    """Create an engine with a bounded connection pool.
+
+    SQLite connections are switched to WAL mode with ``synchronous=NORMAL``
+    and memory-mapped reads, so readers no longer block the writer.
+    In-memory SQLite databases share a single connection instead.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=pool_size, max_overflow=max_overflow,
+                             pool_timeout=pool_timeout, pool_pre_ping=True)
+
+    if _is_memory_sqlite(url):
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url, connect_args={"check_same_thread": False},
+                               pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    apply_sqlite_pragmas(engine, mmap_size)
+    return engine
+
 
 class DatabaseSingleton:
     """Singleton class for managing database connections."""
-    
+
     _instance = None
     _initialized = False
-    
+
     def __new__(cls):
         """Create a new instance if one doesn't exist."""
         if cls._instance is None:
             cls._instance = super(DatabaseSingleton, cls).__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         """Initialize the database connection if not already initialized."""
         if not DatabaseSingleton._initialized:
             # Database configuration
-            self.database_url = "sqlite:///./sport_store.db"
-            self.engine = create_engine(
+            self.database_url = os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL)
+            self.engine = create_database_engine(
                 self.database_url,
-                connect_args={"check_same_thread": False}
+                pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+                max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "10"))
             )
             self.session_local = sessionmaker(
                 autocommit=False,
                 autoflush=False,
                 bind=self.engine
             )
-            self.base = declarative_base()
+            # One session per thread for code outside a request
+            self.scoped_session = scoped_session(self.session_local)
+            self.base = Base
             DatabaseSingleton._initialized = True
-            self._session: Optional[Session] = None
-    
+
     @property
     def session(self) -> Session:
-        """Get the current database session."""
-        if self._session is None:
-            self._session = self.session_local()
-        return self._session
-    
+        """Get the database session of the current thread."""
+        return self.scoped_session()
+
     def close(self) -> None:
-        """Close the current database session."""
-        if self._session is not None:
-            self._session.close()
-            self._session = None
+        """Close the database session of the current thread."""
+        self.scoped_session.remove()
 
     def create_tables(self):
         """Create all tables in the database."""
         self.base.metadata.create_all(bind=self.engine)
 
-def get_db() -> Optional[Session]:
-    """Dependency for FastAPI to get database session."""
-    db = DatabaseSingleton().session
+def get_db() -> Iterator[Session]:
+    """Dependency for FastAPI yielding a session per request."""
+    db = DatabaseSingleton().session_local()
     try:
-        return db
+        yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
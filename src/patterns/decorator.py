@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict
 from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.money import from_cents, scale
 from datetime import datetime
 from typing import Optional
 
@@ -15,19 +16,35 @@ class EquipmentDecorator(Equipment, ABC):
             base_price=equipment.base_price,
             category=equipment.category,
             specs=equipment.specs,
-            id=equipment.id
+            id=equipment.id,
+            attributes=equipment.attributes
         )
         self._equipment = equipment
         
     def get_price(self) -> float:
         """Get decorated price."""
-        return self._equipment.get_price()
+        return from_cents(self.get_price_cents())
+
+    def get_price_cents(self) -> int:
+        """Get decorated price in cents; each layer rounds to the cent."""
+        return self._equipment.get_price_cents()
 
     @abstractmethod
     def get_description(self) -> str:
         """Get decorated description."""
         pass
 
+    def _price_params(self) -> tuple:
+        """Parameters of this layer that affect the price."""
+        return ()
+
+    def price_fingerprint(self) -> Optional[tuple]:
+        """Fingerprint of this layer plus the wrapped equipment."""
+        inner = self._equipment.price_fingerprint()
+        if inner is None:
+            return None
+        return (type(self).__name__, self._price_params(), inner)
+
     @property
     def final_price(self) -> float:
         """Отримати кінцеву ціну з урахуванням всіх декораторів"""
@@ -40,7 +57,8 @@ class EquipmentDecorator(Equipment, ABC):
             "description": self.description,
             "base_price": self.base_price,
             "category": self.category,
-            "specs": self.specs.dict()
+            "specs": self.specs.dict(),
+            "attributes": dict(self.attributes)
         }
 
 class WarrantyDecorator(EquipmentDecorator):
@@ -59,10 +77,13 @@ class WarrantyDecorator(EquipmentDecorator):
             warranty_months=str(warranty_months)
         )
 
-    def get_price(self) -> float:
+    def get_price_cents(self) -> int:
         """Calculate price with warranty."""
         # 10% increase per year
-        return self._equipment.get_price() * (1 + 0.1 * self.years)
+        return scale(self._equipment.get_price_cents(), 10000 + 1000 * self.years)
+
+    def _price_params(self) -> tuple:
+        return (self.years,)
 
     def get_description(self) -> str:
         """Get description with warranty."""
@@ -75,15 +96,18 @@ class InsuranceDecorator(EquipmentDecorator):
         self.level = level.lower()
         self.coverage_type = level.lower()  # Add coverage_type attribute for tests
 
-    def get_price(self) -> float:
+    def get_price_cents(self) -> int:
         """Calculate price with insurance."""
-        base_price = self._equipment.get_price()
+        base_price = self._equipment.get_price_cents()
         if self.level == "basic":
-            return base_price * 1.05  # 5% increase
+            return scale(base_price, 10500)  # 5% increase
         elif self.level == "premium":
-            return base_price * 1.15  # 15% increase
+            return scale(base_price, 11500)  # 15% increase
         else:
-            return base_price * 1.10  # 10% increase for standard
+            return scale(base_price, 11000)  # 10% increase for standard
+
+    def _price_params(self) -> tuple:
+        return (self.level,)
 
     def get_description(self) -> str:
         """Get description with insurance."""
@@ -97,11 +121,14 @@ class MaintenanceDecorator(EquipmentDecorator):
         super().__init__(equipment)
         self._visits = visits
         
-    def get_price(self) -> float:
+    def get_price_cents(self) -> int:
         """Get price with maintenance."""
-        base_price = self._equipment.get_price()
-        return base_price * (1 + 0.02 * self._visits)  # 2% increase per visit
+        base_price = self._equipment.get_price_cents()
+        return scale(base_price, 10000 + 200 * self._visits)  # 2% increase per visit
         
+    def _price_params(self) -> tuple:
+        return (self._visits,)
+
     def get_description(self) -> str:
         """Get description with maintenance."""
         return f"{self._equipment.get_description()} with {self._visits} maintenance visits"
@@ -116,7 +143,7 @@ class InstallationDecorator(EquipmentDecorator):
         """Get description with installation."""
         return f"{self._equipment.get_description()} with installation on {datetime.now().strftime('%Y-%m-%d')}"
 
-    def get_price(self) -> float:
+    def get_price_cents(self) -> int:
         """Get price with installation."""
-        base_price = self._equipment.get_price()
-        return base_price * 1.10  # 10% increase for installation
\ No newline at end of file
+        base_price = self._equipment.get_price_cents()
+        return scale(base_price, 11000)  # 10% increase for installation
\ No newline at end of file
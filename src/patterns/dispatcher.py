@@ -0,0 +1,373 @@
+"""Background delivery of order events to observers.
+
+``ObserverDispatcher`` gives every observer its own lane: a bounded queue
+served by a small pool of worker threads, each order pinned to one worker
+so its events stay in order.  ``NotificationSystem.notify`` only enqueues,
+so slow email/SMS backends no longer add to request latency, and a slow or
+failing observer cannot hold up the others.  Once the dispatcher is closed
+new events are rejected.
+
+When a lane is full the overflow policy decides what happens:
+
+* ``drop_oldest`` - discard the oldest queued event,
+* ``block`` - wait for space (up to ``block_timeout``, then drop the new
+  event); on an asyncio event-loop thread the new event is dropped at once
+  instead of stalling the loop,
+* ``spill`` - append the event to ``<spill_dir>/<lane>.spill`` and deliver
+  it once the queue has drained, keeping FIFO order.  ``lane`` is a stable
+  name given with ``add`` (the observer's class name by default), so events
+  left by an earlier run are delivered to the same observer after a
+  restart.  Each file is locked by the process using it, and spilled events
+  are read back at most ``maxsize`` at a time.
+"""
+import asyncio
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from src.patterns.tracing import tracer
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: spill files are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+SPILL = "spill"
+OVERFLOW_POLICIES = (DROP_OLDEST, BLOCK, SPILL)
+LANE_NAME_PATTERN = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+
+# (order, payload): an ``OrderEvent``, a bare event type, or a list of
+# event types for coalesced digests
+Event = Tuple[Any, Any]
+
+
+def _on_event_loop() -> bool:
+    """True when called from a thread running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ObserverLane:
+    """Bounded queue and workers for a single observer.
+
+    Each worker has its own queue and every order is pinned to one worker
+    by its ID, so the observer sees each order's events in submission
+    order even when several workers run.
+    """
+
+    def __init__(self, observer, name: str, maxsize: int, policy: str, workers: int,
+                 block_timeout: Optional[float], spill_path: Optional[str]):
+        """Initialize lane and start its workers."""
+        self.observer = observer
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self._spill_file = self._open_spill() if spill_path else None
+        self._spill_offset = 0  # bytes of the spill file already loaded
+        self._queues: List[deque] = [deque() for _ in range(workers)]
+        self._size = 0  # events in memory across all worker queues
+        self._spilled = self._count_spilled() if spill_path else 0
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {"enqueued": 0, "delivered": 0, "failed": 0,
+                      "dropped": 0, "spilled": 0, "max_depth": 0}
+        self._threads = [
+            threading.Thread(target=self._run, args=(index,), name=f"notify-{self.name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Events waiting in memory and on disk."""
+        return self._size + self._spilled
+
+    def _open_spill(self):
+        """Open the spill file for appending and lock it against other processes."""
+        file = open(self.spill_path, "ab")
+        if fcntl is not None:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                file.close()
+                raise ValueError(f"Spill file {self.spill_path} is in use by another dispatcher")
+        return file
+
+    def _count_spilled(self) -> int:
+        """Events an earlier lane left in the spill file."""
+        count = 0
+        with open(self.spill_path, "rb") as file:
+            while True:
+                try:
+                    pickle.load(file)
+                except (EOFError, pickle.UnpicklingError):
+                    return count
+                count += 1
+
+    def _queue_for(self, order) -> deque:
+        return self._queues[hash(order.id) % len(self._queues)]
+
+    def put(self, event: Event) -> bool:
+        """Enqueue an event; returns False if it was dropped."""
+        with self._condition:
+            if self._closed:
+                return False
+            self.stats["enqueued"] += 1
+            queue = self._queue_for(event[0])
+            # While events sit on disk, newer ones follow them to keep FIFO order
+            if self._spilled or self._size >= self.maxsize:
+                if not self._overflow(event, queue):
+                    return False
+            else:
+                queue.append(event)
+                self._size += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], self.depth)
+            self._condition.notify_all()
+            return True
+
+    def _overflow(self, event: Event, queue: deque) -> bool:
+        """Apply the overflow policy; called with the lock held."""
+        if self.policy == DROP_OLDEST:
+            victim = queue if queue else max(self._queues, key=len)
+            victim.popleft()
+            queue.append(event)
+            self.stats["dropped"] += 1
+            return True
+        if self.policy == SPILL:
+            try:
+                self._spill_file.write(pickle.dumps(event))
+                self._spill_file.flush()
+            except (pickle.PicklingError, TypeError, AttributeError, OSError) as error:
+                # Only whole events are written, so the file stays readable
+                logger.error("Could not spill event for %s: %s", self.name, error)
+                self.stats["dropped"] += 1
+                return False
+            self._spilled += 1
+            self.stats["spilled"] += 1
+            return True
+        if _on_event_loop():
+            # Waiting here would stall every request on the loop
+            self.stats["dropped"] += 1
+            return False
+        deadline = None if self.block_timeout is None else time.monotonic() + self.block_timeout
+        while self._size >= self.maxsize and not self._closed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.stats["dropped"] += 1
+                return False
+            self._condition.wait(remaining)
+        queue.append(event)
+        self._size += 1
+        return True
+
+    def _take(self, index: int) -> Optional[Event]:
+        """Next event for worker ``index``, or None once closed and drained."""
+        queue = self._queues[index]
+        with self._condition:
+            while not queue:
+                if self._spilled and not self._size:
+                    self._load_spill()
+                    self._condition.notify_all()
+                    continue
+                if self._closed and not self._spilled:
+                    return None
+                self._condition.wait()
+            self._size -= 1
+            self._in_flight += 1
+            self._condition.notify_all()
+            return queue.popleft()
+
+    def _load_spill(self) -> None:
+        """Move up to ``maxsize`` spilled events to their workers' queues.
+
+        Called with the lock held.  The file is emptied once fully read.
+        """
+        loaded = 0
+        exhausted = False
+        with open(self.spill_path, "rb") as file:
+            file.seek(self._spill_offset)
+            while loaded < self.maxsize:
+                try:
+                    event = pickle.load(file)
+                except (EOFError, pickle.UnpicklingError):
+                    exhausted = True
+                    break
+                self._queue_for(event[0]).append(event)
+                loaded += 1
+            self._spill_offset = file.tell()
+        self._size += loaded
+        self._spilled = 0 if exhausted else self._spilled - loaded
+        if not self._spilled:
+            self._spill_file.truncate(0)
+            self._spill_offset = 0
+
+    def _run(self, index: int) -> None:
+        """Worker loop."""
+        while True:
+            event = self._take(index)
+            if event is None:
+                return
+            order, payload = event
+            try:
+                with tracer.span(f"observer.{self.name}", order_id=order.id):
+                    if isinstance(payload, list):
+                        self.observer.update_digest(order, payload)
+                    elif isinstance(payload, str):
+                        self.observer.update(order, payload)
+                    else:
+                        self.observer.on_event(payload)
+                outcome = "delivered"
+            except Exception:
+                logger.exception("%s failed to handle %s for order %s", self.name, payload, order.id)
+                outcome = "failed"
+            with self._condition:
+                self.stats[outcome] += 1
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been handled."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._size or self._spilled or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events, drain and stop the workers."""
+        self.join(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lane metrics."""
+        with self._condition:
+            return {"depth": self.depth, "in_flight": self._in_flight, **self.stats}
+
+
+class ObserverDispatcher:
+    """Delivers events to observers from background worker lanes."""
+
+    def __init__(self, maxsize: int = 1000, policy: str = DROP_OLDEST, workers: int = 1,
+                 block_timeout: Optional[float] = 1.0, spill_dir: Optional[str] = None):
+        """Initialize dispatcher; the ``spill`` policy needs a ``spill_dir`` of its own."""
+        if maxsize <= 0:
+            raise ValueError("Queue size must be positive")
+        if workers <= 0:
+            raise ValueError("Workers must be positive")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if policy == SPILL and not spill_dir:
+            raise ValueError("Spill policy needs a spill directory")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.workers = workers
+        self.block_timeout = block_timeout
+        self.spill_dir = spill_dir
+        if policy == SPILL:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._lanes: Dict[int, ObserverLane] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def add(self, observer, lane: Optional[str] = None) -> None:
+        """Create the observer's lane now, named ``lane``.
+
+        The name must be unique in this dispatcher and stable across
+        restarts; the spill file is keyed on it.  Defaults to the observer's
+        class name.
+        """
+        name = lane or observer.__class__.__name__
+        if not LANE_NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"Invalid lane name: {name}")
+        with self._lock:
+            existing = self._lanes.get(id(observer))
+            if existing is not None:
+                if existing.name != name:
+                    raise ValueError(f"Observer already has lane {existing.name}")
+                return
+            if self._closed:
+                raise ValueError("Dispatcher is closed")
+            if any(other.name == name for other in self._lanes.values()):
+                raise ValueError(f"Lane name already in use: {name}")
+            spill_path = os.path.join(self.spill_dir, f"{name}.spill") if self.policy == SPILL else None
+            self._lanes[id(observer)] = ObserverLane(observer, name, self.maxsize, self.policy,
+                                                     self.workers, self.block_timeout, spill_path)
+
+    def _lane(self, observer) -> Optional[ObserverLane]:
+        lane = self._lanes.get(id(observer))
+        if lane is None and not self._closed:
+            try:
+                self.add(observer)
+            except (ValueError, OSError) as error:
+                logger.error("No lane for %s: %s", observer.__class__.__name__, error)
+                return None
+            lane = self._lanes.get(id(observer))
+        return lane
+
+    def submit(self, observer, order, payload) -> bool:
+        """Queue one event (or coalesced digest) for one observer.
+
+        Returns False if the event was dropped or the dispatcher is closed.
+        """
+        lane = self._lane(observer)
+        if lane is None:
+            return False
+        return lane.put((order, payload))
+
+    def remove(self, observer, timeout: Optional[float] = None) -> None:
+        """Drain and stop an observer's lane."""
+        with self._lock:
+            lane = self._lanes.pop(id(observer), None)
+        if lane is not None:
+            lane.close(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all lanes have drained."""
+        return all(lane.join(timeout) for lane in list(self._lanes.values()))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drain and stop all lanes; later submits are rejected."""
+        with self._lock:
+            self._closed = True
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for lane in lanes:
+            lane.close(timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and delivery counters per observer."""
+        lanes: Dict[str, Dict[str, Any]] = {}
+        for lane in list(self._lanes.values()):
+            name, suffix = lane.name, 2
+            while name in lanes:
+                name, suffix = f"{lane.name}#{suffix}", suffix + 1
+            lanes[name] = lane.snapshot()
+        return {
+            "policy": self.policy,
+            "queue_depth": sum(lane["depth"] for lane in lanes.values()),
+            "observers": lanes
+        }
@@ -0,0 +1,288 @@
+"""SMTP email delivery for order notifications.
+
+``SMTPEmailNotifier`` is an order observer that queues messages and sends
+them from a fixed set of persistent SMTP sessions
+(``SMTPConnectionPool``).  Each worker takes up to ``batch_size`` queued
+messages and sends them back to back over one session, so the connect and
+EHLO cost is paid once per session instead of once per message.
+``DomainRateLimiter`` spaces out messages per recipient domain; a worker
+that has to wait for a token returns its session to the pool first.
+"""
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional
+from src.models.order import Order
+from src.patterns.observer import OrderObserver
+
+logger = logging.getLogger(__name__)
+
+
+class DomainRateLimiter:
+    """Token bucket per recipient domain."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: Optional[float] = None,
+                 burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize limiter; rates are messages per second, None means unlimited."""
+        for domain, rate in (rates or {}).items():
+            if rate <= 0:
+                raise ValueError(f"Rate for {domain} must be positive")
+        if burst <= 0:
+            raise ValueError("Burst must be positive")
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, domain: str) -> float:
+        """Take a token for ``domain``; returns how long to wait before sending."""
+        rate = self.rates.get(domain, self.default_rate)
+        if rate is None:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(domain, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * rate) - 1
+            self._buckets[domain] = [tokens, now]
+        return -tokens / rate if tokens < 0 else 0.0
+
+    def wait(self, seconds: float) -> None:
+        """Sleep for a delay returned by ``reserve``."""
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def acquire(self, domain: str) -> None:
+        """Block until a message to ``domain`` may be sent."""
+        self.wait(self.reserve(domain))
+
+
+class SMTPConnectionPool:
+    """Up to ``size`` persistent SMTP sessions, opened lazily."""
+
+    def __init__(self, host: str, port: int = 25, size: int = 4, timeout: float = 10.0,
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = False):
+        """Initialize connection pool."""
+        if size <= 0:
+            raise ValueError("Pool size must be positive")
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        connection.ehlo()
+        if self.starttls:
+            connection.starttls()
+            connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        with self._lock:
+            self.opened += 1
+        return connection
+
+    def acquire(self) -> smtplib.SMTP:
+        """Check out a session, opening one if none is idle."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                return self._connect()
+            except Exception:
+                self._slots.release()
+                raise
+
+    def release(self, connection: smtplib.SMTP, broken: bool = False) -> None:
+        """Return a session; broken sessions are closed instead."""
+        if broken:
+            try:
+                connection.close()
+            finally:
+                self._slots.release()
+            return
+        self._idle.put(connection)
+        self._slots.release()
+
+    def reconnect(self, connection: smtplib.SMTP) -> smtplib.SMTP:
+        """Replace a dropped session within the same slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        return self._connect()
+
+    def close(self) -> None:
+        """QUIT every idle session."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                connection.close()
+
+
+def build_message(order: Order, event_types: List[str], sender: str) -> EmailMessage:
+    """Order notification email."""
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = order.customer_email
+    message["Subject"] = f"Order {order.id}: {', '.join(event_types)}"
+    message.set_content(
+        f"Your order {order.id} has been updated: {', '.join(event_types)}.\n"
+        f"Current status: {order.status}\n"
+    )
+    return message
+
+
+class SMTPEmailNotifier(OrderObserver):
+    """Order observer that delivers emails through pooled SMTP sessions."""
+
+    def __init__(self, pool: SMTPConnectionPool, sender: str = "orders@sport-store.local",
+                 batch_size: int = 50, rate_limiter: Optional[DomainRateLimiter] = None,
+                 max_queue: int = 10000):
+        """Initialize notifier and start one worker per pooled session."""
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        self.pool = pool
+        self.sender = sender
+        self.batch_size = batch_size
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self._queue: "queue.Queue[Optional[EmailMessage]]" = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "sent": 0, "failed": 0, "batches": 0}
+        self._workers = [
+            threading.Thread(target=self._run, name=f"smtp-{index}", daemon=True)
+            for index in range(pool.size)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def update(self, order: Order, event_type: str) -> None:
+        """Queue an email for one event."""
+        self.update_digest(order, [event_type])
+
+    def update_digest(self, order: Order, event_types: List[str]) -> None:
+        """Queue one email covering all events."""
+        if not order.customer_email:
+            logger.warning("No email address available for order %s", order.id,
+                           extra={"order_id": order.id, "channel": "email"})
+            return
+        self.send(build_message(order, event_types, self.sender))
+
+    def send(self, message: EmailMessage) -> None:
+        """Queue a prepared message."""
+        with self._lock:
+            self.stats["queued"] += 1
+        self._queue.put(message)
+
+    def _next_batch(self) -> Optional[List[EmailMessage]]:
+        first = self._queue.get()
+        if first is None:
+            self._queue.task_done()
+            return None
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                # Put the stop marker back for this worker's next round
+                self._queue.task_done()
+                self._queue.put(None)
+                break
+            batch.append(message)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _send_batch(self, batch: List[EmailMessage]) -> None:
+        """Send a batch over one session, reconnecting once if it drops.
+
+        Rate-limit waits happen without a session checked out, so other
+        workers can use it meanwhile.
+        """
+        connection = None
+        broken = False
+        sent = failed = 0
+        for index, message in enumerate(batch):
+            wait = self.rate_limiter.reserve(message["To"].rpartition("@")[2].lower())
+            if wait > 0 and connection is not None:
+                self.pool.release(connection, broken)
+                connection, broken = None, False
+            self.rate_limiter.wait(wait)
+            if connection is None:
+                try:
+                    connection = self.pool.acquire()
+                except (smtplib.SMTPException, OSError) as error:
+                    logger.error("Cannot connect to SMTP server: %s", error)
+                    failed += len(batch) - index
+                    break
+            for attempt in range(2):
+                try:
+                    connection.send_message(message)
+                    sent += 1
+                    broken = False
+                    break
+                except (smtplib.SMTPServerDisconnected, OSError) as error:
+                    if attempt:
+                        logger.error("SMTP delivery to %s failed: %s", message["To"], error)
+                        failed += 1
+                        broken = True
+                        break
+                    try:
+                        connection = self.pool.reconnect(connection)
+                    except (smtplib.SMTPException, OSError):
+                        failed += 1
+                        broken = True
+                        break
+                except smtplib.SMTPException as error:
+                    logger.error("SMTP rejected message to %s: %s", message["To"], error)
+                    failed += 1
+                    break
+        if connection is not None:
+            self.pool.release(connection, broken)
+        with self._lock:
+            self.stats["sent"] += sent
+            self.stats["failed"] += failed
+            self.stats["batches"] += 1
+
+    def flush(self) -> None:
+        """Block until every queued message has been handled."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Deliver queued messages, stop workers and close sessions."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self.pool.close()
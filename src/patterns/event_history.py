@@ -0,0 +1,151 @@
+"""Fixed-memory history of order events.
+
+``EventHistory`` is a ring buffer: timestamps and event-type codes live in
+preallocated ``array`` columns, event types are interned to small integers,
+and once ``capacity`` events are stored each new event overwrites the
+oldest.  Slots hold an ``OrderSnapshot`` of the few order fields observers
+read, with the order ID interned, never the live ``Order``: memory stays
+bounded by ``capacity`` and replayed events show the order as it was.  A
+per-order index serves an order's timeline, and because timestamps are
+appended in order, ``replay(since=...)`` starts from a binary search
+instead of scanning the whole buffer.
+"""
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Union
+from src.models.order import Order
+from src.patterns.observer import OrderEvent, OrderObserver
+
+Since = Union[datetime, float, None]
+
+
+class OrderSnapshot(NamedTuple):
+    """Order fields as they were when an event was recorded."""
+    id: str
+    customer_id: str
+    customer_name: Optional[str]
+    customer_email: Optional[str]
+    status: str
+
+    @classmethod
+    def of(cls, order: Order) -> "OrderSnapshot":
+        """Copy the fields observers read from a live order."""
+        return cls(sys.intern(order.id), order.customer_id, order.customer_name,
+                   order.customer_email, sys.intern(order.status))
+
+
+class EventHistory:
+    """Ring buffer of order events indexed by order ID and timestamp."""
+
+    def __init__(self, capacity: int = 100000, clock: Callable[[], float] = time.time):
+        """Preallocate storage for ``capacity`` events."""
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._clock = clock
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._types = array("H", bytes(2 * capacity))
+        self._orders: List[Optional[OrderSnapshot]] = [None] * capacity
+        self._type_codes: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._by_order: Dict[str, Deque[int]] = {}
+        self._next = 0  # sequence number of the next event
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    @property
+    def _first(self) -> int:
+        """Sequence number of the oldest stored event."""
+        return max(0, self._next - self.capacity)
+
+    def _intern(self, event_type: str) -> int:
+        code = self._type_codes.get(event_type)
+        if code is None:
+            if len(self._type_names) > 0xFFFF:
+                raise ValueError("Too many distinct event types")
+            code = self._type_codes[event_type] = len(self._type_names)
+            self._type_names.append(event_type)
+        return code
+
+    def record(self, order: Order, event_type: str) -> None:
+        """Append an event, overwriting the oldest one when full."""
+        with self._lock:
+            sequence = self._next
+            slot = sequence % self.capacity
+            if sequence >= self.capacity:
+                evicted = self._orders[slot]
+                order_events = self._by_order[evicted.id]
+                order_events.popleft()
+                if not order_events:
+                    del self._by_order[evicted.id]
+            now = self._clock()
+            # Keep timestamps non-decreasing so ``since`` can bisect
+            if sequence and now < self._timestamps[(sequence - 1) % self.capacity]:
+                now = self._timestamps[(sequence - 1) % self.capacity]
+            self._timestamps[slot] = now
+            self._types[slot] = self._intern(event_type)
+            snapshot = OrderSnapshot.of(order)
+            self._orders[slot] = snapshot
+            self._by_order.setdefault(snapshot.id, deque()).append(sequence)
+            self._next = sequence + 1
+
+    def _event(self, sequence: int) -> OrderEvent:
+        slot = sequence % self.capacity
+        return OrderEvent(self._orders[slot], self._type_names[self._types[slot]],
+                          datetime.fromtimestamp(self._timestamps[slot]))
+
+    def _first_since(self, since: float) -> int:
+        """First sequence number with timestamp >= ``since``."""
+        low, high = self._first, self._next
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[middle % self.capacity] < since:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def timeline(self, order_id: str) -> List[OrderEvent]:
+        """Stored events of one order, oldest first; each carries an ``OrderSnapshot``."""
+        with self._lock:
+            return [self._event(sequence) for sequence in self._by_order.get(order_id, ())]
+
+    def replay(self, since: Since = None, event_types: Optional[Iterable[str]] = None) -> List[OrderEvent]:
+        """Stored events at or after ``since``, optionally only some event types."""
+        if isinstance(since, datetime):
+            since = since.timestamp()
+        with self._lock:
+            start = self._first if since is None else self._first_since(since)
+            codes = None
+            if event_types is not None:
+                codes = {self._type_codes[name] for name in event_types if name in self._type_codes}
+            return [
+                self._event(sequence) for sequence in range(start, self._next)
+                if codes is None or self._types[sequence % self.capacity] in codes
+            ]
+
+    def replay_to(self, observer: OrderObserver, since: Since = None,
+                  event_types: Optional[Iterable[str]] = None) -> int:
+        """Feed stored events to an observer; returns how many were replayed."""
+        events = self.replay(since, event_types)
+        for event in events:
+            observer.on_event(event)
+        return len(events)
+
+    def stats(self) -> Dict[str, int]:
+        """Buffer usage."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "size": len(self),
+                "recorded": self._next,
+                "overwritten": self._first,
+                "orders": len(self._by_order),
+                "event_types": len(self._type_names)
+            }
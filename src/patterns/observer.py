@@ -1,20 +1,22 @@
 """Observer pattern implementation."""
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 from src.models.order import Order
+from src.patterns.tracing import tracer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class OrderEvent:
     """Order event class."""
-    def __init__(self, order: Order, event_type: str):
+    __slots__ = ("order", "event_type", "timestamp")
+
+    def __init__(self, order: Order, event_type: str, timestamp: Optional[datetime] = None):
         self.order = order
         self.event_type = event_type
-        self.timestamp = datetime.now()
+        self.timestamp = timestamp or datetime.now()
 
 class OrderObserver(ABC):
     """Abstract base class for order observers."""
@@ -23,49 +25,226 @@ class OrderObserver(ABC):
         """Update observer with order event."""
         pass
 
+    def on_event(self, event: OrderEvent) -> None:
+        """Handle an event payload; defaults to ``update``."""
+        self.update(event.order, event.event_type)
+
+    def update_digest(self, order: Order, event_types: List[str]) -> None:
+        """Handle coalesced events; observers that send messages override
+        this to send one digest instead of one message per event."""
+        for event_type in event_types:
+            self.update(order, event_type)
+
+EventPredicate = Callable[[OrderEvent], bool]
+
+class Subscription:
+    """Observer with the event types and predicate it subscribed with."""
+    __slots__ = ("observer", "event_types", "predicate")
+
+    def __init__(self, observer: OrderObserver, event_types: Optional[FrozenSet[str]],
+                 predicate: Optional[EventPredicate]):
+        self.observer = observer
+        self.event_types = event_types
+        self.predicate = predicate
+
+    def accepts(self, event: OrderEvent) -> bool:
+        """Check topic and predicate."""
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        return self.predicate is None or self.predicate(event)
+
 class NotificationSystem:
-    """Notification system for order events."""
-    def __init__(self):
+    """Notification system for order events.
+
+    Observers subscribe to all events or to specific event types, optionally
+    narrowed by a predicate over the ``OrderEvent``.  Dispatch looks the
+    event type up in a topic index, so observers of other topics cost nothing.
+
+    With a ``dispatcher`` (see ``src.patterns.dispatcher``) ``notify`` only
+    queues the event and observers run on background workers; without one
+    observers are called inline.  With a ``coalescer`` (see
+    ``src.patterns.coalescing``) events are buffered per order and observers
+    receive one digest per order.  With a ``history`` (see
+    ``src.patterns.event_history``) every event is recorded before delivery.
+    """
+    def __init__(self, dispatcher=None, coalescer=None, history=None):
         """Initialize notification system."""
         self._observers: List[OrderObserver] = []
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+        # Guards subscription changes; the coalescer thread delivers concurrently
+        self._lock = threading.Lock()
+        self.dispatcher = dispatcher
+        self.coalescer = coalescer
+        self.history = history
+        if coalescer is not None:
+            coalescer.start(self._deliver)
         logger.info("Notification system initialized")
 
-    def attach(self, observer: OrderObserver) -> None:
-        """Attach observer to notification system."""
-        if observer not in self._observers:
+    def attach(self, observer: OrderObserver, event_types: Optional[Iterable[str]] = None,
+               predicate: Optional[EventPredicate] = None, lane: Optional[str] = None) -> None:
+        """Attach observer to all events, or to ``event_types`` only.
+
+        Attaching an attached observer again replaces its subscription.
+        ``lane`` names the observer's dispatcher lane (see
+        ``ObserverDispatcher.add``).
+        """
+        if self.dispatcher is not None and lane is not None:
+            self.dispatcher.add(observer, lane)
+        topics = frozenset(event_types) if event_types is not None else None
+        with self._lock:
+            self._subscriptions[id(observer)] = Subscription(observer, topics, predicate)
+            self._routes.clear()
+            if observer in self._observers:
+                return
             self._observers.append(observer)
-            logger.info(f"Attached {observer.__class__.__name__} to notification system")
+        logger.info("Attached %s to notification system", observer.__class__.__name__)
+
+    def subscribe(self, observer: OrderObserver, *event_types: str,
+                  predicate: Optional[EventPredicate] = None, lane: Optional[str] = None) -> None:
+        """Attach observer to the given event types."""
+        self.attach(observer, event_types, predicate, lane)
 
     def detach(self, observer: OrderObserver) -> None:
         """Detach observer from notification system."""
-        if observer in self._observers:
+        with self._lock:
+            if observer not in self._observers:
+                return
             self._observers.remove(observer)
-            logger.info(f"Detached {observer.__class__.__name__} from notification system")
+            del self._subscriptions[id(observer)]
+            self._routes.clear()
+        if self.dispatcher is not None:
+            self.dispatcher.remove(observer)
+        logger.info("Detached %s from notification system", observer.__class__.__name__)
+
+    def notify(self, order: Order, event_type: str) -> bool:
+        """Notify all observers about an order event - метод, що викликається в тестах.
+
+        Returns False if the dispatcher dropped the event for an observer.
+        """
+        logger.info("Notifying observers about order %s event: %s", order.id, event_type,
+                    extra={"order_id": order.id, "event_type": event_type})
+        with tracer.span(f"notify.{event_type}", order_id=order.id):
+            if self.history is not None:
+                self.history.record(order, event_type)
+            if self.coalescer is None:
+                return self._deliver(order, event_type)
+            digest = self.coalescer.add(order, event_type)
+            if digest is not None:
+                return self._deliver(*digest)
+            return True
+
+    def notify_now(self, order: Order, event_type: str) -> None:
+        """Run every subscribed observer before returning; observer errors propagate.
+
+        Bypasses the coalescer and dispatcher, so nothing can be dropped on
+        the way; the outbox relay uses this to mark an event delivered only
+        once its observers have run.
+        """
+        logger.info("Delivering order %s event: %s", order.id, event_type,
+                    extra={"order_id": order.id, "event_type": event_type})
+        with tracer.span(f"notify.{event_type}", order_id=order.id):
+            if self.history is not None:
+                self.history.record(order, event_type)
+            payload = OrderEvent(order, event_type)
+            for subscription in self._route(event_type):
+                if subscription.predicate is not None and not subscription.predicate(payload):
+                    continue
+                observer = subscription.observer
+                with tracer.span(f"observer.{observer.__class__.__name__}"):
+                    observer.on_event(payload)
 
-    def notify(self, order: Order, event_type: str) -> None:
-        """Notify all observers about an order event - метод, що викликається в тестах."""
-        logger.info(f"Notifying observers about order {order.id} event: {event_type}")
-        for observer in self._observers:
-            observer.update(order, event_type)
+    def _route(self, event_type: str) -> Tuple[Subscription, ...]:
+        """Subscriptions for an event type, cached until subscriptions change."""
+        route = self._routes.get(event_type)
+        if route is None:
+            with self._lock:
+                subscriptions = [self._subscriptions[id(observer)] for observer in self._observers]
+                route = tuple(
+                    subscription for subscription in subscriptions
+                    if subscription.event_types is None or event_type in subscription.event_types
+                )
+                self._routes[event_type] = route
+        return route
 
-    def notify_observers(self, order: Order, event_type: str) -> None:
+    def _deliver(self, order: Order, event: Union[str, List[str]]) -> bool:
+        """Hand an event or digest to subscribed observers; False if any dropped it."""
+        if isinstance(event, list):
+            return self._deliver_digest(order, event)
+        payload = OrderEvent(order, event)
+        accepted = True
+        for subscription in self._route(event):
+            if subscription.predicate is not None and not subscription.predicate(payload):
+                continue
+            observer = subscription.observer
+            if self.dispatcher is not None:
+                if not self.dispatcher.submit(observer, order, payload):
+                    accepted = False
+            else:
+                with tracer.span(f"observer.{observer.__class__.__name__}"):
+                    observer.on_event(payload)
+        return accepted
+
+    def _deliver_digest(self, order: Order, event_types: List[str]) -> bool:
+        """Hand each observer the part of a digest it subscribed to."""
+        # Subscription -> accepted event types, looked up through the topic index
+        accepted: Dict[int, Tuple[Subscription, List[str]]] = {}
+        for event_type in event_types:
+            payload = OrderEvent(order, event_type)
+            for subscription in self._route(event_type):
+                if subscription.predicate is not None and not subscription.predicate(payload):
+                    continue
+                accepted.setdefault(id(subscription), (subscription, []))[1].append(event_type)
+        delivered = True
+        for subscription, subscribed in accepted.values():
+            observer = subscription.observer
+            if self.dispatcher is not None:
+                if not self.dispatcher.submit(observer, order, subscribed):
+                    delivered = False
+            else:
+                with tracer.span(f"observer.{observer.__class__.__name__}"):
+                    observer.update_digest(order, subscribed)
+        return delivered
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver buffered digests and wait for queued events."""
+        if self.coalescer is not None:
+            for order, events in self.coalescer.drain():
+                self._deliver(order, events)
+        if self.dispatcher is None:
+            return True
+        return self.dispatcher.join(timeout)
+
+    def notify_observers(self, order: Order, event_type: str) -> bool:
         """Notify all observers about an order event - альтернативний метод."""
-        self.notify(order, event_type)
+        return self.notify(order, event_type)
 
 class EmailNotifier(OrderObserver):
     """Email notification observer."""
     def update(self, order: Order, event_type: str) -> None:
         """Send email notification."""
         if hasattr(order, 'customer_email') and order.customer_email:
-            logger.info(f"Sending email to {order.customer_email} about order {order.id} {event_type}")
+            logger.info("Sending email to %s about order %s %s", order.customer_email, order.id, event_type,
+                        extra={"order_id": order.id, "event_type": event_type, "channel": "email"})
         else:
-            logger.warning(f"No email address available for order {order.id}")
+            logger.warning("No email address available for order %s", order.id,
+                           extra={"order_id": order.id, "channel": "email"})
+
+    def update_digest(self, order: Order, event_types: List[str]) -> None:
+        """Send one email covering all coalesced events."""
+        self.update(order, ", ".join(event_types))
 
 class SMSNotifier(OrderObserver):
     """SMS notification observer."""
     def update(self, order: Order, event_type: str) -> None:
         """Send SMS notification."""
         if hasattr(order, 'customer_name') and order.customer_name:
-            logger.info(f"Sending SMS to {order.customer_name} about order {order.id} {event_type}")
+            logger.info("Sending SMS to %s about order %s %s", order.customer_name, order.id, event_type,
+                        extra={"order_id": order.id, "event_type": event_type, "channel": "sms"})
         else:
-            logger.warning(f"No customer name available for order {order.id}")
\ No newline at end of file
+            logger.warning("No customer name available for order %s", order.id,
+                           extra={"order_id": order.id, "channel": "sms"})
+
+    def update_digest(self, order: Order, event_types: List[str]) -> None:
+        """Send one SMS covering all coalesced events."""
+        self.update(order, ", ".join(event_types))
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Transactional outbox for order notifications.
+
+Instead of notifying observers inline, the API writes the event to an
+``outbox`` table; passing ``connection`` to ``add`` commits it together with
+the caller's own rows.  ``OutboxRelay`` delivers pending rows in batches
+from a background thread, retries failures with exponential backoff and
+marks rows delivered only after the handler returned without reporting a
+drop, so every event is delivered at least once even if the process dies
+in between.
+Consumers must therefore tolerate duplicates.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, func, select, update
+from sqlalchemy.engine import Connection, Engine
+from src.models.order import Order
+from src.patterns.database_singleton import DatabaseSingleton
+from src.patterns.saga import restore_order
+from src.patterns.singleton import EquipmentInventory
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """Outbox table accessed through a SQLAlchemy engine."""
+
+    def __init__(self, engine: Optional[Engine] = None, clock: Callable[[], float] = time.time,
+                 create_tables: bool = True):
+        """Initialize outbox; defaults to the ``DatabaseSingleton`` engine.
+
+        With ``create_tables=False`` nothing touches the database until
+        ``create_tables()`` is called.
+        """
+        self.engine = engine if engine is not None else DatabaseSingleton().engine
+        self.clock = clock
+        metadata = MetaData()
+        self.table = Table(
+            "outbox", metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("order_id", String(36), nullable=False),
+            Column("event_type", String(32), nullable=False),
+            Column("payload", Text, nullable=False),
+            Column("created_at", Float, nullable=False),
+            Column("attempts", Integer, nullable=False, default=0),
+            Column("next_attempt_at", Float, nullable=False),
+            Column("delivered_at", Float),
+            Column("last_error", Text),
+            Index("ix_outbox_pending", "delivered_at", "next_attempt_at")
+        )
+        if create_tables:
+            self.create_tables()
+
+    def create_tables(self) -> None:
+        """Create the outbox table if it does not exist."""
+        self.table.metadata.create_all(self.engine)
+
+    def add(self, order: Order, event_type: str, connection: Optional[Connection] = None) -> None:
+        """Record an event; pass ``connection`` to join the caller's transaction."""
+        now = self.clock()
+        statement = self.table.insert().values(
+            order_id=order.id, event_type=event_type,
+            payload=json.dumps(order.to_dict(), default=str),
+            created_at=now, attempts=0, next_attempt_at=now
+        )
+        if connection is not None:
+            connection.execute(statement)
+            return
+        with self.engine.begin() as own_connection:
+            own_connection.execute(statement)
+
+    def due(self, limit: int, now: Optional[float] = None) -> List[dict]:
+        """Oldest undelivered rows whose retry time has come."""
+        now = self.clock() if now is None else now
+        table = self.table
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(table.c.id, table.c.order_id, table.c.event_type, table.c.payload,
+                       table.c.created_at, table.c.attempts)
+                .where(table.c.delivered_at.is_(None), table.c.next_attempt_at <= now)
+                .order_by(table.c.id).limit(limit)
+            )
+            return [dict(row._mapping) for row in rows]
+
+    def mark_delivered(self, ids: List[int], now: Optional[float] = None) -> None:
+        """Mark a batch of rows delivered in one transaction."""
+        if not ids:
+            return
+        now = self.clock() if now is None else now
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(self.table).where(self.table.c.id.in_(ids)).values(delivered_at=now)
+            )
+
+    def mark_failed(self, row_id: int, error: str, next_attempt_at: float) -> None:
+        """Record a failed attempt and when to retry."""
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(self.table).where(self.table.c.id == row_id).values(
+                    attempts=self.table.c.attempts + 1, last_error=error,
+                    next_attempt_at=next_attempt_at
+                )
+            )
+
+    def pending(self) -> int:
+        """Number of undelivered rows."""
+        with self.engine.connect() as connection:
+            return connection.execute(
+                select(func.count()).select_from(self.table).where(self.table.c.delivered_at.is_(None))
+            ).scalar()
+
+    def lag(self, now: Optional[float] = None) -> float:
+        """Age in seconds of the oldest undelivered row (0 when caught up)."""
+        now = self.clock() if now is None else now
+        with self.engine.connect() as connection:
+            oldest = connection.execute(
+                select(func.min(self.table.c.created_at)).where(self.table.c.delivered_at.is_(None))
+            ).scalar()
+        return max(0.0, now - oldest) if oldest is not None else 0.0
+
+    def purge(self, older_than: float) -> int:
+        """Delete rows delivered before ``older_than``; returns the count."""
+        with self.engine.begin() as connection:
+            result = connection.execute(
+                self.table.delete().where(self.table.c.delivered_at < older_than)
+            )
+            return result.rowcount
+
+
+class OutboxRelay:
+    """Delivers outbox rows to a handler from a background thread."""
+
+    def __init__(self, outbox: Outbox, deliver: Callable[[Order, str], Optional[bool]],
+                 batch_size: int = 100, interval: float = 0.5,
+                 backoff_base: float = 0.5, backoff_max: float = 60.0):
+        """Initialize relay.
+
+        ``deliver`` may return False to report the event was dropped; the
+        row is then retried like a failed delivery.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self.outbox = outbox
+        self.deliver = deliver
+        self.batch_size = batch_size
+        self.interval = interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {"delivered": 0, "failed": 0, "batches": 0, "max_delivery_lag": 0.0}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_order(self, row: dict) -> Order:
+        """Prefer the live order from the inventory, else the stored snapshot."""
+        order = EquipmentInventory().get_order(row["order_id"])
+        return order if order is not None else restore_order(json.loads(row["payload"]))
+
+    def run_once(self) -> int:
+        """Deliver one batch; returns the number of delivered rows."""
+        rows = self.outbox.due(self.batch_size)
+        if not rows:
+            return 0
+        delivered = []
+        for row in rows:
+            try:
+                accepted = self.deliver(self._load_order(row), row["event_type"])
+                error = None if accepted is not False else "event dropped before delivery"
+            except Exception as exc:
+                error = repr(exc)
+            if error is None:
+                delivered.append(row)
+                continue
+            delay = min(self.backoff_max, self.backoff_base * (2 ** row["attempts"]))
+            self.outbox.mark_failed(row["id"], error, self.outbox.clock() + delay)
+            self.stats["failed"] += 1
+            logger.warning("Outbox delivery of %s for order %s failed: %s",
+                           row["event_type"], row["order_id"], error)
+        now = self.outbox.clock()
+        self.outbox.mark_delivered([row["id"] for row in delivered], now)
+        self.stats["delivered"] += len(delivered)
+        self.stats["batches"] += 1
+        if delivered:
+            lag = now - min(row["created_at"] for row in delivered)
+            self.stats["max_delivery_lag"] = max(self.stats["max_delivery_lag"], lag)
+        return len(delivered)
+
+    def drain(self) -> int:
+        """Deliver until nothing is due; returns the number delivered."""
+        total = 0
+        while True:
+            count = self.run_once()
+            total += count
+            if count < self.batch_size:
+                return total
+
+    def wake(self) -> None:
+        """Ask the background thread to run now instead of after the interval."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the background relay thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the relay after its current batch."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Outbox relay batch failed")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def metrics(self) -> Dict[str, float]:
+        """Relay counters, pending rows and current lag in seconds."""
+        return {**self.stats, "pending": self.outbox.pending(), "lag_seconds": self.outbox.lag()}
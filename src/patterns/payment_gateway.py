@@ -0,0 +1,189 @@
+"""Payment gateway client.
+
+``PaymentGatewayClient`` talks to a payment gateway over a pooled
+``httpx.AsyncClient``.  Concurrency is bounded by a semaphore, every request
+has a timeout, transient failures (timeouts, 5xx, 429) are retried with
+jittered exponential backoff, and a circuit breaker fails fast while the gateway is degraded.
+The client is an awaitable payment handler, so it plugs straight into
+``AsyncPaymentProcessor``.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Callable, Optional
+import httpx
+from src.models.order import Order
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentGatewayError(Exception):
+    """Payment could not be completed because of a gateway failure."""
+
+
+class CircuitOpenError(PaymentGatewayError):
+    """Request rejected without calling the gateway: circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open after a delay."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize circuit breaker."""
+        if failure_threshold <= 0:
+            raise ValueError("Failure threshold must be positive")
+        if reset_timeout <= 0:
+            raise ValueError("Reset timeout must be positive")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            # Let exactly one trial request through
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give up a half-open trial that ended without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+
+class PaymentGatewayClient:
+    """Pooled async HTTP client for the payment gateway."""
+
+    def __init__(self, base_url: str, max_connections: int = 20, max_concurrency: int = 50,
+                 timeout: float = 2.0, retries: int = 2, backoff_base: float = 0.05,
+                 backoff_max: float = 1.0, breaker: Optional[CircuitBreaker] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 rng: Callable[[], float] = random.random):
+        """Initialize payment gateway client."""
+        if max_concurrency <= 0:
+            raise ValueError("Max concurrency must be positive")
+        if retries < 0:
+            raise ValueError("Retries must not be negative")
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rng = rng
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport
+        )
+
+    async def __aenter__(self) -> 'PaymentGatewayClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return self._rng() * min(self.backoff_max, self.backoff_base * (2 ** attempt))
+
+    async def charge(self, order: Order) -> bool:
+        """Charge an order; returns whether the gateway approved it.
+
+        Raises ``PaymentGatewayError`` when the gateway keeps failing and
+        ``CircuitOpenError`` when the breaker rejects the call.
+        """
+        return await self._post("/charges", order, "approved", "charge")
+
+    async def refund(self, order: Order) -> bool:
+        """Refund an order's charge; returns whether the gateway refunded it."""
+        return await self._post("/refunds", order, "refunded", "refund")
+
+    async def _post(self, path: str, order: Order, result_key: str, operation: str) -> bool:
+        """POST an order with retries, breaker and overall deadline."""
+        payload = {
+            "order_id": order.id,
+            "customer_id": order.customer_id,
+            "amount_cents": order.get_total_price_cents()
+        }
+        # One key per order and operation: retries never double-charge, and a
+        # refund is not mistaken for a replay of the charge
+        headers = {"Idempotency-Key": f"{order.id}:{operation}"}
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("Payment gateway circuit is open")
+            try:
+                async with self._semaphore:
+                    # Overall deadline on top of httpx's per-phase timeouts
+                    response = await asyncio.wait_for(
+                        self._client.post(path, json=payload, headers=headers), self.timeout
+                    )
+            except asyncio.TimeoutError:
+                last_error = PaymentGatewayError(f"Gateway timed out after {self.timeout}s")
+            except httpx.HTTPError as error:
+                last_error = error
+            except BaseException:
+                # Cancelled (e.g. by a stage timeout): free the half-open trial
+                self.breaker.release()
+                raise
+            else:
+                # 5xx and 429 (rate limited) are transient; anything else is an answer
+                if response.status_code < 500 and response.status_code != 429:
+                    self.breaker.record_success()
+                    return response.status_code == 200 and response.json().get(result_key, False)
+                last_error = PaymentGatewayError(f"Gateway returned {response.status_code}")
+
+            self.breaker.record_failure()
+            logger.warning("Payment attempt %d for order %s failed: %s", attempt + 1, order.id, last_error)
+            if attempt < self.retries:
+                await asyncio.sleep(self._backoff(attempt))
+        raise PaymentGatewayError(f"Payment failed after {self.retries + 1} attempts: {last_error}")
+
+    async def __call__(self, order: Order) -> bool:
+        """Payment handler protocol: gateway failures decline the payment."""
+        try:
+            return await self.charge(order)
+        except PaymentGatewayError as error:
+            logger.error("Payment for order %s not completed: %s", order.id, error)
+            return False
@@ -0,0 +1,148 @@
+"""Price memoization cache.
+
+Prices are cached under a key made of the equipment ID, its version (bumped
+by ``EquipmentInventory.update_equipment``) and a hashable fingerprint of the
+pricing parameters (decorator layers and strategy settings).  Anything that
+cannot be fingerprinted - e.g. a strategy reading mutable external state - is
+simply computed without caching.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+from src.models.equipment import Equipment
+
+
+class PriceCache:
+    """Bounded LRU cache for equipment and strategy prices."""
+
+    def __init__(self, max_size: int = 10000):
+        """Initialize price cache."""
+        if max_size <= 0:
+            raise ValueError("Max size must be positive")
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._keys_by_equipment: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_price(self, equipment: Equipment) -> float:
+        """Memoized ``equipment.get_price()``."""
+        fingerprint = equipment.price_fingerprint()
+        if fingerprint is None:
+            return equipment.get_price()
+        key = ("get_price", equipment.id, equipment._version, fingerprint)
+        return self._lookup(key, equipment.id, equipment.get_price)
+
+    def get_price_cents(self, equipment: Equipment) -> int:
+        """Memoized ``equipment.get_price_cents()``."""
+        fingerprint = equipment.price_fingerprint()
+        if fingerprint is None:
+            return equipment.get_price_cents()
+        key = ("get_price_cents", equipment.id, equipment._version, fingerprint)
+        return self._lookup(key, equipment.id, equipment.get_price_cents)
+
+    def calculate_price(self, strategy, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
+        """Memoized ``strategy.calculate_price(equipment, quantity, **kwargs)``."""
+        strategy_fingerprint = strategy.fingerprint()
+        equipment_fingerprint = equipment.price_fingerprint()
+        if strategy_fingerprint is None or equipment_fingerprint is None:
+            return strategy.calculate_price(equipment, quantity, **kwargs)
+        key = (
+            "calculate_price", equipment.id, equipment._version, equipment_fingerprint,
+            strategy_fingerprint, quantity, tuple(sorted(kwargs.items()))
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return strategy.calculate_price(equipment, quantity, **kwargs)
+        return self._lookup(key, equipment.id,
+                            lambda: strategy.calculate_price(equipment, quantity, **kwargs))
+
+    def _lookup(self, key: Hashable, equipment_id: str, compute) -> float:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        price = compute()
+
+        with self._lock:
+            self._entries[key] = price
+            self._entries.move_to_end(key)
+            self._keys_by_equipment.setdefault(equipment_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+                self.evictions += 1
+        return price
+
+    def _forget(self, key: Hashable) -> None:
+        keys = self._keys_by_equipment.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_equipment[key[1]]
+
+    def invalidate(self, equipment_id: str) -> int:
+        """Drop every cached price of one equipment item."""
+        with self._lock:
+            keys = self._keys_by_equipment.pop(equipment_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached prices and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_equipment.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache metrics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hit_ratio
+        }
+
+
+def freeze(value: Any) -> Optional[Hashable]:
+    """Convert strategy/decorator parameters into a hashable fingerprint.
+
+    Raises ``TypeError`` for values that cannot be fingerprinted.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    fingerprint = getattr(value, "fingerprint", None)
+    if callable(fingerprint):
+        result = fingerprint()
+        if result is not None:
+            return result
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+price_cache = PriceCache()
@@ -0,0 +1,205 @@
+"""Time-windowed pricing calendar.
+
+Effective-dated price windows (seasonal discounts, scheduled price changes,
+flash sales) are stored in an interval index: the sorted list of window
+boundaries splits time into segments and every segment gets a precomputed
+``CalendarSnapshot``.  The calendar switches snapshots only when its clock
+crosses a boundary, so pricing itself never looks at the time.
+"""
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.models.equipment import Equipment
+from src.models.money import from_cents, apply_discount
+from src.patterns.strategy import PricingStrategy, DISCOUNT_VALIDATION_MESSAGE
+
+Clock = Callable[[], datetime]
+
+
+@dataclass(frozen=True)
+class PriceWindow:
+    """Discount effective in ``[start, end)``.
+
+    A window applies to everything unless narrowed to a ``category`` or a
+    single ``equipment_id``.  Overlapping windows do not stack: the largest
+    applicable discount wins.
+    """
+    name: str
+    start: datetime
+    end: datetime
+    discount_percent: float
+    category: Optional[str] = None
+    equipment_id: Optional[str] = None
+
+    def __post_init__(self):
+        if not isinstance(self.name, str) or not self.name:
+            raise ValueError("Window name must be a non-empty string")
+        if self.end <= self.start:
+            raise ValueError("Window end must be after start")
+        if self.discount_percent <= 0 or self.discount_percent >= 100:
+            raise ValueError(DISCOUNT_VALIDATION_MESSAGE)
+
+
+class CalendarSnapshot:
+    """Precomputed set of windows active during one calendar segment."""
+    __slots__ = ("start", "end", "window_names", "global_discount", "by_category", "by_equipment")
+
+    def __init__(self, start: Optional[datetime], end: Optional[datetime],
+                 windows: Iterable[PriceWindow] = ()):
+        self.start = start
+        self.end = end
+        self.global_discount = 0.0
+        self.by_category: Dict[str, float] = {}
+        self.by_equipment: Dict[str, float] = {}
+        names = []
+        for window in windows:
+            names.append(window.name)
+            if window.equipment_id is not None:
+                target = self.by_equipment
+                key = window.equipment_id
+            elif window.category is not None:
+                target = self.by_category
+                key = window.category
+            else:
+                self.global_discount = max(self.global_discount, window.discount_percent)
+                continue
+            target[key] = max(target.get(key, 0.0), window.discount_percent)
+        self.window_names = tuple(sorted(names))
+
+    def discount_for(self, equipment: Equipment) -> float:
+        """Get discount percent applicable to equipment."""
+        discount = self.global_discount
+        category_discount = self.by_category.get(equipment.category, 0.0)
+        if category_discount > discount:
+            discount = category_discount
+        equipment_discount = self.by_equipment.get(equipment.id, 0.0)
+        if equipment_discount > discount:
+            discount = equipment_discount
+        return discount
+
+
+class PricingCalendar:
+    """Interval-indexed pricing calendar with an injectable clock."""
+
+    def __init__(self, windows: Iterable[PriceWindow] = (), clock: Clock = datetime.now):
+        """Initialize pricing calendar."""
+        self._clock = clock
+        self._windows: List[PriceWindow] = list(windows)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.switch_count = 0
+        self._rebuild()
+
+    @property
+    def active(self) -> CalendarSnapshot:
+        """Snapshot that is currently in effect."""
+        return self._active
+
+    @property
+    def next_boundary(self) -> Optional[datetime]:
+        """Moment at which the active snapshot expires, if any."""
+        return self._active.end
+
+    def add_window(self, window: PriceWindow) -> None:
+        """Schedule a new price window."""
+        with self._lock:
+            self._windows.append(window)
+            self._rebuild()
+
+    def remove_window(self, name: str) -> None:
+        """Remove price window by name."""
+        with self._lock:
+            self._windows = [w for w in self._windows if w.name != name]
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        boundaries = sorted({w.start for w in self._windows} | {w.end for w in self._windows})
+        snapshots = [CalendarSnapshot(None, boundaries[0] if boundaries else None)]
+        starts = sorted(self._windows, key=lambda w: w.start)
+        active: List[PriceWindow] = []
+        position = 0
+        for index, boundary in enumerate(boundaries):
+            while position < len(starts) and starts[position].start <= boundary:
+                active.append(starts[position])
+                position += 1
+            active = [w for w in active if w.end > boundary]
+            end = boundaries[index + 1] if index + 1 < len(boundaries) else None
+            snapshots.append(CalendarSnapshot(boundary, end, active))
+        self._boundaries: Tuple[datetime, ...] = tuple(boundaries)
+        self._snapshots: Tuple[CalendarSnapshot, ...] = tuple(snapshots)
+        self._active = self.snapshot_at(self._clock())
+
+    def snapshot_at(self, moment: datetime) -> CalendarSnapshot:
+        """Look up the snapshot in effect at ``moment``."""
+        return self._snapshots[bisect_right(self._boundaries, moment)]
+
+    def refresh(self) -> bool:
+        """Switch snapshot if the clock crossed a boundary.
+
+        Returns True when the active snapshot changed.
+        """
+        now = self._clock()
+        current = self._active
+        if (current.start is None or now >= current.start) and (current.end is None or now < current.end):
+            return False
+        self._active = self.snapshot_at(now)
+        self.switch_count += 1
+        return True
+
+    def start(self) -> None:
+        """Refresh automatically at every upcoming boundary (wall-clock)."""
+        self.stop()
+        self.refresh()
+        boundary = self.next_boundary
+        if boundary is None:
+            return
+        delay = max(0.0, (boundary - self._clock()).total_seconds())
+        self._timer = threading.Timer(delay, self.start)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Cancel automatic refresh."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+def seasonal_windows(years: Iterable[int], discount_percent: float = 20.0,
+                     months: Tuple[int, ...] = (12, 1, 2)) -> List[PriceWindow]:
+    """Express ``SeasonalPricingStrategy`` month rules as calendar windows."""
+    windows = []
+    for year in years:
+        for month in months:
+            start = datetime(year, month, 1)
+            end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            windows.append(PriceWindow(f"seasonal-{year}-{month:02d}", start, end, discount_percent))
+    return windows
+
+
+# Winter months (December to February) for ``SeasonalPricingStrategy``.  The
+# API starts it at startup; other processes see the season they started in.
+_this_year = datetime.now().year
+season_calendar = PricingCalendar(seasonal_windows(range(_this_year - 1, _this_year + 10)))
+
+
+class CalendarPricingStrategy(PricingStrategy):
+    """Pricing strategy that applies the calendar's active snapshot."""
+
+    def __init__(self, calendar: PricingCalendar):
+        """Initialize calendar pricing strategy."""
+        self.calendar = calendar
+
+    def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
+        """Calculate price using the currently active windows."""
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate price in cents using the currently active windows."""
+        base_total = self._base_total_cents(equipment, quantity)
+        discount_percent = self.calendar.active.discount_for(equipment)
+        if discount_percent:
+            return apply_discount(base_total, discount_percent)
+        return base_total
@@ -0,0 +1,181 @@
+"""Composable pricing rule engine built on top of the pricing strategies.
+
+A ``PricingRuleSet`` describes an ordered set of rules (bulk, promo,
+loyalty, ...) together with stacking/exclusivity semantics and an overall
+discount ceiling.  Each distinct rule set is compiled exactly once into a
+``CompiledPricingPlan`` - a flat tuple of bound ``calculate_price_cents``
+methods grouped by exclusivity - which is then reused for every line item
+while the rule set is alive.
+"""
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+from weakref import WeakKeyDictionary
+from src.models.equipment import Equipment
+from src.models.money import BP_SCALE, divide, from_cents, percent_to_bp, scale
+from src.patterns.strategy import PricingStrategy, DISCOUNT_VALIDATION_MESSAGE
+
+
+@dataclass(frozen=True)
+class PricingRule:
+    """Single rule in a pricing pipeline.
+
+    ``priority`` orders rules (lower runs first and wins ties inside an
+    exclusive group).  Rules sharing an ``exclusive_group`` never stack: only
+    the cheapest of them applies.  A rule with ``stackable=False`` competes
+    against the combination of all other rules instead of stacking with them.
+    """
+    name: str
+    strategy: PricingStrategy
+    priority: int = 100
+    stackable: bool = True
+    exclusive_group: Optional[str] = None
+
+    def __post_init__(self):
+        if not isinstance(self.name, str) or not self.name:
+            raise ValueError("Rule name must be a non-empty string")
+        if not isinstance(self.strategy, PricingStrategy):
+            raise ValueError("Rule strategy must be a PricingStrategy")
+
+
+@dataclass(frozen=True)
+class PricingRuleSet:
+    """Immutable, hashable description of a pricing pipeline."""
+    rules: Tuple[PricingRule, ...]
+    max_discount_percent: Optional[float] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "rules", tuple(self.rules))
+        if not self.rules:
+            raise ValueError("Rule set must contain at least one rule")
+        names = [rule.name for rule in self.rules]
+        if len(names) != len(set(names)):
+            raise ValueError("Rule names must be unique")
+        if self.max_discount_percent is not None and not 0 < self.max_discount_percent < 100:
+            raise ValueError(DISCOUNT_VALIDATION_MESSAGE)
+
+    def compile(self) -> 'CompiledPricingPlan':
+        """Compile (or fetch the cached) evaluation plan for this rule set."""
+        return compile_rule_set(self)
+
+
+class CompiledPricingPlan:
+    """Flat evaluation plan produced from a ``PricingRuleSet``.
+
+    ``_stacked`` holds one tuple of price functions per exclusive group; the
+    best factor of every group is multiplied together.  ``_standalone`` holds
+    the non-stackable rules, each of which competes with the stacked result.
+    All amounts are integer cents.
+    """
+    __slots__ = ("rule_names", "_stacked", "_standalone", "_min_rate_bp")
+
+    def __init__(self, rule_set: PricingRuleSet):
+        ordered = sorted(rule_set.rules, key=lambda rule: rule.priority)
+        groups: Dict[str, list] = {}
+        stacked = []
+        standalone = []
+        for rule in ordered:
+            calculate = rule.strategy.calculate_price_cents
+            if not rule.stackable:
+                standalone.append(calculate)
+            elif rule.exclusive_group is None:
+                stacked.append((calculate,))
+            elif rule.exclusive_group in groups:
+                groups[rule.exclusive_group].append(calculate)
+            else:
+                group = [calculate]
+                groups[rule.exclusive_group] = group
+                stacked.append(group)
+        self.rule_names = tuple(rule.name for rule in ordered)
+        self._stacked = tuple(tuple(group) for group in stacked)
+        self._standalone = tuple(standalone)
+        if rule_set.max_discount_percent is None:
+            self._min_rate_bp = 0
+        else:
+            self._min_rate_bp = BP_SCALE - percent_to_bp(rule_set.max_discount_percent)
+
+    def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
+        """Evaluate the plan for one line item."""
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Evaluate the plan for one line item in integer cents.
+
+        With ``redeem=True`` every rule is first priced as a quote and only
+        the rules that won are then called with ``redeem=True``, so a promo
+        code that lost to another rule is not used up.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        redeem = kwargs.pop("redeem", False)
+        base_total = equipment.base_price_cents * quantity
+        if base_total == 0:
+            return 0
+
+        # Each group scales the running price by best / base_total
+        price = base_total
+        winners = []
+        for group in self._stacked:
+            best, winner = group[0](equipment, quantity, **kwargs), group[0]
+            for calculate in group[1:]:
+                candidate = calculate(equipment, quantity, **kwargs)
+                if candidate < best:
+                    best, winner = candidate, calculate
+            price = divide(price * best, base_total)
+            if best < base_total:
+                winners.append(winner)
+
+        for calculate in self._standalone:
+            candidate = calculate(equipment, quantity, **kwargs)
+            if candidate < price:
+                price = candidate
+                winners = [calculate]
+
+        if redeem:
+            for calculate in winners:
+                calculate(equipment, quantity, redeem=True, **kwargs)
+        floor = scale(base_total, self._min_rate_bp)
+        return floor if price < floor else price
+
+
+# Plans are dropped together with their rule set
+_compiled_plans: "WeakKeyDictionary[PricingRuleSet, CompiledPricingPlan]" = WeakKeyDictionary()
+
+
+def compile_rule_set(rule_set: PricingRuleSet) -> CompiledPricingPlan:
+    """Return the compiled plan for a rule set, compiling it once per live rule set."""
+    plan = _compiled_plans.get(rule_set)
+    if plan is None:
+        plan = CompiledPricingPlan(rule_set)
+        _compiled_plans[rule_set] = plan
+    return plan
+
+
+class RuleEnginePricingStrategy(PricingStrategy):
+    """Pricing strategy backed by a compiled rule set.
+
+    Can be used anywhere a single strategy is expected, e.g.
+    ``Equipment.set_pricing_strategy`` or ``PriceCalculator``.
+    """
+
+    def __init__(self, rule_set: PricingRuleSet):
+        """Initialize rule engine pricing strategy."""
+        self.rule_set = rule_set
+        self._plan = compile_rule_set(rule_set)
+
+    def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
+        """Calculate price through the compiled rule pipeline."""
+        return self._plan.calculate_price(equipment, quantity, **kwargs)
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate price in cents through the compiled rule pipeline."""
+        return self._plan.calculate_price_cents(equipment, quantity, **kwargs)
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """Fingerprint made of every rule and its strategy parameters."""
+        rules = []
+        for rule in self.rule_set.rules:
+            strategy_fingerprint = rule.strategy.fingerprint()
+            if strategy_fingerprint is None:
+                return None
+            rules.append((rule.name, rule.priority, rule.stackable, rule.exclusive_group, strategy_fingerprint))
+        return (type(self).__name__, tuple(rules), self.rule_set.max_discount_percent)
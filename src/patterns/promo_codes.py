@@ -0,0 +1,236 @@
+"""Scalable promo code store.
+
+Codes are kept in compact parallel arrays indexed through a single dict, so
+millions of single-use codes fit in memory.  A Bloom filter sits in front of
+the lookup path so unknown codes (e.g. bots guessing at checkout) are
+rejected without touching the backing storage.
+"""
+import csv
+import math
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+from src.patterns.strategy import DISCOUNT_VALIDATION_MESSAGE
+
+NO_EXPIRY = math.inf
+UNLIMITED = 0
+
+PromoCodeRow = Tuple[str, float, Optional[datetime], Optional[int]]
+
+
+def normalize_code(code: str) -> str:
+    """Normalize promo code the same way ``PromoCodePricing`` does."""
+    return code.strip().upper()
+
+
+class BloomFilter:
+    """Bit-array Bloom filter using double hashing over ``hash()``.
+
+    Python's string hash is randomized per process, which is fine because
+    the filter is always rebuilt from the store and never persisted.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """Size the filter for ``capacity`` items at the given error rate."""
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate must be between 0 and 1")
+        bits = int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        """Add item to the filter."""
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        size = self.size
+        bits = self._bits
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        """Return False if item is definitely absent."""
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        size = self.size
+        bits = self._bits
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+
+class PromoCodeStore:
+    """Thread-safe promo code store with expiry and redemption limits."""
+
+    def __init__(self, expected_codes: int = 1024, false_positive_rate: float = 0.01):
+        """Initialize promo code store."""
+        self._index: Dict[str, int] = {}
+        self._discounts = array("d")
+        self._expires_at = array("d")
+        self._max_redemptions = array("I")
+        self._redemptions = array("I")
+        self._false_positive_rate = false_positive_rate
+        self._bloom = BloomFilter(expected_codes, false_positive_rate)
+        self._lock = threading.Lock()
+        self.bloom_rejections = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, code: str) -> bool:
+        code = normalize_code(code)
+        return code in self._bloom and code in self._index
+
+    def add_code(self, code: str, discount_percent: float,
+                 expires_at: Optional[datetime] = None,
+                 max_redemptions: Optional[int] = None) -> None:
+        """Add or replace a single promo code."""
+        with self._lock:
+            self._add(code, discount_percent, expires_at, max_redemptions)
+
+    def bulk_add(self, rows: Iterable[PromoCodeRow]) -> int:
+        """Add many codes under one lock; returns number of codes added."""
+        count = 0
+        with self._lock:
+            for code, discount_percent, expires_at, max_redemptions in rows:
+                self._add(code, discount_percent, expires_at, max_redemptions)
+                count += 1
+        return count
+
+    def load_file(self, path: str) -> int:
+        """Stream codes from a CSV file.
+
+        Columns: ``code,discount_percent[,expires_at[,max_redemptions]]``,
+        where ``expires_at`` is ISO-8601 and empty columns mean no limit.
+        A header row starting with ``code`` is skipped.
+        """
+        with open(path, newline="", encoding="utf-8") as handle:
+            return self.bulk_add(self._parse_rows(csv.reader(handle)))
+
+    @staticmethod
+    def _parse_rows(reader) -> Iterable[PromoCodeRow]:
+        for line_number, row in enumerate(reader, start=1):
+            if not row or (line_number == 1 and row[0].strip().lower() == "code"):
+                continue
+            try:
+                discount = float(row[1])
+                expires = row[2].strip() if len(row) > 2 else ""
+                limit = row[3].strip() if len(row) > 3 else ""
+                yield (
+                    row[0],
+                    discount,
+                    datetime.fromisoformat(expires) if expires else None,
+                    int(limit) if limit else None
+                )
+            except (IndexError, ValueError):
+                raise ValueError(f"Invalid promo code row at line {line_number}")
+
+    def _add(self, code: str, discount_percent: float,
+             expires_at: Optional[datetime], max_redemptions: Optional[int]) -> None:
+        if not code or not isinstance(code, str):
+            raise ValueError("Invalid promo code")
+        if discount_percent <= 0 or discount_percent >= 100:
+            raise ValueError(DISCOUNT_VALIDATION_MESSAGE)
+        if max_redemptions is not None and max_redemptions <= 0:
+            raise ValueError("Max redemptions must be positive")
+
+        code = normalize_code(code)
+        expiry = expires_at.timestamp() if expires_at else NO_EXPIRY
+        limit = max_redemptions or UNLIMITED
+        slot = self._index.get(code)
+        if slot is not None:
+            self._discounts[slot] = discount_percent
+            self._expires_at[slot] = expiry
+            self._max_redemptions[slot] = limit
+            self._redemptions[slot] = 0
+            return
+
+        self._index[code] = len(self._discounts)
+        self._discounts.append(discount_percent)
+        self._expires_at.append(expiry)
+        self._max_redemptions.append(limit)
+        self._redemptions.append(0)
+        if len(self._index) > self._bloom.capacity:
+            self._rebuild_bloom(self._bloom.capacity * 2)
+        else:
+            self._bloom.add(code)
+
+    def _rebuild_bloom(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity, self._false_positive_rate)
+        for code in self._index:
+            bloom.add(code)
+        self._bloom = bloom
+
+    def _slot(self, code: str) -> Optional[int]:
+        if code not in self._bloom:
+            with self._lock:
+                self.bloom_rejections += 1
+            return None
+        return self._index.get(code)
+
+    def _check(self, slot: Optional[int], now: Optional[datetime]) -> Optional[str]:
+        if slot is None:
+            return "Unknown promo code"
+        moment = (now or datetime.now()).timestamp()
+        if moment >= self._expires_at[slot]:
+            return "Promo code expired"
+        limit = self._max_redemptions[slot]
+        if limit != UNLIMITED and self._redemptions[slot] >= limit:
+            return "Promo code usage limit reached"
+        return None
+
+    def get_discount(self, code: str, now: Optional[datetime] = None) -> Optional[float]:
+        """Return discount percent for a currently usable code, else None."""
+        if not code:
+            return None
+        slot = self._slot(normalize_code(code))
+        if self._check(slot, now) is not None:
+            return None
+        return float(self._discounts[slot])
+
+    def redeem(self, code: str, now: Optional[datetime] = None) -> float:
+        """Atomically redeem a code and return its discount percent."""
+        if not code:
+            raise ValueError("Unknown promo code")
+        code = normalize_code(code)
+        slot = self._slot(code)
+        if slot is None:
+            raise ValueError("Unknown promo code")
+        with self._lock:
+            error = self._check(slot, now)
+            if error:
+                raise ValueError(error)
+            self._redemptions[slot] += 1
+            return float(self._discounts[slot])
+
+    def get_redemptions(self, code: str) -> int:
+        """Get number of redemptions for a code."""
+        slot = self._index.get(normalize_code(code))
+        return self._redemptions[slot] if slot is not None else 0
+
+    def memory_stats(self) -> Dict[str, Union[int, float]]:
+        """Approximate memory used by the arrays and Bloom filter."""
+        arrays = sum(a.buffer_info()[1] * a.itemsize for a in (
+            self._discounts, self._expires_at, self._max_redemptions, self._redemptions
+        ))
+        return {
+            "codes": len(self._index),
+            "array_bytes": arrays,
+            "bloom_bytes": self._bloom.memory_bytes,
+            "bloom_hash_count": self._bloom.hash_count
+        }
@@ -0,0 +1,56 @@
+"""Prototype registry for basic equipment models.
+
+Building a basic model through ``EquipmentDirector`` runs a dozen setters
+and validates ``EquipmentSpecs`` every time.  ``EquipmentPrototypeRegistry``
+builds each (builder type, color) combination once, keeps the validated
+result as a template and hands out clones with fresh IDs.
+"""
+import threading
+from typing import Dict, Optional, Tuple, Type
+from src.models.equipment import Equipment
+from src.patterns.builder import EquipmentBuilder, EquipmentDirector
+
+TemplateKey = Tuple[Type[EquipmentBuilder], Optional[str]]
+
+
+class EquipmentPrototypeRegistry:
+    """Cache of validated basic-model templates, cloned on request."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._templates: Dict[TemplateKey, Equipment] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    @staticmethod
+    def _key(builder_type: Type[EquipmentBuilder], color: Optional[str]) -> TemplateKey:
+        # The director replaces unknown colors with the builder's default
+        return builder_type, color if EquipmentDirector.is_valid_color(color) else None
+
+    def template(self, builder_type: Type[EquipmentBuilder], color: Optional[str] = None) -> Equipment:
+        """The cached template, built through the director on first use."""
+        key = self._key(builder_type, color)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                self.misses += 1
+                template = EquipmentDirector(builder_type()).build_basic_model(key[1])
+                self._templates[key] = template
+        return template
+
+    def build(self, builder_type: Type[EquipmentBuilder], color: Optional[str] = None) -> Equipment:
+        """New basic model with its own ID, cloned from the template."""
+        return self.template(builder_type, color).clone()
+
+    def clear(self) -> None:
+        """Drop all templates, e.g. after the basic models change."""
+        with self._lock:
+            self._templates.clear()
@@ -0,0 +1,585 @@
+"""Storage backends for ``EquipmentInventory``.
+
+``InventoryRepository`` is the interface the inventory delegates to.
+``InMemoryRepository`` keeps live objects in dictionaries (the default);
+``SqlRepository`` persists equipment, specs, stock and orders through the
+ORM tables in ``src.models.orm``.  The SQL backend stores the data of an
+item only: decorated equipment is rejected with ValueError instead of
+losing its layers, and pricing strategies attached to an object do not
+survive a reload.
+
+List queries page with keyset cursors: each page returns an opaque cursor
+holding the sort key of its last row, and the next page starts strictly
+after it, so deep pages cost the same as the first one.
+
+Bulk loads (``bulk_add_equipment``, ``bulk_add_orders``) write in chunks
+of ``chunk_size`` rows, one transaction per chunk.  On SQLite each chunk is
+one DB-API ``executemany`` of ``INSERT ... ON CONFLICT DO UPDATE`` per
+table, and the secondary indexes can be dropped for the load and built
+once at the end.  Other databases fall back to row-by-row writes.
+"""
+import base64
+import json
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Table, and_, delete, or_, select, update
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import sessionmaker
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.models.orm import Base, EquipmentRow, EquipmentSpecsRow, OrderRow, StockRow
+from src.patterns.decorator import EquipmentDecorator
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_CHUNK_SIZE = 10_000
+# IDs per ``IN (...)`` lookup, well under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+# Extra writes that must commit together with a stored row
+TransactionHook = Callable[[Optional[Connection]], None]
+
+
+class Page(NamedTuple):
+    """One page of results; ``next_cursor`` is None on the last page."""
+    items: list
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a sort key."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Sort key stored in a cursor."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _equipment_key(equipment: Equipment) -> tuple:
+    return equipment.base_price, equipment.id
+
+
+def _order_key(order: Order) -> tuple:
+    return order.created_at, order.id
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Aware times as naive UTC; SQLite DateTime columns drop the offset."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _order_cursor(cursor: str) -> tuple:
+    created_at, order_id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(created_at), order_id
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def _check_limit(limit: int) -> None:
+    if limit <= 0:
+        raise ValueError("Limit must be positive")
+
+
+def chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Split a stream into lists of at most ``size`` items."""
+    if size <= 0:
+        raise ValueError("Chunk size must be positive")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class InventoryRepository(ABC):
+    """Storage interface behind ``EquipmentInventory``."""
+
+    # True when calls do blocking I/O and belong off the event loop
+    blocking = False
+
+    @abstractmethod
+    def add_equipment(self, equipment: Equipment, quantity: int) -> bool:
+        """Store new equipment or add stock; returns True if it was new."""
+
+    @abstractmethod
+    def get_equipment(self, equipment_id: str) -> Optional[Equipment]:
+        """Equipment by ID."""
+
+    def get_equipment_many(self, equipment_ids: Sequence[str]) -> List[Equipment]:
+        """Equipment for ``equipment_ids`` in the given order; unknown IDs are skipped."""
+        items = (self.get_equipment(equipment_id) for equipment_id in equipment_ids)
+        return [equipment for equipment in items if equipment is not None]
+
+    @abstractmethod
+    def save_equipment(self, equipment: Equipment) -> None:
+        """Replace stored equipment data, keeping its stock."""
+
+    @abstractmethod
+    def all_equipment(self) -> List[Equipment]:
+        """All stored equipment."""
+
+    @abstractmethod
+    def get_stock(self, equipment_id: str) -> int:
+        """Stock quantity (0 for unknown equipment)."""
+
+    @abstractmethod
+    def adjust_stock(self, equipment_id: str, delta: int) -> bool:
+        """Change stock; returns False if unknown or it would go negative."""
+
+    @abstractmethod
+    def add_order(self, order: Order, also_write: Optional[TransactionHook] = None) -> None:
+        """Store an order, replacing a stored order with the same ID.
+
+        ``also_write(connection)`` is called before the order is committed
+        and joins its transaction; backends without transactions pass None.
+        """
+
+    @abstractmethod
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Order by ID."""
+
+    @abstractmethod
+    def update_order_status(self, order_id: str, status: str) -> None:
+        """Set the status of a stored order."""
+
+    @abstractmethod
+    def all_orders(self) -> List[Order]:
+        """All stored orders."""
+
+    @abstractmethod
+    def list_equipment(self, category: Optional[str] = None, min_price: Optional[float] = None,
+                       max_price: Optional[float] = None, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Equipment ordered by price, then ID."""
+
+    @abstractmethod
+    def list_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Orders ordered by creation time, then ID."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete everything."""
+
+    def bulk_add_equipment(self, items: Iterable[Tuple[Equipment, int]],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, defer_indexes: bool = False,
+                           on_chunk: Optional[Callable[[list], None]] = None) -> int:
+        """Upsert ``(equipment, quantity)`` pairs; stock of known items grows.
+
+        Returns the number of pairs.  ``on_chunk`` is called with each chunk
+        once it is written.  ``defer_indexes`` only applies to backends with
+        secondary indexes.
+        """
+        count = 0
+        for chunk in chunks(items, chunk_size):
+            for equipment, quantity in chunk:
+                if not self.add_equipment(equipment, quantity):
+                    self.save_equipment(equipment)
+            count += len(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        return count
+
+    def bulk_add_orders(self, orders: Iterable[Order], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        defer_indexes: bool = False) -> int:
+        """Upsert orders; returns how many were written."""
+        count = 0
+        for chunk in chunks(orders, chunk_size):
+            for order in chunk:
+                self.add_order(order)
+            count += len(chunk)
+        return count
+
+
+class InMemoryRepository(InventoryRepository):
+    """Dictionaries of live objects."""
+
+    def __init__(self):
+        """Initialize empty storage."""
+        self.equipment_items = {}
+        self.equipment_stock = {}
+        self.orders = {}
+
+    def add_equipment(self, equipment: Equipment, quantity: int) -> bool:
+        is_new = equipment.id not in self.equipment_stock
+        if is_new:
+            self.equipment_stock[equipment.id] = 0
+            self.equipment_items[equipment.id] = equipment
+        self.equipment_stock[equipment.id] += quantity
+        return is_new
+
+    def get_equipment(self, equipment_id: str) -> Optional[Equipment]:
+        return self.equipment_items.get(equipment_id)
+
+    def save_equipment(self, equipment: Equipment) -> None:
+        self.equipment_items[equipment.id] = equipment
+
+    def all_equipment(self) -> List[Equipment]:
+        return list(self.equipment_items.values())
+
+    def get_stock(self, equipment_id: str) -> int:
+        return self.equipment_stock.get(equipment_id, 0)
+
+    def adjust_stock(self, equipment_id: str, delta: int) -> bool:
+        stock = self.equipment_stock.get(equipment_id)
+        if stock is None or stock + delta < 0:
+            return False
+        self.equipment_stock[equipment_id] = stock + delta
+        return True
+
+    def add_order(self, order: Order, also_write: Optional[TransactionHook] = None) -> None:
+        if also_write is not None:
+            also_write(None)
+        self.orders[order.id] = order
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def update_order_status(self, order_id: str, status: str) -> None:
+        if order_id in self.orders:
+            self.orders[order_id].status = status
+
+    def all_orders(self) -> List[Order]:
+        return list(self.orders.values())
+
+    @staticmethod
+    def _page(items: list, key: Callable, after: Optional[tuple], limit: int) -> Page:
+        _check_limit(limit)
+        items.sort(key=key)
+        if after is not None:
+            items = [item for item in items if key(item) > after]
+        page = items[:limit]
+        next_cursor = encode_cursor(key(page[-1])) if len(items) > limit else None
+        return Page(page, next_cursor)
+
+    def list_equipment(self, category: Optional[str] = None, min_price: Optional[float] = None,
+                       max_price: Optional[float] = None, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        items = [
+            equipment for equipment in self.equipment_items.values()
+            if (category is None or equipment.category == category)
+            and (min_price is None or equipment.base_price >= min_price)
+            and (max_price is None or equipment.base_price <= max_price)
+        ]
+        return self._page(items, _equipment_key, tuple(decode_cursor(after)) if after else None, limit)
+
+    def list_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        items = [
+            order for order in self.orders.values()
+            if (customer_id is None or order.customer_id == customer_id)
+            and (status is None or order.status == status)
+        ]
+        return self._page(items, _order_key, _order_cursor(after) if after else None, limit)
+
+    def clear(self) -> None:
+        self.equipment_items.clear()
+        self.equipment_stock.clear()
+        self.orders.clear()
+
+
+class SqlRepository(InventoryRepository):
+    """Repository over the ORM tables."""
+
+    blocking = True
+
+    def __init__(self, engine: Optional[Engine] = None, create_tables: bool = True):
+        """Initialize repository; defaults to the ``DatabaseSingleton`` engine."""
+        if engine is None:
+            from src.patterns.database_singleton import DatabaseSingleton
+            engine = DatabaseSingleton().engine
+        self.engine = engine
+        self._sessions = sessionmaker(bind=engine, expire_on_commit=False)
+        if create_tables:
+            Base.metadata.create_all(engine)
+
+    @staticmethod
+    def _to_equipment(row: EquipmentRow) -> Equipment:
+        specs = row.specs
+        equipment = Equipment(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            base_price=row.base_price,
+            category=row.category,
+            specs=EquipmentSpecs(
+                weight=specs.weight,
+                dimensions=specs.dimensions,
+                material=specs.material,
+                color=specs.color,
+                max_user_weight=specs.max_user_weight,
+                warranty_months=specs.warranty_months
+            ),
+            attributes=row.attributes or {}
+        )
+        equipment._version = row.version
+        return equipment
+
+    @staticmethod
+    def _fill_equipment_row(row: EquipmentRow, equipment: Equipment) -> None:
+        row.name = equipment.name
+        row.description = equipment.description
+        row.base_price = float(equipment.base_price)
+        row.category = equipment.category
+        row.attributes = dict(equipment.attributes)
+        row.version = equipment._version
+        specs = equipment.specs
+        if row.specs is None:
+            row.specs = EquipmentSpecsRow(equipment_id=equipment.id)
+        row.specs.weight = str(specs.weight)
+        row.specs.dimensions = str(specs.dimensions)
+        row.specs.material = specs.material
+        row.specs.color = specs.color
+        row.specs.max_user_weight = str(specs.max_user_weight)
+        row.specs.warranty_months = str(specs.warranty_months)
+
+    def _to_order(self, row: OrderRow) -> Order:
+        return Order(
+            id=row.id,
+            equipment=self._to_equipment(row.equipment) if row.equipment is not None else None,
+            quantity=row.quantity,
+            customer_id=row.customer_id,
+            customer_name=row.customer_name,
+            customer_email=row.customer_email,
+            shipping_address=row.shipping_address,
+            status=row.status,
+            created_at=row.created_at
+        )
+
+    @staticmethod
+    def _check_storable(equipment: Equipment) -> None:
+        # Rows hold plain item data; a decorated price would silently revert
+        if isinstance(equipment, EquipmentDecorator):
+            raise ValueError("Decorated equipment cannot be stored in the SQL backend")
+
+    def add_equipment(self, equipment: Equipment, quantity: int) -> bool:
+        self._check_storable(equipment)
+        with self._sessions.begin() as session:
+            updated = session.execute(
+                update(StockRow).where(StockRow.equipment_id == equipment.id)
+                .values(quantity=StockRow.quantity + quantity)
+            ).rowcount
+            if updated:
+                return False
+            row = EquipmentRow(id=equipment.id)
+            self._fill_equipment_row(row, equipment)
+            row.stock = StockRow(equipment_id=equipment.id, quantity=quantity)
+            session.add(row)
+            return True
+
+    def get_equipment(self, equipment_id: str) -> Optional[Equipment]:
+        with self._sessions() as session:
+            row = session.get(EquipmentRow, equipment_id)
+            return self._to_equipment(row) if row is not None else None
+
+    def get_equipment_many(self, equipment_ids: Sequence[str]) -> List[Equipment]:
+        found = {}
+        with self._sessions() as session:
+            for batch in chunks(equipment_ids, LOOKUP_BATCH_SIZE):
+                rows = session.scalars(select(EquipmentRow).where(EquipmentRow.id.in_(batch))).unique()
+                found.update((row.id, self._to_equipment(row)) for row in rows)
+        return [found[equipment_id] for equipment_id in equipment_ids if equipment_id in found]
+
+    def save_equipment(self, equipment: Equipment) -> None:
+        self._check_storable(equipment)
+        with self._sessions.begin() as session:
+            row = session.get(EquipmentRow, equipment.id)
+            if row is None:
+                row = EquipmentRow(id=equipment.id)
+                row.stock = StockRow(equipment_id=equipment.id, quantity=0)
+                session.add(row)
+            self._fill_equipment_row(row, equipment)
+
+    def all_equipment(self) -> List[Equipment]:
+        with self._sessions() as session:
+            rows = session.scalars(select(EquipmentRow).order_by(EquipmentRow.id)).unique()
+            return [self._to_equipment(row) for row in rows]
+
+    def get_stock(self, equipment_id: str) -> int:
+        with self._sessions() as session:
+            quantity = session.scalar(select(StockRow.quantity).where(StockRow.equipment_id == equipment_id))
+            return quantity or 0
+
+    def adjust_stock(self, equipment_id: str, delta: int) -> bool:
+        # One conditional UPDATE, so concurrent reservations cannot oversell
+        with self._sessions.begin() as session:
+            return session.execute(
+                update(StockRow)
+                .where(StockRow.equipment_id == equipment_id, StockRow.quantity + delta >= 0)
+                .values(quantity=StockRow.quantity + delta)
+            ).rowcount == 1
+
+    def add_order(self, order: Order, also_write: Optional[TransactionHook] = None) -> None:
+        with self._sessions.begin() as session:
+            if also_write is not None:
+                also_write(session.connection())
+            session.merge(OrderRow(
+                id=order.id,
+                equipment_id=order.equipment.id if order.equipment else None,
+                quantity=order.quantity,
+                customer_id=order.customer_id,
+                customer_name=order.customer_name,
+                customer_email=order.customer_email,
+                shipping_address=order.shipping_address,
+                status=order.status,
+                created_at=_naive_utc(order.created_at)
+            ))
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        with self._sessions() as session:
+            row = session.get(OrderRow, order_id)
+            return self._to_order(row) if row is not None else None
+
+    def update_order_status(self, order_id: str, status: str) -> None:
+        with self._sessions.begin() as session:
+            session.execute(update(OrderRow).where(OrderRow.id == order_id).values(status=status))
+
+    def all_orders(self) -> List[Order]:
+        with self._sessions() as session:
+            rows = session.scalars(select(OrderRow).order_by(OrderRow.created_at, OrderRow.id)).unique()
+            return [self._to_order(row) for row in rows]
+
+    @staticmethod
+    def _after(first_column, second_column, key: tuple):
+        first, second = key
+        return or_(first_column > first, and_(first_column == first, second_column > second))
+
+    def _page(self, statement, convert: Callable, key: Callable, limit: int) -> Page:
+        _check_limit(limit)
+        with self._sessions() as session:
+            rows = list(session.scalars(statement.limit(limit + 1)).unique())
+            items = [convert(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(key(items[-1])) if len(rows) > limit else None
+        return Page(items, next_cursor)
+
+    def list_equipment(self, category: Optional[str] = None, min_price: Optional[float] = None,
+                       max_price: Optional[float] = None, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        statement = select(EquipmentRow).order_by(EquipmentRow.base_price, EquipmentRow.id)
+        if category is not None:
+            statement = statement.where(EquipmentRow.category == category)
+        if min_price is not None:
+            statement = statement.where(EquipmentRow.base_price >= min_price)
+        if max_price is not None:
+            statement = statement.where(EquipmentRow.base_price <= max_price)
+        if after:
+            statement = statement.where(
+                self._after(EquipmentRow.base_price, EquipmentRow.id, tuple(decode_cursor(after)))
+            )
+        return self._page(statement, self._to_equipment, _equipment_key, limit)
+
+    def list_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        statement = select(OrderRow).order_by(OrderRow.created_at, OrderRow.id)
+        if customer_id is not None:
+            statement = statement.where(OrderRow.customer_id == customer_id)
+        if status is not None:
+            statement = statement.where(OrderRow.status == status)
+        if after:
+            statement = statement.where(self._after(OrderRow.created_at, OrderRow.id, _order_cursor(after)))
+        return self._page(statement, self._to_order, _order_key, limit)
+
+    @staticmethod
+    def _equipment_params(equipment: Equipment) -> tuple:
+        return (equipment.id, equipment.name, equipment.description, float(equipment.base_price),
+                equipment.category, json.dumps(equipment.attributes), equipment._version)
+
+    @staticmethod
+    def _specs_params(equipment: Equipment) -> tuple:
+        specs = equipment.specs
+        return (equipment.id, str(specs.weight), str(specs.dimensions), specs.material, specs.color,
+                str(specs.max_user_weight), str(specs.warranty_months))
+
+    @staticmethod
+    def _order_params(order: Order) -> tuple:
+        # Same text the SQLite DateTime type stores
+        created_at = _naive_utc(order.created_at).isoformat(" ", "microseconds")
+        return (order.id, order.equipment.id if order.equipment else None, order.quantity,
+                order.customer_id, order.customer_name, order.customer_email,
+                order.shipping_address, order.status, created_at)
+
+    def _upsert(self, table: Table, increment: Sequence[str] = ()) -> str:
+        """INSERT ... ON CONFLICT on the primary key, taking parameters in column order.
+
+        Conflicting rows get the new values, or the sum for ``increment``
+        columns.
+        """
+        statement = sqlite.insert(table)
+        values = {
+            column.name: (column + statement.excluded[column.name] if column.name in increment
+                          else statement.excluded[column.name])
+            for column in table.columns if not column.primary_key
+        }
+        statement = statement.on_conflict_do_update(index_elements=list(table.primary_key.columns), set_=values)
+        return str(statement.compile(dialect=self.engine.dialect,
+                                     column_keys=[column.name for column in table.columns]))
+
+    @contextmanager
+    def _deferred_indexes(self, tables: Sequence[Table], defer: bool) -> Iterator[None]:
+        """Drop the secondary indexes of ``tables`` and build them again afterwards."""
+        indexes = [index for table in tables for index in table.indexes] if defer else []
+        with self.engine.begin() as connection:
+            for index in indexes:
+                index.drop(connection, checkfirst=True)
+        try:
+            yield
+        finally:
+            with self.engine.begin() as connection:
+                for index in indexes:
+                    index.create(connection, checkfirst=True)
+
+    def bulk_add_equipment(self, items: Iterable[Tuple[Equipment, int]],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, defer_indexes: bool = False,
+                           on_chunk: Optional[Callable[[list], None]] = None) -> int:
+        if self.engine.dialect.name != "sqlite":
+            return super().bulk_add_equipment(items, chunk_size, defer_indexes, on_chunk)
+        equipment_upsert = self._upsert(EquipmentRow.__table__)
+        specs_upsert = self._upsert(EquipmentSpecsRow.__table__)
+        stock_upsert = self._upsert(StockRow.__table__, increment=("quantity",))
+        count = 0
+        with self._deferred_indexes([EquipmentRow.__table__], defer_indexes):
+            for chunk in chunks(items, chunk_size):
+                for item, _ in chunk:
+                    self._check_storable(item)
+                # Plain DB-API executemany: one prepared statement per table and chunk
+                with self.engine.begin() as connection:
+                    connection.exec_driver_sql(equipment_upsert, [self._equipment_params(item) for item, _ in chunk])
+                    connection.exec_driver_sql(specs_upsert, [self._specs_params(item) for item, _ in chunk])
+                    connection.exec_driver_sql(stock_upsert, [(item.id, quantity) for item, quantity in chunk])
+                count += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+        return count
+
+    def bulk_add_orders(self, orders: Iterable[Order], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        defer_indexes: bool = False) -> int:
+        if self.engine.dialect.name != "sqlite":
+            return super().bulk_add_orders(orders, chunk_size, defer_indexes)
+        order_upsert = self._upsert(OrderRow.__table__)
+        count = 0
+        with self._deferred_indexes([OrderRow.__table__], defer_indexes):
+            for chunk in chunks(orders, chunk_size):
+                with self.engine.begin() as connection:
+                    connection.exec_driver_sql(order_upsert, [self._order_params(order) for order in chunk])
+                count += len(chunk)
+        return count
+
+    def clear(self) -> None:
+        with self._sessions.begin() as session:
+            for table in (OrderRow, StockRow, EquipmentSpecsRow, EquipmentRow):
+                session.execute(delete(table))
@@ -0,0 +1,385 @@
+"""Saga coordination for the order processing chain.
+
+A saga runs the chain's stages in order and records every completed stage
+in a ``SagaLog``.  When a stage fails, the completed stages are compensated
+in reverse order (refund the payment, release removed stock).  Because the
+log is persisted, ``recover`` can finish or unwind orders that were in
+flight when the process stopped, without re-running completed stages.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Text, select, update
+from sqlalchemy.engine import Engine
+from src.models.order import Order
+from src.patterns.singleton import EquipmentInventory
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+COMPENSATING = "compensating"
+COMPLETED = "completed"
+COMPENSATED = "compensated"
+FINISHED_STATUSES = (COMPLETED, COMPENSATED)
+
+STEP_COMPLETED = "completed"
+STEP_FAILED = "failed"
+STEP_COMPENSATED = "compensated"
+STEP_COMPENSATION_FAILED = "compensation_failed"
+
+
+class Recovery(NamedTuple):
+    """A saga finished by ``recover``: the restored order and whether it completed."""
+    order: Order
+    completed: bool
+
+
+class InMemorySagaLog:
+    """Saga log kept in process memory; finished sagas are evicted FIFO."""
+
+    blocking = False
+
+    def __init__(self, max_finished: int = 10000):
+        """Initialize in-memory saga log."""
+        self.max_finished = max_finished
+        self._sagas: Dict[str, dict] = {}
+        self._steps: Dict[str, List[Tuple[str, str]]] = {}
+        self._finished: 'OrderedDict[str, None]' = OrderedDict()
+
+    def begin(self, order: Order) -> None:
+        """Start a saga for an order (no-op if it already exists)."""
+        if order.id not in self._sagas:
+            self._sagas[order.id] = {"status": RUNNING, "order": order.to_dict()}
+            self._steps[order.id] = []
+
+    def record(self, order_id: str, stage: str, state: str, order_status: str) -> None:
+        """Append a stage transition and the order status it left behind."""
+        self._steps[order_id].append((stage, state))
+        self._sagas[order_id]["order"]["status"] = order_status
+
+    def set_status(self, order_id: str, status: str) -> None:
+        """Update saga status."""
+        self._sagas[order_id]["status"] = status
+        if status in FINISHED_STATUSES:
+            self._finished[order_id] = None
+            while len(self._finished) > self.max_finished:
+                evicted, _ = self._finished.popitem(last=False)
+                self._sagas.pop(evicted, None)
+                self._steps.pop(evicted, None)
+
+    def status(self, order_id: str) -> Optional[str]:
+        """Saga status, or None for unknown orders."""
+        saga = self._sagas.get(order_id)
+        return saga["status"] if saga else None
+
+    def history(self, order_id: str) -> List[Tuple[str, str]]:
+        """Stage transitions in the order they happened."""
+        return list(self._steps.get(order_id, []))
+
+    def unfinished(self) -> List[Tuple[str, str, dict]]:
+        """(order ID, status, order data) for sagas that did not finish."""
+        return [
+            (order_id, saga["status"], saga["order"])
+            for order_id, saga in self._sagas.items()
+            if saga["status"] not in FINISHED_STATUSES
+        ]
+
+
+class SqlSagaLog:
+    """Saga log persisted through a SQLAlchemy engine.
+
+    Every call does blocking database I/O, so the async saga runs it in a
+    worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, engine: Engine):
+        """Initialize SQL saga log and create its tables."""
+        self.engine = engine
+        metadata = MetaData()
+        self.sagas = Table(
+            "saga", metadata,
+            Column("order_id", String(36), primary_key=True),
+            Column("status", String(16), nullable=False, index=True),
+            Column("order_data", Text, nullable=False),
+            Column("order_status", String(32), nullable=False),
+            Column("updated_at", Float, nullable=False)
+        )
+        self.steps = Table(
+            "saga_step", metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("order_id", String(36), nullable=False, index=True),
+            Column("stage", String(64), nullable=False),
+            Column("state", String(16), nullable=False),
+            Column("at", Float, nullable=False)
+        )
+        metadata.create_all(engine)
+
+    def begin(self, order: Order) -> None:
+        """Start a saga for an order (no-op if it already exists)."""
+        with self.engine.begin() as connection:
+            exists = connection.execute(
+                select(self.sagas.c.order_id).where(self.sagas.c.order_id == order.id)
+            ).first()
+            if exists is None:
+                connection.execute(self.sagas.insert().values(
+                    order_id=order.id, status=RUNNING, order_status=order.status,
+                    order_data=json.dumps(order.to_dict(), default=str), updated_at=time.time()
+                ))
+
+    def record(self, order_id: str, stage: str, state: str, order_status: str) -> None:
+        """Append a stage transition and the order status it left behind."""
+        now = time.time()
+        with self.engine.begin() as connection:
+            connection.execute(self.steps.insert().values(
+                order_id=order_id, stage=stage, state=state, at=now
+            ))
+            connection.execute(
+                update(self.sagas).where(self.sagas.c.order_id == order_id)
+                .values(order_status=order_status, updated_at=now)
+            )
+
+    def set_status(self, order_id: str, status: str) -> None:
+        """Update saga status."""
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(self.sagas).where(self.sagas.c.order_id == order_id)
+                .values(status=status, updated_at=time.time())
+            )
+
+    def status(self, order_id: str) -> Optional[str]:
+        """Saga status, or None for unknown orders."""
+        with self.engine.connect() as connection:
+            return connection.execute(
+                select(self.sagas.c.status).where(self.sagas.c.order_id == order_id)
+            ).scalar()
+
+    def history(self, order_id: str) -> List[Tuple[str, str]]:
+        """Stage transitions in the order they happened."""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(self.steps.c.stage, self.steps.c.state)
+                .where(self.steps.c.order_id == order_id).order_by(self.steps.c.id)
+            )
+            return [(row.stage, row.state) for row in rows]
+
+    def unfinished(self) -> List[Tuple[str, str, dict]]:
+        """(order ID, status, order data) for sagas that did not finish."""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(self.sagas.c.order_id, self.sagas.c.status,
+                       self.sagas.c.order_data, self.sagas.c.order_status)
+                .where(self.sagas.c.status.notin_(FINISHED_STATUSES))
+            )
+            return [
+                (row.order_id, row.status, {**json.loads(row.order_data), "status": row.order_status})
+                for row in rows
+            ]
+
+
+def completed_stages(history: Sequence[Tuple[str, str]]) -> List[str]:
+    """Stages that completed and have not been compensated, in run order.
+
+    A failed compensation leaves its stage in the list, so ``recover``
+    retries it.
+    """
+    done: List[str] = []
+    for stage, state in history:
+        if state == STEP_COMPLETED and stage not in done:
+            done.append(stage)
+        elif state == STEP_COMPENSATED and stage in done:
+            done.remove(stage)
+    return done
+
+
+def restore_order(data: dict) -> Order:
+    """Rebuild an order from saga data, reusing inventory equipment objects."""
+    order = Order.from_dict(data)
+    if order.equipment is not None:
+        order.equipment = EquipmentInventory().get_equipment(order.equipment.id) or order.equipment
+    return order
+
+
+class _SagaBase:
+    """Log bookkeeping shared by the sync and async sagas."""
+
+    def __init__(self, stages: Sequence, log=None):
+        """Initialize saga over chain stages."""
+        if not stages:
+            raise ValueError("Saga needs at least one stage")
+        self.stages = list(stages)
+        self.log = log
+
+    def _begin(self, order: Order) -> List[str]:
+        """Start or reopen the saga; returns already completed stages."""
+        if self.log is None:
+            return []
+        self.log.begin(order)
+        return completed_stages(self.log.history(order.id))
+
+    def _record(self, order: Order, stage, state: str) -> None:
+        if self.log is not None:
+            self.log.record(order.id, stage.stage_name, state, order.status)
+
+    def _set_status(self, order: Order, status: str) -> None:
+        if self.log is not None:
+            self.log.set_status(order.id, status)
+
+    def _to_compensate(self, done: List[str]) -> list:
+        """Completed stages, newest first."""
+        return [stage for stage in reversed(self.stages) if stage.stage_name in done]
+
+
+class OrderSaga(_SagaBase):
+    """Runs sync ``OrderProcessor`` stages with compensation on failure."""
+
+    def execute(self, order: Order) -> bool:
+        """Run the remaining stages; compensate completed ones if a stage fails."""
+        done = self._begin(order)
+        for stage in self.stages:
+            if stage.stage_name in done:
+                continue
+            try:
+                passed = stage.run_stage(order)
+            except Exception:
+                logger.exception("Stage %s raised for order %s", stage.stage_name, order.id)
+                passed = False
+            if not passed:
+                self._record(order, stage, STEP_FAILED)
+                self.compensate(order, done)
+                return False
+            self._record(order, stage, STEP_COMPLETED)
+            done.append(stage.stage_name)
+        self._set_status(order, COMPLETED)
+        return True
+
+    def execute_batch(self, orders: List[Order]) -> List[bool]:
+        """Run a batch stage by stage; like ``execute`` for every order.
+
+        Each stage gets all orders still in flight at once, so it can group
+        work.  Orders failing a stage are compensated as ``execute`` would.
+        """
+        done = [self._begin(order) for order in orders]
+        results = [True] * len(orders)
+        for stage in self.stages:
+            indexes = [index for index, ok in enumerate(results)
+                       if ok and stage.stage_name not in done[index]]
+            if not indexes:
+                continue
+            try:
+                passed = stage.run_stage_batch([orders[index] for index in indexes])
+            except Exception:
+                logger.exception("Stage %s raised for a batch of %d orders", stage.stage_name, len(indexes))
+                passed = [False] * len(indexes)
+            for index, ok in zip(indexes, passed):
+                order = orders[index]
+                if ok:
+                    self._record(order, stage, STEP_COMPLETED)
+                    done[index].append(stage.stage_name)
+                else:
+                    self._record(order, stage, STEP_FAILED)
+                    self.compensate(order, done[index])
+                    results[index] = False
+        for order, ok in zip(orders, results):
+            if ok:
+                self._set_status(order, COMPLETED)
+        return results
+
+    def compensate(self, order: Order, done: List[str]) -> bool:
+        """Undo completed stages in reverse order.
+
+        Stages whose compensation fails stay recorded as such and the saga
+        stays compensating, so ``recover`` retries them; returns False then.
+        """
+        self._set_status(order, COMPENSATING)
+        compensated = True
+        for stage in self._to_compensate(done):
+            try:
+                undone = stage.compensate(order)
+            except Exception:
+                logger.exception("Compensating %s raised for order %s", stage.stage_name, order.id)
+                undone = False
+            self._record(order, stage, STEP_COMPENSATED if undone else STEP_COMPENSATION_FAILED)
+            compensated = compensated and undone
+        if compensated:
+            self._set_status(order, COMPENSATED)
+        return compensated
+
+    def recover(self) -> List[Recovery]:
+        """Resume running sagas and finish interrupted compensations."""
+        results = []
+        for order_id, status, data in self.log.unfinished():
+            order = restore_order(data)
+            if status == COMPENSATING:
+                self.compensate(order, completed_stages(self.log.history(order_id)))
+                results.append(Recovery(order, False))
+            else:
+                results.append(Recovery(order, self.execute(order)))
+        return results
+
+
+class AsyncOrderSaga(_SagaBase):
+    """Runs ``AsyncOrderProcessor`` stages with compensation on failure.
+
+    Calls into a blocking saga log (``SqlSagaLog``) run in a worker thread so
+    they do not stall the event loop.
+    """
+
+    async def _call(self, method, *args):
+        if getattr(self.log, "blocking", False):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def execute(self, order: Order) -> bool:
+        """Run the remaining stages; compensate completed ones if a stage fails."""
+        done = await self._call(self._begin, order)
+        for stage in self.stages:
+            if stage.stage_name in done:
+                continue
+            try:
+                passed = await stage.run_stage(order)
+            except Exception:
+                logger.exception("Stage %s raised for order %s", stage.stage_name, order.id)
+                passed = False
+            if not passed:
+                await self._call(self._record, order, stage, STEP_FAILED)
+                await self.compensate(order, done)
+                return False
+            await self._call(self._record, order, stage, STEP_COMPLETED)
+            done.append(stage.stage_name)
+        await self._call(self._set_status, order, COMPLETED)
+        return True
+
+    async def compensate(self, order: Order, done: List[str]) -> bool:
+        """Undo completed stages in reverse order; see ``OrderSaga.compensate``."""
+        await self._call(self._set_status, order, COMPENSATING)
+        compensated = True
+        for stage in self._to_compensate(done):
+            try:
+                undone = await stage.compensate(order)
+            except Exception:
+                logger.exception("Compensating %s raised for order %s", stage.stage_name, order.id)
+                undone = False
+            await self._call(self._record, order, stage,
+                             STEP_COMPENSATED if undone else STEP_COMPENSATION_FAILED)
+            compensated = compensated and undone
+        if compensated:
+            await self._call(self._set_status, order, COMPENSATED)
+        return compensated
+
+    async def recover(self) -> List[Recovery]:
+        """Resume running sagas and finish interrupted compensations."""
+        results = []
+        for order_id, status, data in await self._call(self.log.unfinished):
+            order = restore_order(data)
+            if status == COMPENSATING:
+                history = await self._call(self.log.history, order_id)
+                await self.compensate(order, completed_stages(history))
+                results.append(Recovery(order, False))
+            else:
+                results.append(Recovery(order, await self.execute(order)))
+        return results
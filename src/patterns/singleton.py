@@ -1,10 +1,18 @@
 """Singleton pattern implementation."""
-from typing import Dict, Optional, List
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 from src.models.equipment import Equipment
 from src.models.order import Order
+from src.patterns.attribute_index import AttributeIndex, Range
+from src.patterns.price_cache import price_cache
+from src.patterns.repository import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE, InMemoryRepository, InventoryRepository, Page, TransactionHook
 
 class EquipmentInventory:
-    """Singleton inventory for equipment."""
+    """Singleton inventory for equipment.
+
+    Storage is delegated to an ``InventoryRepository``: live objects in
+    memory by default, or the SQL tables after ``use_repository``.
+    """
     _instance = None
 
     def __new__(cls):
@@ -12,11 +20,34 @@ class EquipmentInventory:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             # Initialize instance variables
-            cls._instance._equipment_stock = {}
-            cls._instance._equipment_items = {}
-            cls._instance._orders = {}
+            cls._instance._repository = InMemoryRepository()
+            cls._instance._attribute_index = AttributeIndex()
         return cls._instance
 
+    # Dictionaries of the in-memory backend
+    @property
+    def _equipment_stock(self) -> Dict[str, int]:
+        return self._repository.equipment_stock
+
+    @property
+    def _equipment_items(self) -> Dict[str, Equipment]:
+        return self._repository.equipment_items
+
+    @property
+    def _orders(self) -> Dict[str, Order]:
+        return self._repository.orders
+
+    @property
+    def repository(self) -> InventoryRepository:
+        """Current storage backend."""
+        return self._repository
+
+    def use_repository(self, repository: InventoryRepository) -> None:
+        """Switch storage backend and rebuild the attribute index from it."""
+        self._repository = repository
+        self._attribute_index.clear()
+        self._attribute_index.add_many(repository.all_equipment())
+
     def add_equipment(self, equipment: Equipment, quantity: int = 1) -> None:
         """Add equipment to inventory with specified quantity."""
         if quantity <= 0:
@@ -25,7 +56,7 @@ class EquipmentInventory:
         # Handle case where equipment might be passed as string ID
         if isinstance(equipment, str):
             equipment_id = equipment
-            equipment_obj = self._equipment_items.get(equipment_id)
+            equipment_obj = self._repository.get_equipment(equipment_id)
             if not equipment_obj:
                 raise ValueError(f"Equipment with ID {equipment_id} not found")
             equipment = equipment_obj
@@ -35,37 +66,54 @@ class EquipmentInventory:
             import uuid
             equipment.id = str(uuid.uuid4())
             
-        if equipment.id not in self._equipment_stock:
-            self._equipment_stock[equipment.id] = 0
-            self._equipment_items[equipment.id] = equipment
-            
-        self._equipment_stock[equipment.id] += quantity
+        if self._repository.add_equipment(equipment, quantity):
+            self._attribute_index.add(equipment)
+
+    def bulk_add_equipment(self, items: Iterable[Tuple[Equipment, int]],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, defer_indexes: bool = False) -> int:
+        """Load ``(equipment, quantity)`` pairs in chunks; returns the number loaded.
+
+        Known IDs get the new data and their stock grows by ``quantity``.
+        Chunks written before an invalid pair stay loaded.
+        """
+        def checked() -> Iterator[Tuple[Equipment, int]]:
+            for equipment, quantity in items:
+                if quantity <= 0:
+                    raise ValueError("Quantity must be positive")
+                if not equipment.id:
+                    equipment.id = str(uuid.uuid4())
+                yield equipment, quantity
+
+        def written(chunk: list) -> None:
+            # Only items of committed chunks reach the index and price cache
+            for equipment, _ in chunk:
+                price_cache.invalidate(equipment.id)
+            self._attribute_index.add_many([equipment for equipment, _ in chunk])
+
+        return self._repository.bulk_add_equipment(checked(), chunk_size, defer_indexes, written)
+
+    def bulk_add_orders(self, orders: Iterable[Order], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        defer_indexes: bool = False) -> int:
+        """Load orders in chunks; returns the number loaded."""
+        return self._repository.bulk_add_orders(orders, chunk_size, defer_indexes)
 
     def remove_equipment(self, equipment: Equipment, quantity: int = 1) -> bool:
         """Remove equipment from inventory."""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
-            
-        if equipment.id not in self._equipment_stock:
-            return False
-            
-        if self._equipment_stock[equipment.id] < quantity:
-            return False
-            
-        self._equipment_stock[equipment.id] -= quantity
-        return True
+        return self._repository.adjust_stock(equipment.id, -quantity)
 
     def get_equipment(self, equipment_id: str) -> Optional[Equipment]:
         """Get equipment by ID."""
-        return self._equipment_items.get(equipment_id)
+        return self._repository.get_equipment(equipment_id)
 
     def get_equipment_stock(self, equipment_id: str) -> int:
         """Get equipment stock by ID."""
-        return self._equipment_stock.get(equipment_id, 0)
+        return self._repository.get_stock(equipment_id)
 
     def get_equipment_quantity(self, equipment_id: str) -> int:
         """Get equipment quantity by ID."""
-        return self._equipment_stock.get(equipment_id, 0)
+        return self._repository.get_stock(equipment_id)
 
     def is_in_stock(self, equipment: Equipment, quantity: int = 1) -> bool:
         """Check if equipment is in stock."""
@@ -73,50 +121,74 @@ class EquipmentInventory:
 
     def get_all_equipment(self) -> List[Equipment]:
         """Get all equipment in inventory."""
-        return list(self._equipment_items.values())
+        return self._repository.all_equipment()
+
+    def find_equipment(self, ranges: Optional[Dict[str, Range]] = None,
+                       flags: Optional[Dict[str, bool]] = None) -> List[Equipment]:
+        """Get equipment whose attributes fall in ``ranges`` and match ``flags``.
+
+        ``ranges`` maps attribute names to inclusive ``(low, high)`` bounds,
+        e.g. ``{"motor_power": (3.0, None)}``; lookups use the attribute index.
+        """
+        return self._repository.get_equipment_many(list(self._attribute_index.query(ranges, flags)))
+
+    def list_equipment(self, category: Optional[str] = None, min_price: Optional[float] = None,
+                       max_price: Optional[float] = None, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Page through equipment by price; pass the previous ``next_cursor`` as ``after``."""
+        return self._repository.list_equipment(category, min_price, max_price, after, limit)
 
     def get_quantity(self, equipment: Equipment) -> int:
         """Get quantity of equipment in stock."""
-        if equipment.id in self._equipment_stock:
-            return self._equipment_stock[equipment.id]
-        return 0
+        return self._repository.get_stock(equipment.id)
 
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID."""
-        return self._orders.get(order_id)
+        return self._repository.get_order(order_id)
 
-    def add_order(self, order: Order) -> None:
-        """Add order to storage."""
-        self._orders[order.id] = order
+    def add_order(self, order: Order, also_write: Optional[TransactionHook] = None) -> None:
+        """Add order to storage; ``also_write`` joins the order's transaction."""
+        self._repository.add_order(order, also_write)
 
     def update_order_status(self, order_id: str, status: str) -> None:
         """Update order status."""
-        if order_id in self._orders:
-            self._orders[order_id].status = status
+        self._repository.update_order_status(order_id, status)
 
     def clear(self) -> None:
         """Clear all inventory data."""
-        self._equipment_stock.clear()
-        self._equipment_items.clear()
-        self._orders.clear()
+        self._repository.clear()
+        self._attribute_index.clear()
 
     def get_all_orders(self) -> List[Order]:
         """Get all orders."""
-        return list(self._orders.values())
+        return self._repository.all_orders()
+
+    def list_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Page through orders by creation time; pass the previous ``next_cursor`` as ``after``."""
+        return self._repository.list_orders(customer_id, status, after, limit)
 
     # NEW METHODS NEEDED FOR API TESTS
     
     def update_equipment(self, equipment_id: str, updated_equipment: Equipment) -> Optional[Equipment]:
         """Update equipment in inventory."""
-        if equipment_id in self._equipment_items:
+        current = self._repository.get_equipment(equipment_id)
+        if current is not None:
             # Preserve the original ID and stock quantity
             updated_equipment.id = equipment_id
-            self._equipment_items[equipment_id] = updated_equipment
+            updated_equipment._version = current._version + 1
+            self._repository.save_equipment(updated_equipment)
+            self._attribute_index.add(updated_equipment)
+            price_cache.invalidate(equipment_id)
             return updated_equipment
         return None
 
     def decorate_equipment(self, equipment_id: str, decoration_type: str, **kwargs) -> Optional[Equipment]:
-        """Apply decoration to equipment."""
+        """Apply decoration to equipment; None if the equipment does not exist.
+
+        Raises ValueError for an unknown decoration type or a backend that
+        cannot store decorated equipment.
+        """
         equipment = self.get_equipment(equipment_id)
         if not equipment:
             return None
@@ -159,9 +231,6 @@ class EquipmentInventory:
         except ImportError:
             # If decorators are not available, return None
             return None
-        except Exception:
-            # Handle any other errors
-            return None
 
     def create_equipment(self, equipment: Equipment) -> Equipment:
         """Create new equipment and add to inventory."""
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Hashable, Optional
 from src.models.equipment import Equipment
-from datetime import datetime
+from src.models.money import BP_SCALE, to_cents, from_cents, percent_to_bp, scale, scale_terms, apply_discount
+from src.patterns.price_cache import freeze
 
 DISCOUNT_VALIDATION_MESSAGE = "Discount percent must be between 0 and 100"
 
@@ -12,16 +13,40 @@ class PricingStrategy(ABC):
     @abstractmethod
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate price based on strategy."""
+        return from_cents(self._base_total_cents(equipment, quantity))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate price in integer cents."""
+        return to_cents(self.calculate_price(equipment, quantity, **kwargs))
+
+    @staticmethod
+    def _base_total_cents(equipment: Equipment, quantity: int) -> int:
+        """Validate quantity and return the undiscounted total in cents."""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
-        return equipment.base_price * quantity
+        return equipment.base_price_cents * quantity
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """Hashable identity of the strategy parameters for price caching.
+
+        Returns None if the strategy depends on state that cannot be
+        fingerprinted, which disables caching for it.
+        """
+        try:
+            return (type(self).__name__, freeze(vars(self)))
+        except TypeError:
+            return None
 
 class RegularPricingStrategy(PricingStrategy):
     """Regular pricing strategy."""
     
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate regular price."""
-        return super().calculate_price(equipment, quantity)
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate regular price in cents."""
+        return self._base_total_cents(equipment, quantity)
 
 class BulkPricingStrategy(PricingStrategy):
     """Bulk pricing strategy."""
@@ -34,48 +59,80 @@ class BulkPricingStrategy(PricingStrategy):
             raise ValueError(DISCOUNT_VALIDATION_MESSAGE)
         self.threshold = threshold
         self.discount_percent = min(discount_percent, 20.0)  # Cap at 20% discount
+        # Discounted rate precomputed once instead of per line
+        self._rate_terms = scale_terms(BP_SCALE - percent_to_bp(self.discount_percent))
 
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate bulk price."""
-        base_total = super().calculate_price(equipment, quantity)
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate bulk price in cents."""
+        # Inlined _base_total_cents: this is the batch-pricing hot path
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        base_total = equipment.base_price_cents * quantity
         if quantity >= self.threshold:
-            discount = base_total * (self.discount_percent / 100)
-            return base_total - discount
+            numerator, half, denominator = self._rate_terms
+            return (base_total * numerator + half) // denominator
         return base_total
 
 class SeasonalPricingStrategy(PricingStrategy):
     """Seasonal pricing strategy."""
     
-    def __init__(self, discount_percent: float = 20.0):
-        """Initialize seasonal pricing strategy."""
+    def __init__(self, discount_percent: float = 20.0, calendar=None):
+        """Initialize seasonal pricing strategy.
+
+        The discount applies while ``calendar`` (a ``PricingCalendar``,
+        by default the shared winter ``season_calendar``) has an active window.
+        """
         if discount_percent <= 0 or discount_percent >= 100:
             raise ValueError(DISCOUNT_VALIDATION_MESSAGE)
         self.discount_percent = min(discount_percent, 30.0)  # Cap at 30% discount
+        self._rate_bp = BP_SCALE - percent_to_bp(self.discount_percent)
+        if calendar is None:
+            from src.patterns.pricing_calendar import season_calendar  # Import here to avoid circular dependency
+            calendar = season_calendar
+        self.calendar = calendar
 
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate seasonal price."""
-        base_total = super().calculate_price(equipment, quantity)
-        # Apply discount during winter months (December, January, February)
-        current_month = datetime.now().month
-        if current_month in [12, 1, 2]:
-            discount = base_total * (self.discount_percent / 100)
-            return base_total - discount
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate seasonal price in cents."""
+        base_total = self._base_total_cents(equipment, quantity)
+        if self.calendar.active.window_names:
+            return scale(base_total, self._rate_bp)
         return base_total
 
+    def fingerprint(self) -> Optional[Hashable]:
+        """Include the active season since the discount depends on it."""
+        return (type(self).__name__, self.discount_percent, self.calendar.active.window_names)
+
 class PremiumPricingStrategy(PricingStrategy):
     """Premium pricing strategy."""
     
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate premium price."""
-        base_total = super().calculate_price(equipment, quantity)
-        return base_total * 1.2  # 20% markup
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate premium price in cents."""
+        base_total = self._base_total_cents(equipment, quantity)
+        return scale(base_total, 12000)  # 20% markup
 
 class PromoCodePricing(PricingStrategy):
     """Promotional code pricing strategy."""
     
-    def __init__(self):
-        """Initialize promo code pricing."""
+    def __init__(self, store=None):
+        """Initialize promo code pricing.
+
+        ``store`` is an optional ``PromoCodeStore`` consulted for codes that
+        are not registered directly through ``add_promo_code``.
+        """
         self._promo_codes: Dict[str, float] = {}
+        self._store = store
 
     def add_promo_code(self, code: str, discount_percent: float) -> None:
         """Add promo code."""
@@ -87,11 +144,25 @@ class PromoCodePricing(PricingStrategy):
 
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate price with promo code."""
-        base_total = super().calculate_price(equipment, quantity)
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate price with promo code in cents.
+
+        Pass ``redeem=True`` when charging the order: store codes are then
+        redeemed, so single-use and limited codes raise ValueError once
+        used up.  Quotes leave the redemption counts alone.
+        """
+        base_total = self._base_total_cents(equipment, quantity)
         promo_code = kwargs.get("promo_code", "").strip().upper()
         if promo_code in self._promo_codes:
-            discount = base_total * (self._promo_codes[promo_code] / 100)
-            return base_total - discount
+            return apply_discount(base_total, self._promo_codes[promo_code])
+        if self._store is not None and promo_code:
+            if kwargs.get("redeem"):
+                return apply_discount(base_total, self._store.redeem(promo_code))
+            discount_percent = self._store.get_discount(promo_code)
+            if discount_percent is not None:
+                return apply_discount(base_total, discount_percent)
         return base_total
 
 class LoyaltyPricing(PricingStrategy):
@@ -99,7 +170,11 @@ class LoyaltyPricing(PricingStrategy):
     
     def calculate_price(self, equipment: Equipment, quantity: int = 1, **kwargs) -> float:
         """Calculate price with loyalty points."""
-        base_total = super().calculate_price(equipment, quantity)
+        return from_cents(self.calculate_price_cents(equipment, quantity, **kwargs))
+
+    def calculate_price_cents(self, equipment: Equipment, quantity: int = 1, **kwargs) -> int:
+        """Calculate price with loyalty points in cents."""
+        base_total = self._base_total_cents(equipment, quantity)
         loyalty_points = kwargs.get("loyalty_points", 0)
         
         if not isinstance(loyalty_points, (int, float)) or loyalty_points < 0:
@@ -107,11 +182,11 @@ class LoyaltyPricing(PricingStrategy):
             
         # Convert points to discount
         if loyalty_points >= 200:
-            return base_total * 0.85  # 15% discount
+            return scale(base_total, 8500)  # 15% discount
         elif loyalty_points >= 100:
-            return base_total * 0.90  # 10% discount
+            return scale(base_total, 9000)  # 10% discount
         elif loyalty_points >= 50:
-            return base_total * 0.95  # 5% discount
+            return scale(base_total, 9500)  # 5% discount
         return base_total
 
 class PriceCalculator:
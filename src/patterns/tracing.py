@@ -0,0 +1,247 @@
+"""Lightweight span tracing for the order pipeline.
+
+``tracer.span(name)`` times a block, links it to the current trace ID and
+parent span (both carried in context variables, so they follow asyncio
+tasks), records the duration into a per-name histogram and hands the
+finished span to the configured exporters.  ``NDJSONSpanExporter`` writes
+one JSON object per line; ``load_spans``, ``stage_summary`` and
+``folded_stacks`` turn such a file into the per-stage table and flame-graph
+input printed by ``scripts/span_report.py``.
+"""
+import json
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_current_trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("span_id", default=None)
+
+DEFAULT_BUCKETS_MS = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0)
+
+
+def _new_id(bits: int) -> str:
+    """Random hex ID; cheaper than uuid4 on the hot path."""
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+@dataclass
+class Span:
+    """Finished span."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: float
+    duration_ms: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert span to dictionary."""
+        return asdict(self)
+
+
+class ActiveSpan:
+    """Span still running; ``name`` can be refined before the block ends."""
+    __slots__ = ("name", "attributes")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+
+
+class Histogram:
+    """Fixed-bucket duration histogram (milliseconds)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        """Initialize histogram."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Histogram summary."""
+        labels = [f"le_{bucket:g}" for bucket in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "max_ms": self.max,
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list (tests and debugging)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+class NDJSONSpanExporter:
+    """Appends spans to a file as newline-delimited JSON."""
+
+    def __init__(self, path: str):
+        """Open exporter file in append mode."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """Creates spans, aggregates histograms and feeds exporters."""
+
+    def __init__(self):
+        """Initialize tracer."""
+        self.exporters: List[Any] = []
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter) -> None:
+        """Register span exporter."""
+        self.exporters.append(exporter)
+
+    def remove_exporter(self, exporter) -> None:
+        """Unregister span exporter."""
+        if exporter in self.exporters:
+            self.exporters.remove(exporter)
+
+    @contextmanager
+    def trace(self, trace_id: Optional[str] = None) -> Iterator[str]:
+        """Bind a trace ID (new one if not given) to the current context."""
+        trace_id = trace_id or _new_id(128)
+        token = _current_trace_id.set(trace_id)
+        try:
+            yield trace_id
+        finally:
+            _current_trace_id.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[ActiveSpan]:
+        """Time a block as a child of the current span."""
+        trace_id = _current_trace_id.get() or _new_id(128)
+        span_id = _new_id(64)
+        parent_id = _current_span_id.get()
+        trace_token = _current_trace_id.set(trace_id)
+        span_token = _current_span_id.set(span_id)
+        start = time.time()
+        started = time.perf_counter()
+        active = ActiveSpan(name, attributes)
+        try:
+            yield active
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            _current_span_id.reset(span_token)
+            _current_trace_id.reset(trace_token)
+            self._record(Span(trace_id, span_id, parent_id, active.name, start, duration_ms, active.attributes))
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = Histogram()
+            histogram.observe(span.duration_ms)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Per-span-name duration histograms."""
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+    def reset(self) -> None:
+        """Drop recorded histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+
+def load_spans(path: str) -> List[Span]:
+    """Read spans written by ``NDJSONSpanExporter``."""
+    spans = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                spans.append(Span(**json.loads(line)))
+    return spans
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+def stage_summary(spans: List[Span]) -> Dict[str, Dict[str, float]]:
+    """Count, total, mean, p50 and p95 duration (ms) per span name."""
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        durations.setdefault(span.name, []).append(span.duration_ms)
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        total = sum(values)
+        summary[name] = {
+            "count": len(values),
+            "total_ms": total,
+            "mean_ms": total / len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95)
+        }
+    return summary
+
+
+def folded_stacks(spans: List[Span]) -> Dict[str, int]:
+    """Flame-graph folded stacks: ``root;child;leaf`` -> self time in µs."""
+    by_id = {(span.trace_id, span.span_id): span for span in spans}
+    child_time: Dict[Tuple[str, str], float] = {}
+    for span in spans:
+        if span.parent_id is not None:
+            key = (span.trace_id, span.parent_id)
+            child_time[key] = child_time.get(key, 0.0) + span.duration_ms
+
+    stacks: Dict[str, int] = {}
+    for key, span in by_id.items():
+        path = [span.name]
+        parent = by_id.get((span.trace_id, span.parent_id))
+        while parent is not None:
+            path.append(parent.name)
+            parent = by_id.get((parent.trace_id, parent.parent_id))
+        stack = ";".join(reversed(path))
+        self_us = max(0, round((span.duration_ms - child_time.get(key, 0.0)) * 1000))
+        stacks[stack] = stacks.get(stack, 0) + self_us
+    return stacks
+
+
+def get_current_trace_id() -> Optional[str]:
+    """Trace ID bound to the current context, if any."""
+    return _current_trace_id.get()
+
+
+tracer = Tracer()
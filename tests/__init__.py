@@ -0,0 +1 @@
+"""Test suite for the sport equipment store."""
@@ -0,0 +1 @@
+"""Stand-in SMTP and payment servers for tests and benchmarks; not shipped."""
@@ -0,0 +1,88 @@
+"""Local stub payment gateway for tests and benchmarks.
+
+Run standalone with::
+
+    uvicorn tests.stubs.payment_stub:app --port 8100
+
+or mount in-process through ``httpx.ASGITransport(app=create_stub_gateway())``.
+Latency, failure rate and decline threshold can be changed at runtime through
+``POST /config``.
+"""
+import asyncio
+import random
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
+from pydantic import BaseModel
+
+
+class ChargeRequest(BaseModel):
+    order_id: str
+    customer_id: str
+    amount_cents: int
+
+
+class StubConfig(BaseModel):
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    decline_above_cents: Optional[int] = None
+
+
+def create_stub_gateway(latency: float = 0.0, failure_rate: float = 0.0,
+                        decline_above_cents: Optional[int] = None,
+                        seed: Optional[int] = None) -> FastAPI:
+    """Create a stub gateway app with injectable latency and failures."""
+    stub = FastAPI()
+    stub.state.config = StubConfig(latency=latency, failure_rate=failure_rate,
+                                   decline_above_cents=decline_above_cents)
+    stub.state.rng = random.Random(seed)
+    stub.state.charges = {}
+    stub.state.refunds = set()
+    stub.state.requests = 0
+    stub.state.failures = 0
+    stub.state.idempotency_keys = []
+
+    @stub.post("/charges")
+    async def charge(request: ChargeRequest, idempotency_key: Optional[str] = Header(None)):
+        """Charge endpoint; idempotent per order ID."""
+        config = stub.state.config
+        stub.state.requests += 1
+        stub.state.idempotency_keys.append(idempotency_key)
+        if config.latency:
+            await asyncio.sleep(config.latency)
+        if stub.state.rng.random() < config.failure_rate:
+            stub.state.failures += 1
+            raise HTTPException(status_code=503, detail="Gateway unavailable")
+        if request.order_id not in stub.state.charges:
+            limit = config.decline_above_cents
+            stub.state.charges[request.order_id] = limit is None or request.amount_cents <= limit
+        return {"order_id": request.order_id, "approved": stub.state.charges[request.order_id]}
+
+    @stub.post("/refunds")
+    async def refund(request: ChargeRequest, idempotency_key: Optional[str] = Header(None)):
+        """Refund endpoint; only approved charges can be refunded."""
+        stub.state.idempotency_keys.append(idempotency_key)
+        refunded = stub.state.charges.get(request.order_id, False)
+        if refunded:
+            stub.state.refunds.add(request.order_id)
+        return {"order_id": request.order_id, "refunded": refunded}
+
+    @stub.post("/config")
+    async def configure(config: StubConfig):
+        """Change stub behaviour."""
+        stub.state.config = config
+        return config
+
+    @stub.get("/stats")
+    async def stats():
+        """Request counters."""
+        return {
+            "requests": stub.state.requests,
+            "failures": stub.state.failures,
+            "charges": len(stub.state.charges),
+            "refunds": len(stub.state.refunds)
+        }
+
+    return stub
+
+
+app = create_stub_gateway()
@@ -0,0 +1,143 @@
+"""Local stub SMTP server for tests and benchmarks.
+
+Speaks enough SMTP (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) for
+``smtplib`` clients and runs its asyncio loop in a background thread::
+
+    with StubSMTPServer(latency=0.001) as server:
+        smtplib.SMTP(server.host, server.port).sendmail(...)
+        server.messages
+"""
+import asyncio
+import threading
+from typing import List, NamedTuple, Optional
+
+
+class ReceivedMessage(NamedTuple):
+    mail_from: str
+    rcpt_tos: List[str]
+    data: str
+
+
+class StubSMTPServer:
+    """In-process SMTP server recording every accepted message."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 reject_domains: Optional[List[str]] = None):
+        """Initialize stub; ``latency`` is added after every DATA command."""
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.reject_domains = set(reject_domains or [])
+        self.messages: List[ReceivedMessage] = []
+        self.connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._handlers = set()
+
+    def __enter__(self) -> 'StubSMTPServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="smtp-stub", daemon=True)
+        self._thread.start()
+        ready.wait(5)
+
+    def stop(self) -> None:
+        """Stop the server and its thread."""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            # Drop open client sessions, like a server going away would
+            for task in list(self._handlers):
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+        self._loop = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self._lock:
+            self.connections += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        mail_from, rcpt_tos = "", []
+
+        async def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 stub ESMTP")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode().rstrip("\r\n")
+                command, _, argument = line.partition(" ")
+                command = command.upper()
+                if command == "EHLO":
+                    await reply("250-stub\r\n250 8BITMIME")
+                elif command == "HELO":
+                    await reply("250 stub")
+                elif command == "MAIL":
+                    mail_from, rcpt_tos = argument.partition(":")[2].strip("<> "), []
+                    await reply("250 OK")
+                elif command == "RCPT":
+                    address = argument.partition(":")[2].strip("<> ")
+                    if address.rpartition("@")[2] in self.reject_domains:
+                        await reply("550 Mailbox unavailable")
+                    else:
+                        rcpt_tos.append(address)
+                        await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        data_line = (await reader.readline()).decode()
+                        if data_line in (".\r\n", ".\n", ""):
+                            break
+                        lines.append(data_line[1:] if data_line.startswith(".") else data_line)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    with self._lock:
+                        self.messages.append(ReceivedMessage(mail_from, rcpt_tos, "".join(lines)))
+                    await reply("250 OK: queued")
+                elif command == "RSET":
+                    mail_from, rcpt_tos = "", []
+                    await reply("250 OK")
+                elif command == "NOOP":
+                    await reply("250 OK")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
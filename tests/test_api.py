@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 from src.api.main import app
 from src.patterns.singleton import EquipmentInventory
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
 
 client = TestClient(app)
 
@@ -123,4 +125,104 @@ def test_invalid_decoration_type():
         }
     )
     assert response.status_code == 400
-    assert "invalid decoration type" in response.json()["detail"].lower()
\ No newline at end of file
+    assert "invalid decoration type" in response.json()["detail"].lower()
+
+def test_timeline_of_unknown_order():
+    """Test timeline of unknown order returns 404"""
+    response = client.get("/orders/nonexistent/timeline")
+    assert response.status_code == 404
+
+def test_orders_keyset_pages():
+    """Test orders can be paged with the X-Next-Cursor header"""
+    inventory = EquipmentInventory()
+    equipment = Equipment("Paged Item", "Paged item", 10.0, "Test",
+                          EquipmentSpecs("5", "10x10x10", "Steel", "Black", "100", "12"))
+    inventory.add_equipment(equipment, 3)
+    for _ in range(3):
+        inventory.add_order(Order(equipment=equipment, quantity=1, customer_id="PAGED"))
+    first = client.get("/orders", params={"customer_id": "PAGED", "limit": 2})
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    second = client.get("/orders", params={"customer_id": "PAGED", "limit": 2,
+                                           "after": first.headers["X-Next-Cursor"]})
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    assert client.get("/orders", params={"limit": 2, "after": "bad"}).status_code == 400
+
+def test_startup_stores_recovered_orders(monkeypatch):
+    """Test orders finished by saga recovery are stored and announced"""
+    import asyncio
+    from src.api import main
+    from src.patterns.async_chain import AsyncOrderProcessorChain
+    from src.patterns.database_singleton import create_database_engine
+    from src.patterns.outbox import Outbox
+    from src.patterns.saga import InMemorySagaLog
+
+    inventory = EquipmentInventory()
+    equipment = Equipment("Recovered Item", "Recovered item", 10.0, "Test",
+                          EquipmentSpecs("5", "10x10x10", "Steel", "Black", "100", "12"))
+    inventory.add_equipment(equipment, 1)
+    order = Order(equipment=equipment, quantity=1, customer_id="RECOVERED")
+    log = InMemorySagaLog()
+    log.begin(order)
+    outbox = Outbox(create_database_engine("sqlite:///:memory:"))
+    monkeypatch.setattr(main, "saga_log", log)
+    monkeypatch.setattr(main, "order_processor_chain",
+                        AsyncOrderProcessorChain(main.notification_system, saga_log=log))
+    monkeypatch.setattr(main, "outbox", outbox)
+    monkeypatch.setattr(main.outbox_relay, "start", lambda: None)
+
+    asyncio.run(main.recover_orders())
+    assert inventory.get_order(order.id).status == "fulfilled"
+    assert outbox.pending() == 1
+
+def test_sql_backend_calls_run_off_the_event_loop(monkeypatch):
+    """Test blocking repository calls are moved to the threadpool"""
+    import asyncio
+    from src.patterns.database_singleton import create_database_engine
+    from src.patterns.repository import SqlRepository
+
+    inventory = EquipmentInventory()
+    previous = inventory.repository
+    repository = SqlRepository(create_database_engine("sqlite:///:memory:"))
+    on_loop = []
+    original = repository.get_equipment
+
+    def get_equipment(equipment_id):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return original(equipment_id)
+
+    monkeypatch.setattr(repository, "get_equipment", get_equipment)
+    try:
+        inventory.use_repository(repository)
+        equipment = Equipment("SQL Item", "SQL item", 10.0, "Test",
+                              EquipmentSpecs("5", "10x10x10", "Steel", "Black", "100", "12"))
+        inventory.add_equipment(equipment, 1)
+        response = client.get(f"/equipment/{equipment.id}")
+        assert response.status_code == 200
+        assert on_loop == [False]
+    finally:
+        inventory.use_repository(previous)
+
+def test_sql_backend_rejects_decoration():
+    """Test decorating on the SQL backend fails instead of losing the layers"""
+    from src.patterns.database_singleton import create_database_engine
+    from src.patterns.repository import SqlRepository
+
+    inventory = EquipmentInventory()
+    previous = inventory.repository
+    try:
+        inventory.use_repository(SqlRepository(create_database_engine("sqlite:///:memory:")))
+        equipment = Equipment("SQL Item", "SQL item", 100.0, "Test",
+                              EquipmentSpecs("5", "10x10x10", "Steel", "Black", "100", "12"))
+        inventory.add_equipment(equipment, 1)
+        response = client.post(f"/equipment/{equipment.id}/decorate",
+                               json={"decoration_type": "installation"})
+        assert response.status_code == 400
+        assert inventory.get_equipment(equipment.id).get_price() == 100.0
+    finally:
+        inventory.use_repository(previous)
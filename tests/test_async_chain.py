@@ -0,0 +1,137 @@
+"""Tests for async order processing chain."""
+import asyncio
+import time
+import pytest
+from src.models.order import Order
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.async_chain import (
+    AsyncOrderProcessor,
+    AsyncOrderProcessorChain,
+    AsyncPaymentProcessor,
+    ParallelStage
+)
+from src.patterns.singleton import EquipmentInventory
+
+
+class LatencyStage(AsyncOrderProcessor):
+    """Stub stage that injects latency before answering."""
+    def __init__(self, delay: float, result: bool = True, timeout: float = None):
+        super().__init__(timeout=timeout)
+        self.delay = delay
+        self.result = result
+        self.compensated = 0
+
+    async def _validate(self, order: Order) -> bool:
+        await asyncio.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    async def compensate(self, order: Order) -> bool:
+        self.compensated += 1
+        return True
+
+
+@pytest.fixture
+def sample_equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=299.99,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+def make_order(equipment, quantity=1):
+    """Create order for testing."""
+    return Order(equipment=equipment, quantity=quantity, customer_id="CUST001")
+
+
+def test_async_chain_processes_order(sample_equipment):
+    """Test async chain runs stock, payment and fulfillment."""
+    EquipmentInventory().add_equipment(sample_equipment, 2)
+    chain = AsyncOrderProcessorChain()
+    order = make_order(sample_equipment, 2)
+    assert asyncio.run(chain.process_order(order)) is True
+    assert order.status == "fulfilled"
+    assert asyncio.run(chain.process_order(make_order(sample_equipment))) is False
+
+
+def test_payment_handler_failure(sample_equipment):
+    """Test declined payment stops the chain."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+
+    async def decline(order):
+        return False
+
+    chain = AsyncOrderProcessorChain(payment_handler=decline)
+    order = make_order(sample_equipment)
+    assert asyncio.run(chain.process_order(order)) is False
+    assert order.status == "stock_validated"
+
+
+def test_stage_timeout(sample_equipment):
+    """Test slow stage fails once its timeout elapses."""
+    async def slow_payment(order):
+        await asyncio.sleep(1)
+        return True
+
+    processor = AsyncPaymentProcessor(payment_handler=slow_payment, timeout=0.01)
+    assert asyncio.run(processor.process(make_order(sample_equipment))) is False
+    with pytest.raises(ValueError):
+        LatencyStage(0, timeout=0)
+
+
+def test_parallel_stage_runs_concurrently(sample_equipment):
+    """Test independent checks overlap instead of adding up."""
+    stage = ParallelStage([LatencyStage(0.05), LatencyStage(0.05), LatencyStage(0.05)])
+    started = time.perf_counter()
+    assert asyncio.run(stage.process(make_order(sample_equipment))) is True
+    assert time.perf_counter() - started < 0.12
+
+    failing = ParallelStage([LatencyStage(0.01), LatencyStage(0.01, result=False)])
+    assert asyncio.run(failing.process(make_order(sample_equipment))) is False
+    with pytest.raises(ValueError):
+        ParallelStage([])
+
+
+def test_parallel_stage_compensates_passed_checks(sample_equipment):
+    """Test checks that passed are undone when a sibling fails, raises or times out."""
+    passed, failed = LatencyStage(0), LatencyStage(0.01, result=False)
+    assert asyncio.run(ParallelStage([passed, failed]).process(make_order(sample_equipment))) is False
+    assert (passed.compensated, failed.compensated) == (1, 0)
+
+    passed, raising = LatencyStage(0), LatencyStage(0.01, result=RuntimeError("stock service down"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(ParallelStage([passed, raising]).process(make_order(sample_equipment)))
+    assert (passed.compensated, raising.compensated) == (1, 0)
+
+    passed, slow = LatencyStage(0), LatencyStage(1)
+    stage = ParallelStage([passed, slow], timeout=0.05)
+    assert asyncio.run(stage.process(make_order(sample_equipment))) is False
+    assert (passed.compensated, slow.compensated) == (1, 0)
+    assert asyncio.run(LatencyStage(1, timeout=0.01).run_stage(None)) is False
+
+
+def test_throughput_flat_as_latency_rises(sample_equipment):
+    """Test concurrent orders overlap their stage latency."""
+    async def load(delay, count):
+        stage = LatencyStage(delay)
+        stage.set_next(LatencyStage(delay))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(stage.process(make_order(sample_equipment)) for _ in range(count)))
+        assert all(results)
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(load(0.05, 200))
+    # Sequentially this would take 200 * 2 * 50ms = 20s
+    assert elapsed < 1.0
@@ -0,0 +1,65 @@
+"""Tests for the async database engine and session dependency."""
+import asyncio
+import pytest
+from sqlalchemy import text
+from src.patterns.async_database import (
+    AsyncDatabase, async_available, async_database_url, create_async_database_engine, get_async_db
+)
+
+requires_async = pytest.mark.skipif(not async_available("sqlite://"),
+                                    reason="greenlet/aiosqlite not installed")
+
+
+def test_async_database_url_switches_driver():
+    """Test sync URLs map to their async drivers."""
+    assert async_database_url("sqlite:///./store.db") == "sqlite+aiosqlite:///./store.db"
+    assert async_database_url("sqlite+pysqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+    assert async_database_url("postgresql://u:p@db/store") == "postgresql+asyncpg://u:p@db/store"
+
+
+def test_async_database_url_rejects_unknown_dialect():
+    """Test URLs without an async driver are rejected."""
+    with pytest.raises(ValueError):
+        async_database_url("oracle://db/store")
+    with pytest.raises(ValueError):
+        async_database_url("not a url")
+
+
+@pytest.mark.skipif(async_available("sqlite://"), reason="async driver installed")
+def test_missing_driver_raises_import_error():
+    """Test engine creation names the missing packages."""
+    with pytest.raises(ImportError, match="aiosqlite"):
+        create_async_database_engine("sqlite:///:memory:")
+
+
+@requires_async
+def test_async_memory_engine_round_trip():
+    """Test in-memory async engines keep data across connections."""
+    async def scenario():
+        engine = create_async_database_engine("sqlite:///:memory:")
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE items (id INTEGER)"))
+            await connection.execute(text("INSERT INTO items VALUES (1)"))
+        async with engine.connect() as connection:
+            count = (await connection.execute(text("SELECT COUNT(*) FROM items"))).scalar()
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(scenario()) == 1
+
+
+@requires_async
+def test_get_async_db_yields_session_and_closes_it(monkeypatch):
+    """Test the dependency hands out an async session per request."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+
+    async def scenario():
+        dependency = get_async_db()
+        session = await dependency.__anext__()
+        value = (await session.execute(text("SELECT 1"))).scalar()
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+        await AsyncDatabase().dispose()
+        return value
+
+    assert asyncio.run(scenario()) == 1
@@ -0,0 +1,133 @@
+"""Tests for equipment attributes and the inventory attribute index."""
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.attribute_index import AttributeIndex
+from src.patterns.builder import EquipmentDirector, PowerRackBuilder, TreadmillBuilder
+from src.patterns.decorator import WarrantyDecorator
+from src.patterns.singleton import EquipmentInventory
+
+
+@pytest.fixture(autouse=True)
+def clean_inventory():
+    """Clear inventory before and after each test."""
+    EquipmentInventory().clear()
+    yield
+    EquipmentInventory().clear()
+
+
+def make_equipment(**attributes):
+    """Create equipment with the given attributes."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        specs=EquipmentSpecs(
+            weight="75.0", dimensions="200x100x220", material="Steel",
+            color="Black", max_user_weight="150.0", warranty_months="12"
+        ),
+        attributes=attributes
+    )
+
+
+def test_builders_carry_attributes():
+    """Test builder-only settings end up on the built equipment."""
+    treadmill = EquipmentDirector(TreadmillBuilder()).build_basic_model()
+    assert treadmill.attributes == {"max_speed": 20.0, "incline_levels": 15, "motor_power": 3.5}
+    power_rack = EquipmentDirector(PowerRackBuilder()).build_basic_model()
+    assert power_rack.attributes == {
+        "weight_capacity": 1000.0, "has_safety_bars": True, "has_pull_up_bar": True
+    }
+    assert Equipment.from_dict(power_rack.to_dict()).attributes == power_rack.attributes
+    assert WarrantyDecorator(treadmill, 1).attributes == treadmill.attributes
+
+
+@pytest.mark.parametrize("attributes", [
+    {"color": 1}, {"motor_power": "3"}, {"has_safety_bars": 1}, {"incline_levels": 2.5}
+])
+def test_invalid_attributes(attributes):
+    """Test unknown names and wrongly typed values are rejected."""
+    with pytest.raises(ValueError):
+        make_equipment(**attributes)
+
+
+def test_range_and_flag_queries():
+    """Test inclusive ranges, open bounds, flags and combinations."""
+    index = AttributeIndex()
+    weak = make_equipment(motor_power=2.0)
+    strong = make_equipment(motor_power=3.0, max_speed=18.0)
+    fast = make_equipment(motor_power=4.5, max_speed=22.0)
+    rack = make_equipment(has_safety_bars=True, weight_capacity=800.0)
+    for equipment in (weak, strong, fast, rack):
+        index.add(equipment)
+    assert index.query(ranges={"motor_power": (3.0, None)}) == {strong.id, fast.id}
+    assert index.query(ranges={"motor_power": (None, 3.0)}) == {weak.id, strong.id}
+    assert index.query(ranges={"motor_power": (3.0, None), "max_speed": (20.0, None)}) == {fast.id}
+    assert index.query(flags={"has_safety_bars": True}) == {rack.id}
+    assert index.query(ranges={"motor_power": (0, None)}, flags={"has_safety_bars": True}) == set()
+    assert index.query(ranges={"weight_capacity": (1000.0, None)}) == set()
+    assert len(index.query()) == 4
+    with pytest.raises(ValueError):
+        index.query(ranges={"has_safety_bars": (0, 1)})
+    with pytest.raises(ValueError):
+        index.query(flags={"unknown": True})
+
+
+def test_reindex_and_remove():
+    """Test replaced and removed items leave no stale entries."""
+    index = AttributeIndex()
+    first = make_equipment(motor_power=3.0)
+    second = make_equipment(motor_power=3.0)
+    index.add(first)
+    index.add(second)
+    first.attributes = {"motor_power": 1.0}
+    index.add(first)
+    assert index.query(ranges={"motor_power": (2.0, None)}) == {second.id}
+    index.remove(second.id)
+    assert index.query(ranges={"motor_power": (None, None)}) == {first.id}
+    assert len(index) == 1
+
+
+def test_shared_values_and_inclusive_bounds():
+    """Test removal among many equal values and ranges ending on a shared value."""
+    index = AttributeIndex()
+    items = [make_equipment(incline_levels=15) for _ in range(50)]
+    index.add_many(items)
+    index.add(make_equipment(incline_levels=16))
+    index.remove(items[25].id)
+    matched = index.query(ranges={"incline_levels": (15, 15)})
+    assert matched == {item.id for item in items} - {items[25].id}
+    assert len(index.query(ranges={"incline_levels": (None, 16)})) == 50
+    assert index.query(ranges={"incline_levels": (17, None)}) == set()
+
+
+def test_add_many_matches_add():
+    """Test bulk indexing replaces old entries like ``add``."""
+    index = AttributeIndex()
+    first = make_equipment(motor_power=3.0, has_safety_bars=True)
+    index.add(first)
+    first.attributes = {"motor_power": 1.0, "has_safety_bars": False}
+    others = [make_equipment(motor_power=float(power)) for power in (5, 2, 4)]
+    index.add_many([first] + others)
+    assert index.query(ranges={"motor_power": (2.0, 4.0)}) == {others[1].id, others[2].id}
+    assert index.query(ranges={"motor_power": (None, 1.0)}) == {first.id}
+    assert index.query(flags={"has_safety_bars": True}) == set()
+    assert index.query(flags={"has_safety_bars": False}) == {first.id}
+    index.remove(others[0].id)
+    assert len(index) == 3
+
+
+def test_inventory_find_equipment():
+    """Test the inventory keeps its index in sync with added and updated items."""
+    inventory = EquipmentInventory()
+    treadmill = EquipmentDirector(TreadmillBuilder()).build_basic_model()
+    power_rack = EquipmentDirector(PowerRackBuilder()).build_basic_model()
+    inventory.add_equipment(treadmill, 2)
+    inventory.add_equipment(power_rack, 1)
+    assert inventory.find_equipment(ranges={"motor_power": (3.0, None)}) == [treadmill]
+    assert inventory.find_equipment(flags={"has_pull_up_bar": True}) == [power_rack]
+
+    slower = make_equipment(motor_power=2.0)
+    inventory.update_equipment(treadmill.id, slower)
+    assert inventory.find_equipment(ranges={"motor_power": (3.0, None)}) == []
+    inventory.clear()
+    assert inventory.find_equipment(flags={"has_pull_up_bar": True}) == []
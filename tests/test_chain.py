@@ -9,7 +9,9 @@ from src.patterns.chain import (
     OrderFulfillment,
     OrderProcessorChain
 )
+from src.patterns.saga import InMemorySagaLog
 from src.patterns.singleton import EquipmentInventory
+from src.patterns.observer import NotificationSystem, OrderObserver
 
 @pytest.fixture
 def sample_equipment():
@@ -135,4 +137,94 @@ def test_order_processor_invalid_customer():
             customer_id="",
             customer_name="Test Customer",
             customer_email="test@example.com"
-        ) 
\ No newline at end of file
+        )
+
+
+def test_processors_share_injected_notification_system():
+    """Test chain injects one notification system into every processor."""
+    system = NotificationSystem()
+    chain = OrderProcessorChain(system)
+    assert chain.notification_system is system
+    assert chain.stock_validator._notification_system is system
+    assert chain.payment_processor._notification_system is system
+    assert chain.order_fulfillment._notification_system is system
+
+
+def test_default_notification_system_is_shared():
+    """Test processors built without injection reuse one default system."""
+    assert StockValidator()._notification_system is PaymentProcessor()._notification_system
+
+
+def test_chain_reused_across_orders(sample_equipment):
+    """Test one chain instance processes many orders."""
+    inventory = EquipmentInventory()
+    inventory.add_equipment(sample_equipment, 3)
+    chain = OrderProcessorChain()
+    orders = [
+        Order(equipment=sample_equipment, quantity=1, customer_id=f"CUST{i}")
+        for i in range(4)
+    ]
+    results = [chain.process_order(order) for order in orders]
+    assert results == [True, True, True, False]
+    assert [order.status for order in orders[:3]] == ["fulfilled"] * 3
+
+
+def test_process_many(sample_equipment):
+    """Test batch processing reserves stock per SKU in order sequence."""
+    inventory = EquipmentInventory()
+    inventory.add_equipment(sample_equipment, 5)
+    chain = OrderProcessorChain()
+    orders = [
+        Order(equipment=sample_equipment, quantity=2, customer_id="CUST1"),
+        Order(equipment=sample_equipment, quantity=4, customer_id="CUST2"),
+        Order(equipment=None, quantity=0, customer_id="CUST3"),
+        Order(equipment=sample_equipment, quantity=3, customer_id="CUST4"),
+    ]
+    assert chain.process_many(orders) == [True, False, True, True]
+    assert [order.status for order in orders] == ["fulfilled", "pending", "paid", "fulfilled"]
+    assert inventory.get_equipment_stock(sample_equipment.id) == 0
+    assert chain.process_many([]) == []
+
+
+def test_process_many_matches_per_order_loop(sample_equipment):
+    """Test batch and per-order processing accept the same orders."""
+    inventory = EquipmentInventory()
+    quantities = [1, 3, 2, 5, 1, 1]
+    inventory.add_equipment(sample_equipment, 7)
+    chain = OrderProcessorChain()
+    batch = chain.process_many([
+        Order(equipment=sample_equipment, quantity=q, customer_id="CUST") for q in quantities
+    ])
+    inventory.add_equipment(sample_equipment, 7)
+    loop = [
+        chain.process_order(Order(equipment=sample_equipment, quantity=q, customer_id="CUST"))
+        for q in quantities
+    ]
+    assert batch == loop
+
+
+def test_process_many_refunds_order_that_fails_fulfillment(sample_equipment):
+    """Test the batch path compensates a paid order that cannot be fulfilled."""
+    inventory = EquipmentInventory()
+    inventory.add_equipment(sample_equipment, 2)
+    refunded = []
+
+    def refund(order):
+        refunded.append(order.id)
+        return True
+
+    saga_log = InMemorySagaLog()
+    chain = OrderProcessorChain(NotificationSystem(), saga_log=saga_log, refund_handler=refund)
+
+    class ConcurrentSale(OrderObserver):
+        """Sells the stock elsewhere once the order is paid."""
+        def update(self, order, event_type):
+            if event_type == "paid":
+                inventory.remove_equipment(sample_equipment, 2)
+
+    chain.notification_system.attach(ConcurrentSale())
+    order = Order(equipment=sample_equipment, quantity=2, customer_id="CUST1")
+    assert chain.process_many([order]) == [False]
+    assert refunded == [order.id]
+    assert order.status == "refunded"
+    assert saga_log.status(order.id) == "compensated"
@@ -0,0 +1,137 @@
+"""Tests for notification coalescing."""
+import time
+import pytest
+from src.models.order import Order
+from src.patterns.coalescing import EventCoalescer
+from src.patterns.dispatcher import ObserverDispatcher
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingObserver(OrderObserver):
+    """Observer that records each call it receives."""
+    def __init__(self):
+        self.calls = []
+
+    def update(self, order: Order, event_type: str) -> None:
+        self.calls.append(event_type)
+
+    def update_digest(self, order: Order, event_types) -> None:
+        self.calls.append(list(event_types))
+
+
+class PlainObserver(OrderObserver):
+    """Observer without digest support."""
+    def __init__(self):
+        self.calls = []
+
+    def update(self, order: Order, event_type: str) -> None:
+        self.calls.append(event_type)
+
+
+def make_order():
+    """Create empty order for testing."""
+    return Order(equipment=None, quantity=0, customer_id="CUST001")
+
+
+def test_terminal_event_flushes_one_digest():
+    """Test the four order events become one digest."""
+    observer = CountingObserver()
+    system = NotificationSystem(coalescer=EventCoalescer(window=60))
+    system.attach(observer)
+    order = make_order()
+    for event_type in ("stock_validated", "paid", "fulfilled"):
+        system.notify(order, event_type)
+    assert observer.calls == []
+    system.notify(order, "created")
+    assert observer.calls == [["stock_validated", "paid", "fulfilled", "created"]]
+    assert system.coalescer.stats == {"events": 4, "digests": 1}
+
+
+def test_window_expiry_releases_digest():
+    """Test non-terminal events are released once the window passes."""
+    clock = FakeClock()
+    coalescer = EventCoalescer(window=1.0, clock=clock)
+    first, second = make_order(), make_order()
+    coalescer.add(first, "paid")
+    clock.now = 0.5
+    coalescer.add(second, "stock_validated")
+    assert coalescer.expired() == []
+    clock.now = 1.0
+    assert coalescer.expired() == [(first, ["paid"])]
+    assert coalescer.pending == 1
+
+
+def test_background_flush_after_window():
+    """Test the flusher thread delivers expired digests."""
+    observer = CountingObserver()
+    system = NotificationSystem(coalescer=EventCoalescer(window=0.05))
+    system.attach(observer)
+    system.notify(make_order(), "paid")
+    deadline = time.monotonic() + 2
+    while not observer.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert observer.calls == [["paid"]]
+
+
+def test_flusher_survives_delivery_errors():
+    """Test a failing delivery is logged and later digests still go out."""
+    coalescer = EventCoalescer(window=0.02)
+    delivered = []
+
+    def deliver(order, events):
+        delivered.append(events)
+        if len(delivered) == 1:
+            raise RuntimeError("observer failed")
+
+    coalescer.start(deliver)
+    for event_type in ("paid", "fulfilled"):
+        coalescer.add(make_order(), event_type)
+        deadline = time.monotonic() + 2
+        while coalescer.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+    deadline = time.monotonic() + 2
+    while len(delivered) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert delivered == [["paid"], ["fulfilled"]]
+    flusher = coalescer._flusher
+    coalescer.stop(timeout=2)
+    assert not flusher.is_alive()
+
+
+def test_default_digest_calls_update_per_event():
+    """Test observers without digest support still see every event."""
+    observer = PlainObserver()
+    system = NotificationSystem(coalescer=EventCoalescer(window=60))
+    system.attach(observer)
+    order = make_order()
+    system.notify(order, "paid")
+    system.notify(order, "refunded")
+    assert observer.calls == ["paid", "refunded"]
+
+
+def test_digest_through_dispatcher_and_flush():
+    """Test digests pass through the dispatcher and flush drains buffers."""
+    observer = CountingObserver()
+    system = NotificationSystem(ObserverDispatcher(), EventCoalescer(window=60))
+    system.attach(observer)
+    order = make_order()
+    system.notify(order, "stock_validated")
+    system.notify(order, "paid")
+    assert system.flush(2)
+    assert observer.calls == [["stock_validated", "paid"]]
+    system.dispatcher.close()
+
+
+def test_coalescer_validation():
+    """Test window must be positive."""
+    with pytest.raises(ValueError):
+        EventCoalescer(window=0)
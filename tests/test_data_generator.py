@@ -0,0 +1,85 @@
+"""Tests for the synthetic workload generator."""
+import random
+import types
+from collections import Counter
+import pytest
+from src.data_generator import (
+    WorkloadGenerator, ZipfSampler, populate_inventory, read_ndjson, write_ndjson
+)
+from src.models.equipment import Equipment
+from src.patterns.singleton import EquipmentInventory
+
+
+@pytest.fixture(autouse=True)
+def clean_inventory():
+    """Clear inventory before and after each test."""
+    EquipmentInventory().clear()
+    yield
+    EquipmentInventory().clear()
+
+
+def test_catalog_is_seeded_and_streamed():
+    """Test the same seed yields the same catalog, lazily."""
+    items = WorkloadGenerator(50, seed=3).equipment()
+    assert isinstance(items, types.GeneratorType)
+    first = [item.to_dict() for item in items]
+    second = [item.to_dict() for item in WorkloadGenerator(50, seed=3).equipment()]
+    other = [item.to_dict() for item in WorkloadGenerator(50, seed=4).equipment()]
+    assert first == second
+    assert first != other
+    assert [item["id"] for item in first] == [WorkloadGenerator.sku_id(i) for i in range(50)]
+
+
+def test_catalog_distributions():
+    """Test categories, prices and builder attributes look realistic."""
+    items = list(WorkloadGenerator(2000, seed=1).equipment())
+    categories = Counter(item.category for item in items)
+    assert set(categories) == {"Cardio", "Strength", "Free Weights"}
+    assert all(item.base_price >= 4.99 for item in items)
+    cardio = [item.base_price for item in items if item.category == "Cardio"]
+    free_weights = [item.base_price for item in items if item.category == "Free Weights"]
+    assert sum(cardio) / len(cardio) > 3 * sum(free_weights) / len(free_weights)
+    assert any("motor_power" in item.attributes for item in items)
+    assert any("has_safety_bars" in item.attributes for item in items)
+
+
+def test_zipf_sampler_skew():
+    """Test low ranks dominate and every sample stays in range."""
+    sampler = ZipfSampler(1000, exponent=1.2, rng=random.Random(0))
+    counts = Counter(sampler.sample() for _ in range(20000))
+    assert min(counts) >= 1 and max(counts) <= 1000
+    assert counts[1] > counts[2] > counts[10] > counts[100]
+    # P(rank 1) = 1 / H(1000, 1.2), about 0.21
+    assert 0.18 < counts[1] / 20000 < 0.24
+    with pytest.raises(ValueError):
+        ZipfSampler(0)
+
+
+def test_orders_reference_catalog():
+    """Test order records and Order objects point at generated SKUs."""
+    generator = WorkloadGenerator(100, seed=5)
+    records = list(generator.order_records(500))
+    assert records == list(generator.order_records(500))
+    catalog_ids = {generator.sku_id(i) for i in range(100)}
+    assert all(record["equipment_id"] in catalog_ids for record in records)
+    assert Counter(record["equipment_id"] for record in records).most_common(1)[0][0] == generator.sku_id(0)
+
+    catalog = list(generator.equipment())
+    orders = list(generator.orders(500, catalog))
+    assert [order.id for order in orders] == [record["id"] for record in records]
+    assert [order.equipment.id for order in orders] == [record["equipment_id"] for record in records]
+    with pytest.raises(ValueError):
+        list(generator.orders(1, catalog[:10]))
+
+
+def test_ndjson_round_trip_and_inventory(tmp_path):
+    """Test catalogs can go to NDJSON or straight into the inventory."""
+    generator = WorkloadGenerator(20, seed=2)
+    path = str(tmp_path / "catalog.ndjson")
+    assert write_ndjson((item.to_dict() for item in generator.equipment()), path) == 20
+    loaded = [Equipment.from_dict(record) for record in read_ndjson(path)]
+    assert [item.to_dict() for item in loaded] == [item.to_dict() for item in generator.equipment()]
+
+    inventory = EquipmentInventory()
+    assert populate_inventory(generator.equipment(), inventory, stock=lambda item: 3) == 20
+    assert inventory.get_equipment_stock(generator.sku_id(7)) == 3
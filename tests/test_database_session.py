@@ -0,0 +1,49 @@
+"""Tests for database engine and session management."""
+import threading
+from sqlalchemy import text
+from src.patterns.database_singleton import DatabaseSingleton, create_database_engine, get_db
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    """Test file databases use WAL, synchronous=NORMAL and mmap."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'store.db'}", mmap_size=1 << 20)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA mmap_size")).scalar() == 1 << 20
+    assert engine.pool.size() == 5
+    engine.dispose()
+
+
+def test_memory_database_shares_one_connection():
+    """Test in-memory databases keep their data across connections."""
+    engine = create_database_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER)"))
+        connection.execute(text("INSERT INTO items VALUES (1)"))
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+
+
+def test_get_db_yields_open_session_and_closes_it():
+    """Test the dependency hands out a usable session per request."""
+    dependency = get_db()
+    session = next(dependency)
+    assert session.execute(text("SELECT 1")).scalar() == 1
+    other = next(get_db())
+    assert other is not session
+    dependency.close()
+    assert not session.in_transaction()
+    other.close()
+
+
+def test_session_is_per_thread():
+    """Test threads do not share the singleton's session."""
+    database = DatabaseSingleton()
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(database.session))
+    thread.start()
+    thread.join()
+    assert database.session is database.session
+    assert sessions[0] is not database.session
+    database.close()
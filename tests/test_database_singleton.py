@@ -323,6 +323,24 @@ def test_decorate_equipment_not_found(clean_inventory):
     assert result is None
 
 
+def test_decorate_equipment_errors_are_raised(clean_inventory, sample_equipment):
+    """Test decoration errors surface instead of reading as a missing item."""
+    from src.patterns.repository import SqlRepository
+    from src.patterns.database_singleton import create_database_engine
+    inventory = clean_inventory
+    inventory.add_equipment(sample_equipment, 1)
+    with pytest.raises(ValueError):
+        inventory.decorate_equipment(sample_equipment.id, "gold-plating")
+    previous = inventory.repository
+    try:
+        inventory.use_repository(SqlRepository(create_database_engine("sqlite:///:memory:")))
+        inventory.add_equipment(sample_equipment, 1)
+        with pytest.raises(ValueError):
+            inventory.decorate_equipment(sample_equipment.id, "insurance")
+    finally:
+        inventory.use_repository(previous)
+
+
 def test_multiple_inventory_operations(clean_inventory, sample_equipment):
     """Test multiple inventory operations."""
     inventory = clean_inventory
@@ -0,0 +1,292 @@
+"""Tests for background observer dispatch."""
+import asyncio
+import os
+import pickle
+import threading
+import time
+import pytest
+from src.models.order import Order
+from src.patterns.dispatcher import BLOCK, DROP_OLDEST, SPILL, ObserverDispatcher
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+
+class RecordingObserver(OrderObserver):
+    """Observer that records events, optionally after waiting on a gate."""
+    def __init__(self, gate: threading.Event = None, delay: float = 0.0):
+        self.events = []
+        self.gate = gate
+        self.delay = delay
+
+    def update(self, order: Order, event_type: str) -> None:
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.delay:
+            time.sleep(self.delay)
+        self.events.append(event_type)
+
+
+class FailingObserver(OrderObserver):
+    """Observer that always raises."""
+    def update(self, order: Order, event_type: str) -> None:
+        raise RuntimeError("backend down")
+
+
+def make_order():
+    """Create empty order for testing."""
+    return Order(equipment=None, quantity=0, customer_id="CUST001")
+
+
+def make_system(observer, **kwargs):
+    """Notification system with a dispatcher and one observer."""
+    system = NotificationSystem(ObserverDispatcher(**kwargs))
+    system.attach(observer)
+    return system
+
+
+def test_notify_does_not_wait_for_slow_observer():
+    """Test notify returns before a slow observer finishes."""
+    slow = RecordingObserver(delay=0.2)
+    system = make_system(slow)
+    started = time.perf_counter()
+    system.notify(make_order(), "paid")
+    assert time.perf_counter() - started < 0.1
+    assert system.flush(2)
+    assert slow.events == ["paid"]
+    system.dispatcher.close()
+
+
+def test_failing_observer_is_isolated():
+    """Test one failing observer does not affect another."""
+    good = RecordingObserver()
+    system = make_system(FailingObserver())
+    system.attach(good)
+    for event_type in ("stock_validated", "paid", "fulfilled"):
+        system.notify(make_order(), event_type)
+    assert system.flush(2)
+    assert good.events == ["stock_validated", "paid", "fulfilled"]
+    metrics = system.dispatcher.metrics()["observers"]
+    assert metrics["FailingObserver"]["failed"] == 3
+    assert metrics["RecordingObserver"]["delivered"] == 3
+    system.dispatcher.close()
+
+
+def test_drop_oldest_policy():
+    """Test a full lane discards its oldest events."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    system = make_system(observer, maxsize=2, policy=DROP_OLDEST)
+    system.notify(make_order(), "first")
+    time.sleep(0.05)  # the worker is now blocked on "first"
+    for event_type in ("a", "b", "c", "d"):
+        system.notify(make_order(), event_type)
+    assert system.dispatcher.metrics()["queue_depth"] == 2
+    gate.set()
+    assert system.flush(2)
+    assert observer.events == ["first", "c", "d"]
+    assert system.dispatcher.metrics()["observers"]["RecordingObserver"]["dropped"] == 2
+    system.dispatcher.close()
+
+
+def test_block_policy_times_out():
+    """Test block policy waits for space and drops after the timeout."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    system = make_system(observer, maxsize=1, policy=BLOCK, block_timeout=0.05)
+    dispatcher = system.dispatcher
+    dispatcher.submit(observer, make_order(), "first")
+    time.sleep(0.05)
+    assert dispatcher.submit(observer, make_order(), "queued") is True
+    started = time.perf_counter()
+    assert dispatcher.submit(observer, make_order(), "late") is False
+    assert time.perf_counter() - started >= 0.05
+    gate.set()
+    assert dispatcher.join(2)
+    assert observer.events == ["first", "queued"]
+    dispatcher.close()
+
+
+def test_notify_reports_dropped_event():
+    """Test notify returns False when the dispatcher drops the event."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    system = make_system(observer, maxsize=1, policy=BLOCK, block_timeout=0.01)
+    assert system.notify(make_order(), "first") is True
+    time.sleep(0.05)
+    assert system.notify(make_order(), "queued") is True
+    assert system.notify(make_order(), "late") is False
+    gate.set()
+    system.dispatcher.close()
+
+
+def test_notify_now_runs_observers_before_returning():
+    """Test notify_now bypasses the dispatcher and propagates observer errors."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    system = make_system(observer, maxsize=1, policy=DROP_OLDEST)
+    gate.set()
+    system.notify_now(make_order(), "created")
+    assert observer.events == ["created"]
+    system.attach(FailingObserver())
+    with pytest.raises(RuntimeError):
+        system.notify_now(make_order(), "created")
+    system.dispatcher.close()
+
+
+def test_spill_policy_keeps_every_event_in_order(tmp_path):
+    """Test overflow spills to disk and is delivered in FIFO order."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    system = make_system(observer, maxsize=2, policy=SPILL, spill_dir=str(tmp_path))
+    events = [f"event{index}" for index in range(10)]
+    for event_type in events:
+        system.notify(make_order(), event_type)
+    lane = system.dispatcher.metrics()["observers"]["RecordingObserver"]
+    assert lane["spilled"] >= 7
+    assert list(tmp_path.iterdir())
+    gate.set()
+    assert system.flush(2)
+    assert observer.events == events
+    system.dispatcher.close()
+
+
+def test_spill_file_is_appended_not_truncated(tmp_path):
+    """Test events left in a lane's spill file by an earlier run are still delivered."""
+    with open(os.path.join(str(tmp_path), "email.spill"), "wb") as file:
+        pickle.dump((make_order(), "leftover"), file)
+    observer = RecordingObserver()
+    dispatcher = ObserverDispatcher(policy=SPILL, spill_dir=str(tmp_path))
+    dispatcher.add(observer, "email")
+    assert dispatcher.submit(observer, make_order(), "new") is True
+    assert dispatcher.join(2)
+    assert observer.events == ["leftover", "new"]
+    dispatcher.close()
+
+
+def test_spill_is_read_back_in_chunks(tmp_path):
+    """Test leftover spilled events are loaded at most maxsize at a time."""
+    events = [f"event{index}" for index in range(10)]
+    with open(os.path.join(str(tmp_path), "email.spill"), "wb") as file:
+        for event_type in events:
+            pickle.dump((make_order(), event_type), file)
+    dispatcher = ObserverDispatcher(maxsize=3, policy=SPILL, spill_dir=str(tmp_path))
+    in_memory = []
+
+    class SizeRecorder(RecordingObserver):
+        def update(self, order, event_type):
+            in_memory.append(dispatcher._lanes[id(self)]._size)
+            super().update(order, event_type)
+
+    observer = SizeRecorder()
+    dispatcher.add(observer, "email")
+    assert dispatcher.join(2)
+    assert observer.events == events
+    assert max(in_memory) < 3
+    assert os.path.getsize(os.path.join(str(tmp_path), "email.spill")) == 0
+    dispatcher.close()
+
+
+def test_unpicklable_spill_counts_as_drop(tmp_path):
+    """Test an event that cannot be spilled is dropped without breaking the file."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    dispatcher = ObserverDispatcher(maxsize=1, policy=SPILL, spill_dir=str(tmp_path))
+    dispatcher.submit(observer, make_order(), "first")
+    time.sleep(0.05)
+    dispatcher.submit(observer, make_order(), "queued")
+    assert dispatcher.submit(observer, make_order(), lambda: None) is False
+    assert dispatcher.submit(observer, make_order(), "spilled") is True
+    gate.set()
+    assert dispatcher.join(2)
+    assert observer.events == ["first", "queued", "spilled"]
+    assert dispatcher.metrics()["observers"]["RecordingObserver"]["dropped"] == 1
+    dispatcher.close()
+
+
+def test_spill_lanes_are_named_and_locked(tmp_path):
+    """Test spill lanes need a directory, unique names and an unused file."""
+    with pytest.raises(ValueError):
+        ObserverDispatcher(policy=SPILL)
+    dispatcher = ObserverDispatcher(policy=SPILL, spill_dir=str(tmp_path))
+    dispatcher.add(RecordingObserver(), "email")
+    with pytest.raises(ValueError):
+        dispatcher.add(RecordingObserver(), "email")
+    with pytest.raises(ValueError):
+        dispatcher.add(RecordingObserver(), "../email")
+    other = ObserverDispatcher(policy=SPILL, spill_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        other.add(RecordingObserver(), "email")
+    dispatcher.close()
+    other.add(RecordingObserver(), "email")
+    other.close()
+
+
+def test_workers_keep_each_order_in_sequence():
+    """Test an order's events stay in order with several workers."""
+    delivered = []
+
+    class SlowFirstObserver(OrderObserver):
+        def update(self, order: Order, event_type: str) -> None:
+            if event_type == "first":
+                time.sleep(0.05)
+            delivered.append((order.id, event_type))
+
+    observer = SlowFirstObserver()
+    dispatcher = ObserverDispatcher(workers=4)
+    orders = [make_order() for _ in range(4)]
+    for order in orders:
+        dispatcher.submit(observer, order, "first")
+        dispatcher.submit(observer, order, "second")
+    assert dispatcher.join(2)
+    for order in orders:
+        assert [event for order_id, event in delivered if order_id == order.id] == ["first", "second"]
+    dispatcher.close()
+
+
+def test_block_policy_does_not_wait_on_event_loop():
+    """Test a full blocking lane drops at once instead of stalling the loop."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    dispatcher = ObserverDispatcher(maxsize=1, policy=BLOCK, block_timeout=5.0)
+    dispatcher.submit(observer, make_order(), "first")
+    time.sleep(0.05)
+    dispatcher.submit(observer, make_order(), "queued")
+
+    async def submit_late():
+        started = time.perf_counter()
+        accepted = dispatcher.submit(observer, make_order(), "late")
+        return accepted, time.perf_counter() - started
+
+    accepted, elapsed = asyncio.run(submit_late())
+    assert accepted is False and elapsed < 1.0
+    gate.set()
+    assert dispatcher.join(2)
+    dispatcher.close()
+
+
+def test_submit_after_close_is_rejected():
+    """Test a closed dispatcher does not create new lanes."""
+    dispatcher = ObserverDispatcher()
+    dispatcher.close()
+    assert dispatcher.submit(RecordingObserver(), make_order(), "paid") is False
+    assert dispatcher.metrics()["observers"] == {}
+
+
+def test_detach_drains_lane():
+    """Test detaching an observer delivers its queued events first."""
+    observer = RecordingObserver(delay=0.01)
+    system = make_system(observer)
+    for _ in range(3):
+        system.notify(make_order(), "paid")
+    system.detach(observer)
+    assert observer.events == ["paid"] * 3
+    assert system.dispatcher.metrics()["observers"] == {}
+
+
+def test_dispatcher_validation():
+    """Test invalid dispatcher settings are rejected."""
+    with pytest.raises(ValueError):
+        ObserverDispatcher(maxsize=0)
+    with pytest.raises(ValueError):
+        ObserverDispatcher(workers=0)
+    with pytest.raises(ValueError):
+        ObserverDispatcher(policy="discard")
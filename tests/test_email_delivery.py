@@ -0,0 +1,156 @@
+"""Tests for pooled SMTP email delivery against the local SMTP stub."""
+import email
+import pytest
+from tests.stubs.smtp_stub import StubSMTPServer
+from src.models.order import Order
+from src.patterns.email_delivery import DomainRateLimiter, SMTPConnectionPool, SMTPEmailNotifier
+from src.patterns.observer import NotificationSystem
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def smtp_server():
+    """Running SMTP stub."""
+    with StubSMTPServer() as server:
+        yield server
+
+
+def make_order(email="customer@example.com"):
+    """Create empty order for testing."""
+    return Order(equipment=None, quantity=0, customer_id="CUST001", customer_email=email)
+
+
+def make_notifier(server, size=2, **kwargs):
+    """Notifier connected to the stub server."""
+    return SMTPEmailNotifier(SMTPConnectionPool(server.host, server.port, size=size), **kwargs)
+
+
+def test_messages_reuse_pooled_sessions(smtp_server):
+    """Test many messages go over at most ``size`` connections."""
+    notifier = make_notifier(smtp_server, size=2, batch_size=10)
+    orders = [make_order(f"user{index}@example.com") for index in range(30)]
+    for order in orders:
+        notifier.update(order, "paid")
+    notifier.close()
+    assert len(smtp_server.messages) == 30
+    assert smtp_server.connections <= 2
+    assert notifier.stats["sent"] == 30
+    assert notifier.stats["batches"] < 30
+    received = smtp_server.messages[0]
+    assert received.mail_from == "orders@sport-store.local"
+    assert "Subject: Order" in received.data
+
+
+def test_digest_sends_one_email(smtp_server):
+    """Test coalesced events become one email."""
+    notifier = make_notifier(smtp_server)
+    notifier.update_digest(make_order(), ["stock_validated", "paid", "fulfilled", "created"])
+    notifier.flush()
+    assert len(smtp_server.messages) == 1
+    body = email.message_from_string(smtp_server.messages[0].data).get_payload(decode=True).decode()
+    assert "stock_validated, paid, fulfilled, created" in body
+    notifier.close()
+
+
+def test_orders_without_email_are_skipped(smtp_server):
+    """Test orders without an address queue nothing."""
+    notifier = make_notifier(smtp_server)
+    notifier.update(make_order(email=None), "paid")
+    notifier.close()
+    assert smtp_server.messages == []
+    assert notifier.stats["queued"] == 0
+
+
+def test_rejected_recipient_counts_as_failed(smtp_server):
+    """Test a refused recipient does not stop the batch."""
+    smtp_server.reject_domains.add("blocked.example")
+    notifier = make_notifier(smtp_server, size=1)
+    notifier.update(make_order("a@blocked.example"), "paid")
+    notifier.update(make_order("b@example.com"), "paid")
+    notifier.close()
+    assert notifier.stats["failed"] == 1
+    assert [message.rcpt_tos for message in smtp_server.messages] == [["b@example.com"]]
+
+
+def test_reconnects_after_server_drops_session():
+    """Test a dropped session is reopened for the next message."""
+    server = StubSMTPServer()
+    server.start()
+    notifier = make_notifier(server, size=1)
+    notifier.update(make_order(), "paid")
+    notifier.flush()
+    port = server.port
+    server.stop()
+
+    restarted = StubSMTPServer(port=port)
+    restarted.start()
+    notifier.update(make_order(), "fulfilled")
+    notifier.close()
+    restarted.stop()
+    assert len(restarted.messages) == 1
+    assert notifier.stats["sent"] == 2
+
+
+def test_domain_rate_limiter():
+    """Test per-domain token buckets."""
+    clock = FakeClock()
+    limiter = DomainRateLimiter({"slow.example": 2.0}, burst=2, clock=clock)
+    assert limiter.reserve("slow.example") == 0.0
+    assert limiter.reserve("slow.example") == 0.0
+    assert limiter.reserve("slow.example") == pytest.approx(0.5)
+    assert limiter.reserve("fast.example") == 0.0
+    clock.now = 2.0
+    assert limiter.reserve("slow.example") == 0.0
+    with pytest.raises(ValueError):
+        DomainRateLimiter({"bad.example": 0})
+
+
+def test_rate_limit_applies_during_delivery(smtp_server):
+    """Test the notifier waits for the domain's bucket."""
+    sleeps = []
+    limiter = DomainRateLimiter({"example.com": 1.0}, sleep=sleeps.append)
+    notifier = make_notifier(smtp_server, size=1, rate_limiter=limiter)
+    for _ in range(3):
+        notifier.update(make_order(), "paid")
+    notifier.close()
+    assert len(sleeps) == 2
+
+
+def test_rate_limit_wait_returns_session_to_pool(smtp_server):
+    """Test workers do not hold a session while waiting for a token."""
+    pool = SMTPConnectionPool(smtp_server.host, smtp_server.port, size=1)
+    idle_while_waiting = []
+    limiter = DomainRateLimiter({"example.com": 1.0},
+                                sleep=lambda seconds: idle_while_waiting.append(pool._idle.qsize()))
+    notifier = SMTPEmailNotifier(pool, rate_limiter=limiter)
+    for _ in range(3):
+        notifier.update(make_order(), "paid")
+    notifier.close()
+    assert idle_while_waiting == [1, 1]
+    assert len(smtp_server.messages) == 3
+    assert pool.opened == 1
+
+
+def test_notifier_as_observer(smtp_server):
+    """Test the notifier plugs into the notification system."""
+    system = NotificationSystem()
+    notifier = make_notifier(smtp_server)
+    system.subscribe(notifier, "paid")
+    system.notify(make_order(), "stock_validated")
+    system.notify(make_order(), "paid")
+    notifier.close()
+    assert len(smtp_server.messages) == 1
+
+
+def test_validation():
+    """Test invalid settings are rejected."""
+    with pytest.raises(ValueError):
+        SMTPConnectionPool("localhost", size=0)
@@ -0,0 +1,131 @@
+"""Tests for the order event history."""
+import gc
+import weakref
+from datetime import datetime
+import pytest
+from src.models.order import Order
+from src.patterns.event_history import EventHistory
+from src.patterns.observer import NotificationSystem, OrderObserver
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingObserver(OrderObserver):
+    """Observer that records each event it receives."""
+    def __init__(self):
+        self.calls = []
+
+    def update(self, order: Order, event_type: str) -> None:
+        self.calls.append((order.id, event_type))
+
+
+def make_order():
+    """Create empty order for testing."""
+    return Order(equipment=None, quantity=0, customer_id="CUST001")
+
+
+def test_timeline_returns_order_events_in_order():
+    """Test an order's timeline keeps its own events, oldest first."""
+    clock = FakeClock()
+    history = EventHistory(capacity=10, clock=clock)
+    first, second = make_order(), make_order()
+    for event_type in ("stock_validated", "paid", "fulfilled"):
+        history.record(first, event_type)
+        history.record(second, event_type)
+        clock.now += 1
+    timeline = history.timeline(first.id)
+    assert [event.event_type for event in timeline] == ["stock_validated", "paid", "fulfilled"]
+    assert all(event.order.id == first.id for event in timeline)
+    assert timeline[0].timestamp == datetime.fromtimestamp(1000.0)
+    assert history.timeline("missing") == []
+
+
+def test_full_buffer_overwrites_oldest_events():
+    """Test memory stays bounded and evicted events leave the order index."""
+    history = EventHistory(capacity=3, clock=FakeClock())
+    old, new = make_order(), make_order()
+    history.record(old, "created")
+    history.record(old, "paid")
+    for event_type in ("created", "paid", "fulfilled"):
+        history.record(new, event_type)
+    assert len(history) == 3
+    assert history.timeline(old.id) == []
+    assert [event.event_type for event in history.replay()] == ["created", "paid", "fulfilled"]
+    assert history.stats() == {
+        "capacity": 3, "size": 3, "recorded": 5, "overwritten": 2, "orders": 1, "event_types": 3
+    }
+
+
+def test_replay_since_and_event_types():
+    """Test replay starts at ``since`` and can filter event types."""
+    clock = FakeClock()
+    history = EventHistory(capacity=4, clock=clock)
+    order = make_order()
+    for event_type in ("created", "paid", "fulfilled", "refunded", "created"):
+        history.record(order, event_type)
+        clock.now += 10
+    assert [event.event_type for event in history.replay(since=1020.0)] == ["fulfilled", "refunded", "created"]
+    assert len(history.replay(since=datetime.fromtimestamp(1035.0))) == 1
+    assert [event.event_type for event in history.replay(event_types=["created"])] == ["created"]
+    assert history.replay(event_types=["unknown"]) == []
+
+
+def test_timestamps_never_go_backwards():
+    """Test a clock step back does not break ordering for ``since``."""
+    clock = FakeClock()
+    history = EventHistory(capacity=4, clock=clock)
+    order = make_order()
+    history.record(order, "created")
+    clock.now -= 5
+    history.record(order, "paid")
+    assert [event.timestamp for event in history.replay(since=1000.0)] == [datetime.fromtimestamp(1000.0)] * 2
+
+
+def test_replay_to_feeds_observer():
+    """Test stored events can be replayed into a new observer."""
+    history = EventHistory(capacity=10, clock=FakeClock())
+    order = make_order()
+    history.record(order, "created")
+    history.record(order, "paid")
+    observer = CountingObserver()
+    assert history.replay_to(observer) == 2
+    assert observer.calls == [(order.id, "created"), (order.id, "paid")]
+
+
+def test_history_keeps_snapshots_not_orders():
+    """Test events show the order as it was and do not keep it alive."""
+    history = EventHistory(capacity=10, clock=FakeClock())
+    order = make_order()
+    order_id = order.id
+    history.record(order, "created")
+    order.status = "paid"
+    history.record(order, "paid")
+    assert [event.order.status for event in history.timeline(order_id)] == ["pending", "paid"]
+    reference = weakref.ref(order)
+    del order
+    gc.collect()
+    assert reference() is None
+    assert history.replay()[0].order.id == order_id
+
+
+def test_invalid_capacity():
+    """Test capacity must be positive."""
+    with pytest.raises(ValueError):
+        EventHistory(capacity=0)
+
+
+def test_notification_system_records_history():
+    """Test notified events are recorded even without observers."""
+    history = EventHistory(capacity=10)
+    system = NotificationSystem(history=history)
+    order = make_order()
+    system.notify(order, "created")
+    system.notify(order, "paid")
+    assert [event.event_type for event in history.timeline(order.id)] == ["created", "paid"]
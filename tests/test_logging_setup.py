@@ -0,0 +1,130 @@
+"""Tests for queue-based structured logging."""
+import io
+import json
+import logging
+import sys
+import threading
+import pytest
+from src.logging_setup import (
+    JsonFormatter,
+    SamplingFilter,
+    configure_logging,
+    parse_sample_rates,
+    stop_logging
+)
+from src.models.order import Order
+from src.patterns.observer import EmailNotifier
+
+
+@pytest.fixture
+def log_stream():
+    """Configure queue logging into a string buffer."""
+    stream = io.StringIO()
+    yield stream
+    stop_logging()
+
+
+def read_records(stream):
+    """Parse the JSON lines written so far."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_carry_order_id(log_stream):
+    """Test observer logs become JSON records with order fields."""
+    configure_logging(stream=log_stream)
+    order = Order(equipment=None, quantity=0, customer_id="CUST001", customer_email="a@b.c")
+    EmailNotifier().update(order, "paid")
+    stop_logging()
+    record = next(entry for entry in read_records(log_stream) if entry["logger"] == "src.patterns.observer")
+    assert record["message"] == f"Sending email to a@b.c about order {order.id} paid"
+    assert record["order_id"] == order.id
+    assert record["event_type"] == "paid"
+    assert record["channel"] == "email"
+    assert record["level"] == "INFO"
+
+
+def test_records_are_written_by_listener_thread(log_stream):
+    """Test the calling thread only enqueues records."""
+    handler = logging.StreamHandler(log_stream)
+    threads = []
+    handler.emit = lambda record: threads.append(threading.current_thread().name)
+    configure_logging(handler=handler)
+    logging.getLogger("test.listener").info("hello")
+    stop_logging()
+    assert threads and threads[0] != "MainThread"
+
+
+def test_queue_handler_leaves_record_intact(log_stream):
+    """Test other handlers still see the original message, args and exception."""
+    seen = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            seen.append((record.msg, record.args, record.exc_info))
+
+    configure_logging(stream=log_stream)
+    # Runs after the queue handler on the root logger
+    capture = Capture()
+    logging.getLogger().addHandler(capture)
+    try:
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("test.intact").exception("order %s failed", "A1")
+    finally:
+        logging.getLogger().removeHandler(capture)
+    stop_logging()
+    msg, args, exc_info = seen[0]
+    assert (msg, args) == ("order %s failed", ("A1",))
+    assert exc_info[0] is RuntimeError
+
+
+def test_sampling_keeps_one_in_n(log_stream):
+    """Test INFO records are sampled per logger while warnings pass."""
+    configure_logging(stream=log_stream, sample_rates={"test.chatty": 0.1})
+    chatty = logging.getLogger("test.chatty.child")
+    for index in range(50):
+        chatty.info("event %d", index)
+    chatty.warning("always kept")
+    logging.getLogger("test.quiet").info("kept too")
+    stop_logging()
+    messages = [entry["message"] for entry in read_records(log_stream)]
+    assert [message for message in messages if message.startswith("event")] == [
+        f"event {index}" for index in range(0, 50, 10)
+    ]
+    assert "always kept" in messages
+    assert "kept too" in messages
+
+
+def test_lazy_formatting_skips_disabled_levels(log_stream):
+    """Test arguments are not formatted below the configured level."""
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted")
+
+    configure_logging(level=logging.WARNING, stream=log_stream)
+    logging.getLogger("test.lazy").info("value %s", Exploding())
+    stop_logging()
+    assert log_stream.getvalue() == ""
+
+
+def test_json_formatter_includes_exception():
+    """Test exceptions are rendered into the record."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_sample_rate_parsing_and_validation():
+    """Test sample rate specs are parsed and validated."""
+    assert parse_sample_rates("a=0.5, b.c=0.01") == {"a": 0.5, "b.c": 0.01}
+    assert parse_sample_rates("") == {}
+    with pytest.raises(ValueError):
+        parse_sample_rates("a")
+    with pytest.raises(ValueError):
+        SamplingFilter({"a": 0})
@@ -0,0 +1,137 @@
+"""Tests for the integer-cents money kernel."""
+from decimal import Decimal
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.models.money import (
+    ROUND_HALF_UP,
+    ROUND_HALF_EVEN,
+    ROUND_DOWN,
+    ROUND_UP,
+    ROUND_FLOOR,
+    ROUND_CEILING,
+    divide,
+    to_cents,
+    from_cents,
+    scale,
+    scale_terms,
+    apply_discount,
+    apply_markup,
+    line_totals,
+    format_cents
+)
+from src.patterns.decorator import WarrantyDecorator, InsuranceDecorator, MaintenanceDecorator
+from src.patterns.strategy import BulkPricingStrategy, LoyaltyPricing
+
+
+@pytest.mark.parametrize("numerator, mode, expected", [
+    (25, ROUND_HALF_UP, 3),
+    (25, ROUND_HALF_EVEN, 2),
+    (35, ROUND_HALF_EVEN, 4),
+    (-25, ROUND_HALF_UP, -3),
+    (-25, ROUND_HALF_EVEN, -2),
+    (21, ROUND_DOWN, 2),
+    (-21, ROUND_DOWN, -2),
+    (21, ROUND_UP, 3),
+    (-21, ROUND_UP, -3),
+    (-21, ROUND_FLOOR, -3),
+    (-21, ROUND_CEILING, -2),
+    (20, ROUND_UP, 2),
+])
+def test_divide_rounding_modes(numerator, mode, expected):
+    """Test every rounding mode, including ties and negatives."""
+    assert divide(numerator, 10, mode) == expected
+
+
+def test_divide_validation():
+    """Test invalid denominators and modes."""
+    with pytest.raises(ValueError):
+        divide(1, 0)
+    with pytest.raises(ValueError, match="Unknown rounding"):
+        divide(5, 10, "sideways")
+
+
+def test_to_cents():
+    """Test conversion from floats, ints, strings and decimals."""
+    assert to_cents(999.99) == 99999
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(5) == 500
+    assert to_cents("12.345") == 1235
+    assert to_cents("12.345", ROUND_HALF_EVEN) == 1234
+    assert to_cents(Decimal("1.005"), ROUND_DOWN) == 100
+    assert to_cents(1.005, ROUND_UP) == 101
+    with pytest.raises(ValueError):
+        to_cents("abc")
+    assert from_cents(99999) == 999.99
+    assert format_cents(-1205) == "-12.05"
+
+
+def test_scale_and_percentages():
+    """Test basis-point scaling."""
+    assert scale(99999, 11000) == 109999
+    assert scale(-99999, 11000) == -109999
+    assert scale(99999, 11000, ROUND_DOWN) == 109998
+    assert apply_discount(10000, 12.5) == 8750
+    assert apply_markup(10000, 20.0) == 12000
+
+
+def test_scale_terms_match_scale():
+    """Test precomputed rate terms round like scale."""
+    assert scale_terms(8750) == (14, 8, 16)
+    for rate_bp in (8750, 8999, 9000, 10000, 12000):
+        numerator, half, denominator = scale_terms(rate_bp)
+        for cents in (0, 1, 5, 99999, 123457, 10 ** 12 + 7):
+            assert (cents * numerator + half) // denominator == scale(cents, rate_bp)
+
+
+def test_line_totals():
+    """Test batch line pricing matches scalar scaling."""
+    units = [99999, 1999, 1]
+    quantities = [3, 7, 1]
+    assert line_totals(units, quantities, 9000) == [scale(u * q, 9000) for u, q in zip(units, quantities)]
+    assert line_totals(units, quantities, 9000, ROUND_DOWN) == [269997, 12593, 0]
+
+
+@pytest.fixture
+def equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=999.99,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+def test_base_price_cents_follows_base_price(equipment):
+    """Test equipment keeps its cached cent price in step with base_price."""
+    assert equipment.base_price_cents == 99999
+    equipment.base_price = 19.99
+    assert equipment.base_price_cents == 1999
+    assert equipment.clone().base_price_cents == 1999
+
+
+def test_nested_decorators_are_exact(equipment):
+    """Test nested decorators round to whole cents at every layer."""
+    decorated = WarrantyDecorator(MaintenanceDecorator(InsuranceDecorator(equipment, "premium"), 12), 2)
+    # 99999 -> 114999 (x1.15, half up) -> 142599 (x1.24) -> 171119 (x1.2)
+    assert decorated.get_price_cents() == 171119
+    assert decorated.get_price() == 1711.19
+
+
+def test_strategies_and_orders_use_cents(equipment):
+    """Test strategies and order totals produce exact cent amounts."""
+    assert BulkPricingStrategy(threshold=3).calculate_price_cents(equipment, 3) == 269997
+    assert BulkPricingStrategy(threshold=3).calculate_price(equipment, 3) == 2699.97
+    assert LoyaltyPricing().calculate_price(equipment, 1, loyalty_points=50) == 949.99
+    order = Order(equipment=equipment, quantity=3, customer_id="CUST001")
+    assert order.get_total_price_cents() == 299997
+    assert order.get_total_price() == 2999.97
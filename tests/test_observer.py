@@ -2,6 +2,7 @@
 import pytest
 from uuid import uuid4
 from src.patterns.observer import (
+    OrderEvent,
     OrderObserver,
     NotificationSystem,
     EmailNotifier,
@@ -132,4 +133,75 @@ def test_observer_detachment(sample_order):
     
     system.notify(sample_order, "created")
     system.detach(sms_notifier)
-    system.notify(sample_order, "paid")
\ No newline at end of file
+    system.notify(sample_order, "paid")
+
+class EventLog(OrderObserver):
+    """Observer that records event payloads."""
+    def __init__(self):
+        self.events = []
+
+    def update(self, order, event_type):
+        self.events.append(event_type)
+
+    def on_event(self, event):
+        assert isinstance(event, OrderEvent)
+        super().on_event(event)
+
+def test_topic_subscriptions(sample_order):
+    """Test observers only receive the event types they subscribed to."""
+    system = NotificationSystem()
+    payments, everything = EventLog(), EventLog()
+    system.subscribe(payments, "paid", "refunded")
+    system.attach(everything)
+
+    for event in ("stock_validated", "paid", "fulfilled", "refunded"):
+        system.notify(sample_order, event)
+    assert payments.events == ["paid", "refunded"]
+    assert everything.events == ["stock_validated", "paid", "fulfilled", "refunded"]
+
+def test_predicate_subscription(sample_order, sample_equipment):
+    """Test predicates filter on the event payload."""
+    system = NotificationSystem()
+    large = EventLog()
+    system.subscribe(large, "paid", predicate=lambda event: event.order.quantity > 1)
+    small_order = sample_order
+    large_order = Order(equipment=sample_equipment, quantity=3, customer_id="CUST002")
+    system.notify(small_order, "paid")
+    system.notify(large_order, "paid")
+    assert large.events == ["paid"]
+
+def test_resubscribe_and_detach_update_routes(sample_order):
+    """Test changing subscriptions invalidates cached routes."""
+    system = NotificationSystem()
+    observer = EventLog()
+    system.subscribe(observer, "paid")
+    system.notify(sample_order, "fulfilled")
+    system.subscribe(observer, "fulfilled")
+    system.notify(sample_order, "fulfilled")
+    system.detach(observer)
+    system.notify(sample_order, "fulfilled")
+    assert observer.events == ["fulfilled"]
+
+def test_digest_uses_topic_routes(sample_order):
+    """Test digests reach observers through the topic index only."""
+    from src.patterns.coalescing import EventCoalescer
+    system = NotificationSystem(coalescer=EventCoalescer(window=60))
+    checked = []
+    payments, detached = EventLog(), EventLog()
+    system.subscribe(payments, "paid", predicate=lambda event: checked.append(event.event_type) or True)
+    system.subscribe(detached, "created")
+
+    class Detacher(EventLog):
+        def update_digest(self, order, event_types):
+            # Detaching while a digest is delivered must not break delivery
+            system.detach(detached)
+            super().update_digest(order, event_types)
+
+    detacher = Detacher()
+    system.attach(detacher)
+    for event in ("stock_validated", "paid", "fulfilled", "created"):
+        system.notify(sample_order, event)
+    assert checked == ["paid"]
+    assert payments.events == ["paid"]
+    assert detacher.events == ["stock_validated", "paid", "fulfilled", "created"]
+    system.coalescer.stop()
@@ -0,0 +1,170 @@
+"""Tests for the transactional outbox."""
+import time
+import pytest
+from sqlalchemy import create_engine, inspect
+from src.models.order import Order
+from src.patterns.outbox import Outbox, OutboxRelay
+from src.patterns.repository import SqlRepository
+from src.patterns.singleton import EquipmentInventory
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite engine on a temporary file."""
+    return create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+
+
+def make_order(customer_id="CUST001"):
+    """Create empty order for testing."""
+    return Order(equipment=None, quantity=0, customer_id=customer_id)
+
+
+def test_relay_delivers_in_batches(engine):
+    """Test pending rows are delivered in insertion order and batches."""
+    outbox = Outbox(engine)
+    orders = [make_order(f"CUST{index}") for index in range(5)]
+    for order in orders:
+        outbox.add(order, "created")
+    delivered = []
+    relay = OutboxRelay(outbox, lambda order, event: delivered.append((order.id, event)), batch_size=2)
+    assert relay.run_once() == 2
+    assert relay.drain() == 3
+    assert delivered == [(order.id, "created") for order in orders]
+    assert outbox.pending() == 0
+    assert relay.stats["batches"] == 3
+
+
+def test_failed_delivery_is_retried_with_backoff(engine):
+    """Test failures are kept and retried once their backoff passed."""
+    clock = FakeClock()
+    outbox = Outbox(engine, clock=clock)
+    outbox.add(make_order(), "created")
+    attempts = []
+
+    def flaky(order, event_type):
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise ConnectionError("SMTP down")
+
+    relay = OutboxRelay(outbox, flaky, backoff_base=1.0)
+    assert relay.run_once() == 0
+    assert relay.run_once() == 0  # backing off
+    clock.now += 1.0
+    assert relay.run_once() == 0
+    clock.now += 1.5
+    assert relay.run_once() == 0  # second backoff is 2s
+    clock.now += 0.5
+    assert relay.run_once() == 1
+    assert attempts == [1000.0, 1001.0, 1003.0]
+    assert relay.stats["failed"] == 2
+    assert relay.stats["max_delivery_lag"] == 3.0
+
+
+def test_dropped_delivery_is_retried(engine):
+    """Test a handler reporting a drop leaves the row pending for a retry."""
+    clock = FakeClock()
+    outbox = Outbox(engine, clock=clock)
+    outbox.add(make_order(), "created")
+    results = [False, True]
+    relay = OutboxRelay(outbox, lambda order, event_type: results.pop(0), backoff_base=1.0)
+    assert relay.run_once() == 0
+    assert outbox.pending() == 1
+    assert relay.stats["failed"] == 1
+    clock.now += 1.0
+    assert relay.run_once() == 1
+    assert outbox.pending() == 0
+
+
+def test_undelivered_rows_survive_restart(engine):
+    """Test rows written before a crash are delivered by a new relay."""
+    outbox = Outbox(engine)
+    order = make_order()
+    with engine.begin() as connection:
+        outbox.add(order, "created", connection=connection)
+
+    # New process: the order is no longer in memory, the stored snapshot is used
+    delivered = []
+    relay = OutboxRelay(Outbox(engine), lambda restored, event: delivered.append(restored))
+    assert relay.drain() == 1
+    assert delivered[0].id == order.id
+    assert delivered[0].customer_id == "CUST001"
+
+
+def test_rolled_back_transaction_leaves_no_event(engine):
+    """Test an event added in a failed transaction is not delivered."""
+    outbox = Outbox(engine)
+    with pytest.raises(RuntimeError):
+        with engine.begin() as connection:
+            outbox.add(make_order(), "created", connection=connection)
+            raise RuntimeError("order insert failed")
+    assert outbox.pending() == 0
+
+
+def test_sql_order_and_event_commit_together(engine):
+    """Test the SQL repository writes the order and its outbox row in one transaction."""
+    repository = SqlRepository(engine)
+    outbox = Outbox(engine)
+    order = make_order()
+    repository.add_order(order, lambda connection: outbox.add(order, "created", connection))
+    assert repository.get_order(order.id) is not None
+    assert outbox.pending() == 1
+
+    failing = make_order()
+
+    def add_then_fail(connection):
+        outbox.add(failing, "created", connection)
+        raise RuntimeError("crash before commit")
+
+    with pytest.raises(RuntimeError):
+        repository.add_order(failing, add_then_fail)
+    assert repository.get_order(failing.id) is None
+    assert outbox.pending() == 1
+
+
+def test_lag_metric_and_background_relay(engine):
+    """Test lag reflects the oldest pending row and the thread drains it."""
+    clock = FakeClock()
+    outbox = Outbox(engine, clock=clock)
+    order = make_order()
+    EquipmentInventory().add_order(order)
+    outbox.add(order, "created")
+    clock.now += 4
+    assert outbox.lag() == 4.0
+
+    delivered = []
+    relay = OutboxRelay(outbox, lambda live, event: delivered.append(live), interval=0.01)
+    relay.start()
+    deadline = time.monotonic() + 2
+    while not delivered and time.monotonic() < deadline:
+        time.sleep(0.01)
+    relay.stop(timeout=2)
+    assert delivered == [order]
+    assert relay.metrics()["lag_seconds"] == 0.0
+    assert outbox.purge(clock.now + 1) == 1
+
+
+def test_relay_validation(engine):
+    """Test invalid relay settings are rejected."""
+    outbox = Outbox(engine)
+    with pytest.raises(ValueError):
+        OutboxRelay(outbox, print, batch_size=0)
+    with pytest.raises(ValueError):
+        OutboxRelay(outbox, print, interval=0)
+
+
+def test_table_creation_can_be_deferred(engine):
+    """Test the table is only created when asked for."""
+    outbox = Outbox(engine, create_tables=False)
+    assert not inspect(engine).has_table("outbox")
+    outbox.create_tables()
+    outbox.add(make_order(), "created")
+    assert outbox.pending() == 1
@@ -0,0 +1,187 @@
+"""Tests for payment gateway client against the local stub gateway."""
+import asyncio
+import httpx
+import pytest
+from tests.stubs.payment_stub import create_stub_gateway
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.async_chain import AsyncOrderProcessorChain
+from src.patterns.payment_gateway import (
+    CircuitBreaker,
+    CircuitOpenError,
+    PaymentGatewayClient,
+    PaymentGatewayError
+)
+from src.patterns.singleton import EquipmentInventory
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def order():
+    """Create sample order for testing."""
+    equipment = Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+    return Order(equipment=equipment, quantity=2, customer_id="CUST001")
+
+
+def make_client(stub, **kwargs) -> PaymentGatewayClient:
+    """Create client wired to the in-process stub gateway."""
+    kwargs.setdefault("backoff_base", 0.0)
+    return PaymentGatewayClient("http://gateway", transport=httpx.ASGITransport(app=stub), **kwargs)
+
+
+def test_circuit_breaker_states():
+    """Test breaker opens, half-opens for one trial and closes again."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+
+
+def test_charge_approved_and_declined(order):
+    """Test approval and decline by amount."""
+    async def scenario():
+        stub = create_stub_gateway(decline_above_cents=30000)
+        async with make_client(stub) as client:
+            assert await client.charge(order) is True
+            big = Order(equipment=order.equipment, quantity=5, customer_id="CUST002")
+            assert await client.charge(big) is False
+    asyncio.run(scenario())
+
+
+def test_refund_only_approved_charges(order):
+    """Test refunds go through for approved charges only."""
+    async def scenario():
+        stub = create_stub_gateway()
+        async with make_client(stub) as client:
+            assert await client.refund(order) is False
+            await client.charge(order)
+            assert await client.refund(order) is True
+        assert stub.state.refunds == {order.id}
+        assert stub.state.idempotency_keys == [
+            f"{order.id}:refund", f"{order.id}:charge", f"{order.id}:refund"
+        ]
+    asyncio.run(scenario())
+
+
+def test_retries_transient_failures(order):
+    """Test 5xx responses are retried and then give up."""
+    async def scenario():
+        stub = create_stub_gateway(failure_rate=1.0)
+        async with make_client(stub, retries=2, breaker=CircuitBreaker(failure_threshold=10)) as client:
+            with pytest.raises(PaymentGatewayError, match="3 attempts"):
+                await client.charge(order)
+            assert await client(order) is False
+        assert stub.state.requests == 6
+    asyncio.run(scenario())
+
+
+def test_rate_limited_response_is_retried(order):
+    """Test 429 responses are retried instead of read as an answer."""
+    statuses = [429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"approved": True})
+
+    async def scenario():
+        client = PaymentGatewayClient("http://gateway", transport=httpx.MockTransport(handler),
+                                      backoff_base=0.0)
+        async with client:
+            assert await client.charge(order) is True
+        assert statuses == []
+    asyncio.run(scenario())
+
+
+def test_circuit_breaker_fails_fast(order):
+    """Test open circuit stops calling the gateway."""
+    async def scenario():
+        stub = create_stub_gateway(failure_rate=1.0)
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        async with make_client(stub, retries=5, breaker=breaker) as client:
+            with pytest.raises(CircuitOpenError):
+                await client.charge(order)
+        assert stub.state.requests == 2
+    asyncio.run(scenario())
+
+
+def test_cancelled_trial_frees_half_open_breaker(order):
+    """Test a cancelled half-open trial does not leave the breaker stuck."""
+    async def scenario():
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+        breaker.record_failure()
+        clock.now = 10.0
+        stub = create_stub_gateway(latency=0.5)
+        async with make_client(stub, timeout=5.0, breaker=breaker) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.charge(order), 0.05)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+    asyncio.run(scenario())
+
+
+def test_timeout_is_retried(order):
+    """Test slow gateway responses time out."""
+    async def scenario():
+        stub = create_stub_gateway(latency=0.5)
+        async with make_client(stub, timeout=0.05, retries=1) as client:
+            with pytest.raises(PaymentGatewayError):
+                await client.charge(order)
+    asyncio.run(scenario())
+
+
+def test_client_as_chain_payment_handler(order):
+    """Test client plugs into the async order chain."""
+    async def scenario():
+        EquipmentInventory().add_equipment(order.equipment, 2)
+        stub = create_stub_gateway()
+        async with make_client(stub, max_concurrency=2) as client:
+            chain = AsyncOrderProcessorChain(payment_handler=client)
+            assert await chain.process_order(order) is True
+        assert order.status == "fulfilled"
+        assert stub.state.charges == {order.id: True}
+    asyncio.run(scenario())
+
+
+def test_client_validation():
+    """Test invalid client settings."""
+    with pytest.raises(ValueError):
+        PaymentGatewayClient("http://gateway", max_concurrency=0)
+    with pytest.raises(ValueError):
+        PaymentGatewayClient("http://gateway", retries=-1)
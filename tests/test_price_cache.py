@@ -0,0 +1,142 @@
+"""Tests for price memoization cache."""
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.decorator import WarrantyDecorator, InsuranceDecorator
+from src.patterns.price_cache import PriceCache, price_cache
+from src.patterns.promo_codes import PromoCodeStore
+from src.patterns.singleton import EquipmentInventory
+from src.patterns.strategy import (
+    BulkPricingStrategy,
+    PromoCodePricing,
+    PremiumPricingStrategy
+)
+
+
+@pytest.fixture
+def equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+@pytest.fixture
+def clean_inventory():
+    """Clear inventory and shared cache around each test."""
+    inventory = EquipmentInventory()
+    inventory.clear()
+    price_cache.clear()
+    yield inventory
+    inventory.clear()
+    price_cache.clear()
+
+
+def test_get_price_hits(equipment):
+    """Test repeated lookups are served from cache."""
+    cache = PriceCache()
+    assert cache.get_price(equipment) == 100.0
+    assert cache.get_price(equipment) == 100.0
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_ratio == 0.5
+
+
+def test_get_price_cents_stays_integer(equipment):
+    """Test cent prices are cached as ints and orders total them without floats."""
+    cache = PriceCache()
+    decorated = WarrantyDecorator(equipment, 1)
+    assert cache.get_price_cents(decorated) == decorated.get_price_cents()
+    assert isinstance(cache.get_price_cents(decorated), int)
+    assert cache.hits == 1
+    order = Order(equipment=decorated, quantity=3, customer_id="CUST001")
+    assert order.get_total_price_cents() == decorated.get_price_cents() * 3
+
+
+def test_fingerprint_tracks_parameters(equipment):
+    """Test price-affecting changes produce new cache keys."""
+    cache = PriceCache()
+    assert cache.get_price(WarrantyDecorator(equipment, 1)) == pytest.approx(110.0)
+    assert cache.get_price(WarrantyDecorator(equipment, 2)) == pytest.approx(120.0)
+    assert cache.get_price(InsuranceDecorator(equipment, "premium")) == pytest.approx(115.0)
+    equipment.base_price = 200.0
+    assert cache.get_price(equipment) == 200.0
+    assert cache.hits == 0
+
+
+def test_strategy_calculate_price(equipment):
+    """Test strategy results are cached per quantity and kwargs."""
+    cache = PriceCache()
+    strategy = BulkPricingStrategy(threshold=5, discount_percent=10.0)
+    assert cache.calculate_price(strategy, equipment, 5) == pytest.approx(450.0)
+    assert cache.calculate_price(strategy, equipment, 5) == pytest.approx(450.0)
+    assert cache.calculate_price(strategy, equipment, 1) == pytest.approx(100.0)
+    assert cache.hits == 1
+
+    promo = PromoCodePricing()
+    promo.add_promo_code("SAVE10", 10.0)
+    assert cache.calculate_price(promo, equipment, 1, promo_code="SAVE10") == pytest.approx(90.0)
+    promo.add_promo_code("SAVE10", 20.0)
+    assert cache.calculate_price(promo, equipment, 1, promo_code="SAVE10") == pytest.approx(80.0)
+
+
+def test_uncacheable_strategy_bypasses_cache(equipment):
+    """Test strategies with external state are never cached."""
+    cache = PriceCache()
+    store = PromoCodeStore()
+    strategy = PromoCodePricing(store=store)
+    assert strategy.fingerprint() is None
+    assert cache.calculate_price(strategy, equipment, 1, promo_code="NEW") == 100.0
+    store.add_code("NEW", 50.0)
+    assert cache.calculate_price(strategy, equipment, 1, promo_code="NEW") == pytest.approx(50.0)
+    assert len(cache) == 0
+
+
+def test_equipment_strategy_in_fingerprint(equipment):
+    """Test equipment pricing strategy is part of the key."""
+    cache = PriceCache()
+    assert cache.get_price(equipment) == 100.0
+    equipment.set_pricing_strategy(PremiumPricingStrategy())
+    assert cache.get_price(equipment) == pytest.approx(120.0)
+
+
+def test_lru_eviction(equipment):
+    """Test cache stays bounded."""
+    cache = PriceCache(max_size=2)
+    strategy = BulkPricingStrategy()
+    for quantity in range(1, 5):
+        cache.calculate_price(strategy, equipment, quantity)
+    assert len(cache) == 2
+    assert cache.evictions == 2
+    cache.calculate_price(strategy, equipment, 4)
+    assert cache.hits == 1
+    with pytest.raises(ValueError):
+        PriceCache(max_size=0)
+
+
+def test_update_equipment_invalidates(clean_inventory, equipment):
+    """Test inventory updates bump version and drop cached prices."""
+    inventory = clean_inventory
+    inventory.add_equipment(equipment, 5)
+    order = Order(equipment=equipment, quantity=2, customer_id="CUST001")
+    assert order.get_total_price() == 200.0
+    assert len(price_cache) == 1
+
+    decorated = inventory.decorate_equipment(equipment.id, "warranty", warranty_months=24)
+    assert decorated._version == 1
+    assert len(price_cache) == 0
+    assert price_cache.invalidations == 1
+    order.equipment = inventory.get_equipment(equipment.id)
+    assert order.get_total_price() == pytest.approx(240.0)
+    assert price_cache.stats()["size"] == 1
@@ -0,0 +1,154 @@
+"""Tests for the pricing calendar."""
+from datetime import datetime, timedelta
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.pricing_calendar import (
+    PriceWindow,
+    PricingCalendar,
+    CalendarPricingStrategy,
+    seasonal_windows
+)
+from src.patterns.strategy import SeasonalPricingStrategy
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    def __init__(self, now: datetime):
+        self.now = now
+        self.calls = 0
+
+    def __call__(self) -> datetime:
+        self.calls += 1
+        return self.now
+
+
+def make_equipment(category: str = "Cardio") -> Equipment:
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category=category,
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+def test_window_validation():
+    """Test invalid windows are rejected."""
+    start = datetime(2025, 1, 1)
+    with pytest.raises(ValueError, match="after start"):
+        PriceWindow("bad", start, start, 10.0)
+    with pytest.raises(ValueError):
+        PriceWindow("bad", start, start + timedelta(days=1), 0.0)
+    with pytest.raises(ValueError, match="name"):
+        PriceWindow("", start, start + timedelta(days=1), 10.0)
+
+
+def test_snapshot_lookup_and_overlap():
+    """Test overlapping windows resolve to the best discount."""
+    calendar = PricingCalendar([
+        PriceWindow("spring", datetime(2025, 3, 1), datetime(2025, 6, 1), 10.0),
+        PriceWindow("flash", datetime(2025, 4, 1, 12), datetime(2025, 4, 1, 14), 40.0, category="Cardio"),
+    ], clock=FakeClock(datetime(2025, 1, 1)))
+    cardio = make_equipment("Cardio")
+    strength = make_equipment("Strength")
+
+    snapshot = calendar.snapshot_at(datetime(2025, 4, 1, 13))
+    assert snapshot.window_names == ("flash", "spring")
+    assert snapshot.discount_for(cardio) == 40.0
+    assert snapshot.discount_for(strength) == 10.0
+    assert calendar.snapshot_at(datetime(2025, 4, 1, 14)).window_names == ("spring",)
+    assert calendar.snapshot_at(datetime(2025, 6, 1)).window_names == ()
+    assert calendar.snapshot_at(datetime(2024, 1, 1)).window_names == ()
+
+
+def test_equipment_specific_window():
+    """Test scheduled price change for one item."""
+    equipment = make_equipment()
+    clock = FakeClock(datetime(2025, 5, 1))
+    calendar = PricingCalendar([
+        PriceWindow("clearance", datetime(2025, 5, 1), datetime(2025, 5, 8), 25.0, equipment_id=equipment.id),
+    ], clock=clock)
+    strategy = CalendarPricingStrategy(calendar)
+    assert strategy.calculate_price(equipment, 2) == pytest.approx(150.0)
+    assert strategy.calculate_price(make_equipment(), 2) == pytest.approx(200.0)
+
+
+def test_pricing_does_not_read_clock():
+    """Test per-call pricing uses the snapshot without clock lookups."""
+    clock = FakeClock(datetime(2025, 1, 10))
+    calendar = PricingCalendar(seasonal_windows([2025]), clock=clock)
+    strategy = CalendarPricingStrategy(calendar)
+    calls = clock.calls
+    for _ in range(100):
+        assert strategy.calculate_price(make_equipment()) == pytest.approx(80.0)
+    assert clock.calls == calls
+
+
+def test_seasonal_strategy_follows_calendar():
+    """Test seasonal pricing reads the calendar snapshot instead of the clock."""
+    clock = FakeClock(datetime(2025, 2, 27))
+    calendar = PricingCalendar(seasonal_windows([2025]), clock=clock)
+    strategy = SeasonalPricingStrategy(discount_percent=20.0, calendar=calendar)
+    equipment = make_equipment()
+    calls = clock.calls
+    assert strategy.calculate_price(equipment) == pytest.approx(80.0)
+    winter = strategy.fingerprint()
+    assert clock.calls == calls
+
+    clock.now = datetime(2025, 3, 1)
+    calendar.refresh()
+    assert strategy.calculate_price(equipment) == pytest.approx(100.0)
+    assert strategy.fingerprint() != winter
+
+
+def test_add_and_remove_window():
+    """Test windows can be scheduled and cancelled."""
+    clock = FakeClock(datetime(2025, 7, 1))
+    calendar = PricingCalendar(clock=clock)
+    assert calendar.next_boundary is None
+    calendar.add_window(PriceWindow("summer", datetime(2025, 7, 1), datetime(2025, 8, 1), 15.0))
+    assert calendar.active.window_names == ("summer",)
+    assert calendar.next_boundary == datetime(2025, 8, 1)
+    calendar.remove_window("summer")
+    assert calendar.active.window_names == ()
+
+
+def test_year_of_simulated_time():
+    """Test a full year of hourly pricing switches only at boundaries."""
+    clock = FakeClock(datetime(2025, 1, 1))
+    windows = seasonal_windows([2025], discount_percent=20.0) + [
+        PriceWindow("black-friday", datetime(2025, 11, 28), datetime(2025, 12, 1), 30.0),
+        PriceWindow("flash", datetime(2025, 6, 15, 10), datetime(2025, 6, 15, 12), 50.0, category="Cardio"),
+    ]
+    calendar = PricingCalendar(windows, clock=clock)
+    strategy = CalendarPricingStrategy(calendar)
+    equipment = make_equipment()
+
+    flash_hours = 0
+    moment = datetime(2025, 1, 1)
+    while moment < datetime(2026, 1, 1):
+        clock.now = moment
+        calendar.refresh()
+        price = strategy.calculate_price(equipment)
+        if moment.month in (12, 1, 2):
+            assert price == pytest.approx(80.0)
+        elif datetime(2025, 11, 28) <= moment:
+            assert price == pytest.approx(70.0)
+        elif datetime(2025, 6, 15, 10) <= moment < datetime(2025, 6, 15, 12):
+            assert price == pytest.approx(50.0)
+            flash_hours += 1
+        else:
+            assert price == pytest.approx(100.0)
+        moment += timedelta(hours=1)
+
+    assert flash_hours == 2
+    # Boundaries crossed: Feb 1, Mar 1, Jun 15 10:00 and 12:00, Nov 28, Dec 1
+    assert calendar.switch_count == 6
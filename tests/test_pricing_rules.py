@@ -0,0 +1,188 @@
+"""Tests for the composable pricing rule engine."""
+import gc
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.strategy import (
+    BulkPricingStrategy,
+    PremiumPricingStrategy,
+    PromoCodePricing,
+    LoyaltyPricing,
+    PriceCalculator
+)
+from src.patterns.promo_codes import PromoCodeStore
+from src.patterns.pricing_rules import (
+    PricingRule,
+    PricingRuleSet,
+    RuleEnginePricingStrategy,
+    _compiled_plans,
+    compile_rule_set
+)
+
+
+@pytest.fixture
+def equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+@pytest.fixture
+def promo():
+    """Create promo code strategy."""
+    strategy = PromoCodePricing()
+    strategy.add_promo_code("SAVE10", 10.0)
+    return strategy
+
+
+def test_rules_stack(equipment, promo):
+    """Test stackable rules multiply their discounts."""
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("bulk", BulkPricingStrategy(threshold=5, discount_percent=10.0)),
+        PricingRule("promo", promo),
+    ))
+    plan = rule_set.compile()
+    assert plan.calculate_price(equipment, 5, promo_code="SAVE10") == pytest.approx(405.0)
+    assert plan.calculate_price(equipment, 1, promo_code="SAVE10") == pytest.approx(90.0)
+    assert plan.calculate_price(equipment, 1) == pytest.approx(100.0)
+
+
+def test_exclusive_group_applies_best_rule(equipment, promo):
+    """Test only the best rule of an exclusive group applies."""
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("promo", promo, exclusive_group="coupon"),
+        PricingRule("loyalty", LoyaltyPricing(), exclusive_group="coupon"),
+    ))
+    plan = rule_set.compile()
+    assert plan.calculate_price(equipment, 1, promo_code="SAVE10", loyalty_points=200) == pytest.approx(85.0)
+    assert plan.calculate_price(equipment, 1, promo_code="SAVE10", loyalty_points=50) == pytest.approx(90.0)
+
+
+def test_only_winning_promo_is_redeemed(equipment):
+    """Test a single-use code that loses its exclusive group is not used up."""
+    store = PromoCodeStore()
+    store.add_code("ONCE10", 10, max_redemptions=1)
+    plan = PricingRuleSet(rules=(
+        PricingRule("promo", PromoCodePricing(store=store), exclusive_group="coupon"),
+        PricingRule("loyalty", LoyaltyPricing(), exclusive_group="coupon"),
+    )).compile()
+    price = plan.calculate_price(equipment, 1, promo_code="ONCE10", loyalty_points=200, redeem=True)
+    assert price == pytest.approx(85.0)
+    assert store.get_redemptions("ONCE10") == 0
+    price = plan.calculate_price(equipment, 1, promo_code="ONCE10", loyalty_points=0, redeem=True)
+    assert price == pytest.approx(90.0)
+    assert store.get_redemptions("ONCE10") == 1
+    # Used up: the code no longer wins, so checkout falls back to loyalty
+    price = plan.calculate_price(equipment, 1, promo_code="ONCE10", loyalty_points=200, redeem=True)
+    assert price == pytest.approx(85.0)
+
+
+def test_non_stackable_rule_competes_with_stack(equipment, promo):
+    """Test non-stackable rule wins only if it beats the stacked result."""
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("bulk", BulkPricingStrategy(threshold=2, discount_percent=10.0)),
+        PricingRule("promo", promo),
+        PricingRule("loyalty", LoyaltyPricing(), stackable=False),
+    ))
+    plan = rule_set.compile()
+    # Stack: 0.9 * 0.9 = 0.81 beats loyalty 0.85
+    assert plan.calculate_price(equipment, 2, promo_code="SAVE10", loyalty_points=200) == pytest.approx(162.0)
+    # Without promo: 0.9 loses to loyalty 0.85
+    assert plan.calculate_price(equipment, 2, loyalty_points=200) == pytest.approx(170.0)
+
+
+def test_discount_cap(equipment, promo):
+    """Test total discount never exceeds the ceiling."""
+    rule_set = PricingRuleSet(
+        rules=(
+            PricingRule("bulk", BulkPricingStrategy(threshold=1, discount_percent=20.0)),
+            PricingRule("promo", promo),
+        ),
+        max_discount_percent=20.0
+    )
+    assert rule_set.compile().calculate_price(equipment, 1, promo_code="SAVE10") == pytest.approx(80.0)
+
+
+def test_markup_rules(equipment):
+    """Test markup strategies are composed as factors above one."""
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("premium", PremiumPricingStrategy()),
+        PricingRule("loyalty", LoyaltyPricing()),
+    ))
+    assert rule_set.compile().calculate_price(equipment, 1, loyalty_points=100) == pytest.approx(108.0)
+
+
+def test_priority_orders_plan(promo):
+    """Test rules are ordered by priority in the compiled plan."""
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("promo", promo, priority=20),
+        PricingRule("loyalty", LoyaltyPricing(), priority=10),
+    ))
+    assert rule_set.compile().rule_names == ("loyalty", "promo")
+
+
+def test_rule_set_compiled_once(promo):
+    """Test equal rule sets share one compiled plan."""
+    rule = PricingRule("promo", promo)
+    rule_set = PricingRuleSet(rules=(rule,))
+    first = compile_rule_set(rule_set)
+    second = compile_rule_set(PricingRuleSet(rules=[rule]))
+    assert first is second
+
+
+def test_compiled_plans_are_dropped_with_rule_set(promo):
+    """Test the plan cache does not keep discarded rule sets alive."""
+    cached = len(_compiled_plans)
+    rule_set = PricingRuleSet(rules=(PricingRule("promo", promo),))
+    compile_rule_set(rule_set)
+    assert len(_compiled_plans) == cached + 1
+    del rule_set
+    gc.collect()
+    assert len(_compiled_plans) == cached
+
+
+def test_plan_prices_in_integer_cents(equipment):
+    """Test stacked rules are combined without float drift."""
+    equipment.base_price = 19.99
+    rule_set = PricingRuleSet(rules=(
+        PricingRule("bulk", BulkPricingStrategy()),
+        PricingRule("premium", PremiumPricingStrategy())
+    ))
+    plan = compile_rule_set(rule_set)
+    cents = plan.calculate_price_cents(equipment, 3)
+    assert isinstance(cents, int)
+    assert plan.calculate_price(equipment, 3) == cents / 100
+
+
+def test_rule_set_validation(promo):
+    """Test rule set validation."""
+    with pytest.raises(ValueError, match="at least one rule"):
+        PricingRuleSet(rules=())
+    with pytest.raises(ValueError, match="unique"):
+        PricingRuleSet(rules=(PricingRule("a", promo), PricingRule("a", LoyaltyPricing())))
+    with pytest.raises(ValueError):
+        PricingRuleSet(rules=(PricingRule("a", promo),), max_discount_percent=150.0)
+    with pytest.raises(ValueError, match="PricingStrategy"):
+        PricingRule("a", object())
+
+
+def test_rule_engine_strategy(equipment, promo):
+    """Test rule engine plugs into existing strategy consumers."""
+    strategy = RuleEnginePricingStrategy(PricingRuleSet(rules=(PricingRule("promo", promo),)))
+    calculator = PriceCalculator(strategy)
+    assert calculator.calculate_price(equipment, quantity=2, promo_code="SAVE10") == pytest.approx(180.0)
+    equipment.set_pricing_strategy(strategy)
+    assert equipment.get_price() == pytest.approx(100.0)
+    with pytest.raises(ValueError):
+        strategy.calculate_price(equipment, 0)
@@ -0,0 +1,186 @@
+"""Tests for promo code store."""
+import threading
+from datetime import datetime, timedelta
+import pytest
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.strategy import PromoCodePricing
+from src.patterns.promo_codes import BloomFilter, PromoCodeStore
+
+NOW = datetime(2025, 1, 15, 12, 0)
+
+
+@pytest.fixture
+def store():
+    """Create promo code store with a few codes."""
+    store = PromoCodeStore(expected_codes=16)
+    store.add_code("SAVE10", 10.0)
+    store.add_code("ONCE", 25.0, max_redemptions=1)
+    store.add_code("OLD", 15.0, expires_at=NOW - timedelta(days=1))
+    return store
+
+
+def test_bloom_filter_no_false_negatives():
+    """Test Bloom filter always contains added items."""
+    bloom = BloomFilter(1000, 0.01)
+    codes = [f"CODE{i}" for i in range(1000)]
+    for code in codes:
+        bloom.add(code)
+    assert all(code in bloom for code in codes)
+    false_positives = sum(f"MISS{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_bloom_filter_validation():
+    """Test Bloom filter parameter validation."""
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.5)
+
+
+def test_get_discount(store):
+    """Test discount lookup respects normalization and expiry."""
+    assert store.get_discount(" save10 ", now=NOW) == 10.0
+    assert store.get_discount("OLD", now=NOW) is None
+    assert store.get_discount("OLD", now=NOW - timedelta(days=2)) == 15.0
+    assert store.get_discount("UNKNOWN", now=NOW) is None
+    assert store.get_discount("", now=NOW) is None
+    assert "save10" in store
+    assert len(store) == 3
+
+
+def test_redeem_usage_limit(store):
+    """Test single-use codes can only be redeemed once."""
+    assert store.redeem("once", now=NOW) == 25.0
+    with pytest.raises(ValueError, match="usage limit"):
+        store.redeem("ONCE", now=NOW)
+    assert store.get_redemptions("ONCE") == 1
+    assert store.get_discount("ONCE", now=NOW) is None
+
+
+def test_redeem_errors(store):
+    """Test redemption of unknown and expired codes."""
+    with pytest.raises(ValueError, match="Unknown"):
+        store.redeem("NOPE", now=NOW)
+    with pytest.raises(ValueError, match="expired"):
+        store.redeem("OLD", now=NOW)
+
+
+def test_redeem_is_atomic():
+    """Test concurrent redemptions never exceed the limit."""
+    store = PromoCodeStore()
+    store.add_code("LIMITED", 10.0, max_redemptions=50)
+    successes = []
+
+    def worker():
+        for _ in range(20):
+            try:
+                store.redeem("LIMITED")
+                successes.append(1)
+            except ValueError:
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(successes) == 50
+    assert store.get_redemptions("LIMITED") == 50
+
+
+def test_add_code_validation():
+    """Test invalid codes are rejected."""
+    store = PromoCodeStore()
+    with pytest.raises(ValueError, match="Invalid promo code"):
+        store.add_code("", 10.0)
+    with pytest.raises(ValueError):
+        store.add_code("X", 100.0)
+    with pytest.raises(ValueError, match="Max redemptions"):
+        store.add_code("X", 10.0, max_redemptions=0)
+
+
+def test_store_grows_past_expected_capacity():
+    """Test Bloom filter is rebuilt when the store outgrows it."""
+    store = PromoCodeStore(expected_codes=4)
+    store.bulk_add((f"C{i}", 5.0, None, None) for i in range(100))
+    assert all(store.get_discount(f"C{i}") == 5.0 for i in range(100))
+    assert store.memory_stats()["codes"] == 100
+
+
+def test_load_file(tmp_path):
+    """Test bulk loading codes from CSV file."""
+    path = tmp_path / "codes.csv"
+    path.write_text(
+        "code,discount_percent,expires_at,max_redemptions\n"
+        "SPRING,10,2025-03-01T00:00:00,\n"
+        "VIP,20,,5\n",
+        encoding="utf-8"
+    )
+    store = PromoCodeStore()
+    assert store.load_file(str(path)) == 2
+    assert store.get_discount("SPRING", now=NOW) == 10.0
+    assert store.get_discount("SPRING", now=datetime(2025, 4, 1)) is None
+    assert store.get_discount("VIP", now=NOW) == 20.0
+
+
+def test_load_file_invalid_row(tmp_path):
+    """Test malformed rows report their line number."""
+    path = tmp_path / "codes.csv"
+    path.write_text("GOOD,10\nBAD\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        PromoCodeStore().load_file(str(path))
+
+
+def test_promo_pricing_uses_store(store):
+    """Test PromoCodePricing falls back to the store."""
+    equipment = Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+    strategy = PromoCodePricing(store=store)
+    assert strategy.calculate_price(equipment, 2, promo_code="save10") == pytest.approx(180.0)
+    assert strategy.calculate_price(equipment, 1, promo_code="BOT-GUESS") == 100.0
+
+
+def test_discounts_keep_full_precision():
+    """Test discounts are stored as doubles, not float32."""
+    store = PromoCodeStore()
+    store.add_code("ODD", 10.1)
+    assert store.get_discount("ODD") == 10.1
+
+
+def test_promo_pricing_redeems_when_charging(store):
+    """Test charging with a single-use code uses it up while quotes do not."""
+    equipment = Equipment(
+        name="Test Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+    strategy = PromoCodePricing(store=store)
+    assert strategy.calculate_price(equipment, 1, promo_code="once") == 75.0
+    assert store.get_redemptions("ONCE") == 0
+    assert strategy.calculate_price(equipment, 1, promo_code="once", redeem=True) == 75.0
+    assert store.get_redemptions("ONCE") == 1
+    with pytest.raises(ValueError, match="usage limit"):
+        strategy.calculate_price(equipment, 1, promo_code="once", redeem=True)
+    assert strategy.calculate_price(equipment, 1, promo_code="once") == 100.0
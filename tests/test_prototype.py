@@ -0,0 +1,40 @@
+"""Tests for the equipment prototype registry."""
+from src.patterns.builder import EquipmentDirector, PowerRackBuilder, TreadmillBuilder
+from src.patterns.prototype import EquipmentPrototypeRegistry
+
+
+def test_clone_matches_director_build():
+    """Test clones equal a director build apart from the ID."""
+    registry = EquipmentPrototypeRegistry()
+    for builder_type in (TreadmillBuilder, PowerRackBuilder):
+        built = EquipmentDirector(builder_type()).build_basic_model("Blue")
+        cloned = registry.build(builder_type, "Blue")
+        assert cloned.dict() == built.dict()
+        assert cloned.id != built.id
+
+
+def test_clones_get_fresh_ids_and_own_specs():
+    """Test clones do not share IDs or specs with each other."""
+    registry = EquipmentPrototypeRegistry()
+    first = registry.build(TreadmillBuilder, "Red")
+    second = registry.build(TreadmillBuilder, "Red")
+    assert first.id != second.id
+    first.specs.color = "White"
+    assert second.specs.color == "Red"
+    assert registry.template(TreadmillBuilder, "Red").specs.color == "Red"
+
+
+def test_templates_cached_per_builder_and_color():
+    """Test each combination is built once and unknown colors share the default."""
+    registry = EquipmentPrototypeRegistry()
+    registry.build(TreadmillBuilder, "Red")
+    registry.build(TreadmillBuilder, "Red")
+    registry.build(TreadmillBuilder, "Gray")
+    registry.build(PowerRackBuilder, "Red")
+    assert registry.misses == 3
+    assert registry.hits == 1
+    assert registry.build(PowerRackBuilder, "Neon").specs.color == "Black/Red"
+    assert registry.build(PowerRackBuilder).specs.color == "Black/Red"
+    assert len(registry) == 4
+    registry.clear()
+    assert len(registry) == 0
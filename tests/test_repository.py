@@ -0,0 +1,249 @@
+"""Tests for inventory repositories and keyset pagination."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import text
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.models.order import Order
+from src.patterns.database_singleton import create_database_engine
+from src.patterns.repository import InMemoryRepository, SqlRepository
+from src.patterns.singleton import EquipmentInventory
+
+
+def make_equipment(index: int, category: str = "Cardio", price: float = 100.0) -> Equipment:
+    """Create equipment with a predictable ID."""
+    return Equipment(
+        id=f"EQ-{index:03d}",
+        name=f"Item {index}",
+        description="Test Description",
+        base_price=price,
+        category=category,
+        specs=EquipmentSpecs(
+            weight="75.0", dimensions="200x100x220", material="Steel",
+            color="Black", max_user_weight="150.0", warranty_months="12"
+        ),
+        attributes={"motor_power": 2.0 + index % 3}
+    )
+
+
+def make_order(index: int, equipment: Equipment, customer_id: str = "CUST001",
+               status: str = "pending") -> Order:
+    """Create order created ``index`` minutes after a fixed time."""
+    return Order(
+        id=f"ORD-{index:03d}", equipment=equipment, quantity=1, customer_id=customer_id,
+        customer_email="john@example.com", status=status,
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=index)
+    )
+
+
+@pytest.fixture(params=["memory", "sql"])
+def repository(request):
+    """Each repository backend, empty."""
+    if request.param == "memory":
+        return InMemoryRepository()
+    return SqlRepository(create_database_engine("sqlite:///:memory:"))
+
+
+def test_equipment_and_stock(repository):
+    """Test storing equipment, adding stock and reserving it."""
+    equipment = make_equipment(1)
+    assert repository.add_equipment(equipment, 3) is True
+    assert repository.add_equipment(equipment, 2) is False
+    assert repository.get_stock(equipment.id) == 5
+    stored = repository.get_equipment(equipment.id)
+    assert stored.to_dict() == equipment.to_dict()
+    assert repository.adjust_stock(equipment.id, -4) is True
+    assert repository.adjust_stock(equipment.id, -2) is False
+    assert repository.adjust_stock("missing", -1) is False
+    assert repository.get_stock(equipment.id) == 1
+    assert repository.get_equipment("missing") is None
+
+
+def test_save_equipment_keeps_stock(repository):
+    """Test replacing equipment data leaves stock alone."""
+    repository.add_equipment(make_equipment(1), 4)
+    updated = make_equipment(1, price=150.0)
+    updated._version = 1
+    repository.save_equipment(updated)
+    stored = repository.get_equipment(updated.id)
+    assert stored.base_price == 150.0
+    assert stored._version == 1
+    assert repository.get_stock(updated.id) == 4
+
+
+def test_get_equipment_many_keeps_order(repository):
+    """Test batched lookups return known IDs in the requested order."""
+    for index in range(3):
+        repository.add_equipment(make_equipment(index), 1)
+    found = repository.get_equipment_many(["EQ-002", "missing", "EQ-000"])
+    assert [equipment.id for equipment in found] == ["EQ-002", "EQ-000"]
+    assert repository.get_equipment_many([]) == []
+
+
+def test_orders_upsert_and_status(repository):
+    """Test orders are replaced by ID and statuses persist."""
+    equipment = make_equipment(1)
+    repository.add_equipment(equipment, 1)
+    order = make_order(1, equipment)
+    repository.add_order(order)
+    order.status = "paid"
+    repository.add_order(order)
+    repository.update_order_status(order.id, "fulfilled")
+    stored = repository.get_order(order.id)
+    assert stored.status == "fulfilled"
+    assert stored.equipment.id == equipment.id
+    assert stored.created_at == order.created_at
+    assert [stored.id for stored in repository.all_orders()] == [order.id]
+    repository.clear()
+    assert repository.all_orders() == [] and repository.all_equipment() == []
+
+
+def test_equipment_keyset_pages(repository):
+    """Test walking all pages returns each match once, in price order."""
+    prices = [300.0, 100.0, 200.0, 100.0, 250.0, 120.0, 100.0]
+    for index, price in enumerate(prices):
+        repository.add_equipment(make_equipment(index, "Strength" if index % 2 else "Cardio", price), 1)
+    seen, cursor = [], None
+    while True:
+        page = repository.list_equipment(min_price=100.0, max_price=260.0, after=cursor, limit=2)
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [(item.base_price, item.id) for item in seen] == sorted(
+        (price, f"EQ-{index:03d}") for index, price in enumerate(prices) if price <= 260.0
+    )
+    cardio = repository.list_equipment(category="Cardio", limit=10)
+    assert [item.id for item in cardio.items] == ["EQ-006", "EQ-002", "EQ-004", "EQ-000"]
+    assert cardio.next_cursor is None
+
+
+def test_order_keyset_pages_with_filters(repository):
+    """Test order pages filter by customer and status."""
+    equipment = make_equipment(1)
+    repository.add_equipment(equipment, 1)
+    for index in range(7):
+        repository.add_order(make_order(index, equipment, customer_id=f"CUST00{index % 2}",
+                                        status="paid" if index < 5 else "pending"))
+    first = repository.list_orders(customer_id="CUST000", limit=2)
+    assert [order.id for order in first.items] == ["ORD-000", "ORD-002"]
+    second = repository.list_orders(customer_id="CUST000", after=first.next_cursor, limit=2)
+    assert [order.id for order in second.items] == ["ORD-004", "ORD-006"]
+    assert second.next_cursor is None
+    paid = repository.list_orders(customer_id="CUST001", status="paid", limit=10)
+    assert [order.id for order in paid.items] == ["ORD-001", "ORD-003"]
+    with pytest.raises(ValueError):
+        repository.list_orders(after="not-a-cursor")
+    with pytest.raises(ValueError):
+        repository.list_orders(limit=0)
+
+
+def test_bulk_load_upserts(repository):
+    """Test bulk loads insert new rows, replace data and add stock of known ones."""
+    items = [make_equipment(index, price=index + 1.0) for index in range(25)]
+    assert repository.bulk_add_equipment(((item, 2) for item in items), chunk_size=10) == 25
+    changed = make_equipment(3, price=300.0)
+    assert repository.bulk_add_equipment([(changed, 5)], chunk_size=10) == 1
+    assert repository.get_stock(changed.id) == 7
+    assert repository.get_equipment(changed.id).to_dict() == changed.to_dict()
+    assert len(repository.all_equipment()) == 25
+
+    orders = [make_order(index, items[index % 25]) for index in range(30)]
+    assert repository.bulk_add_orders(orders, chunk_size=7) == 30
+    orders[0].status = "shipped"
+    repository.bulk_add_orders(orders[:1])
+    stored = repository.get_order(orders[0].id)
+    assert stored.status == "shipped"
+    assert stored.created_at == orders[0].created_at
+    assert [order.id for order in repository.list_orders(limit=100).items] == [order.id for order in orders]
+    with pytest.raises(ValueError):
+        repository.bulk_add_orders(orders, chunk_size=0)
+
+
+def test_sql_orders_with_time_zones_page_by_instant():
+    """Test aware creation times are stored as UTC so pages follow the real order."""
+    repository = SqlRepository(create_database_engine("sqlite:///:memory:"))
+    equipment = make_equipment(1)
+    repository.add_equipment(equipment, 1)
+    kyiv = timezone(timedelta(hours=2))
+    # 09:00+02:00 is 07:00 UTC: the earliest of the three
+    times = [datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc),
+             datetime(2024, 1, 1, 9, 0, tzinfo=kyiv),
+             datetime(2024, 1, 1, 7, 30, tzinfo=timezone.utc)]
+    orders = [Order(id=f"ORD-{index}", equipment=equipment, quantity=1, customer_id="CUST001",
+                    created_at=created_at) for index, created_at in enumerate(times)]
+    repository.add_order(orders[0])
+    repository.bulk_add_orders(orders[1:])
+    first = repository.list_orders(limit=2)
+    second = repository.list_orders(after=first.next_cursor, limit=2)
+    assert [order.id for order in first.items + second.items] == ["ORD-1", "ORD-2", "ORD-0"]
+
+
+def test_sql_bulk_load_rebuilds_deferred_indexes():
+    """Test deferred indexes are dropped during the load and exist afterwards."""
+    repository = SqlRepository(create_database_engine("sqlite:///:memory:"))
+    equipment = make_equipment(1)
+    repository.add_equipment(equipment, 1)
+    seen = []
+
+    def orders():
+        with repository.engine.connect() as connection:
+            seen.append(connection.execute(text(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'orders' "
+                "AND name LIKE 'ix_%'"
+            )).scalar())
+        yield make_order(1, equipment)
+
+    repository.bulk_add_orders(orders(), defer_indexes=True)
+    with repository.engine.connect() as connection:
+        names = {row[0] for row in connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'orders'"
+        ))}
+    assert seen == [0]
+    assert {"ix_orders_created", "ix_orders_customer_created", "ix_orders_status_created"} <= names
+
+
+def test_sql_list_queries_use_indexes():
+    """Test filtered order pages are served by the composite index."""
+    repository = SqlRepository(create_database_engine("sqlite:///:memory:"))
+    with repository.engine.connect() as connection:
+        plan = " ".join(str(row) for row in connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM orders WHERE customer_id = 'C' "
+            "AND (created_at > '2024-01-01' OR (created_at = '2024-01-01' AND id > 'x')) "
+            "ORDER BY created_at, id LIMIT 10"
+        )))
+    assert "ix_orders_customer_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_inventory_runs_on_sql_repository():
+    """Test the inventory singleton works unchanged on the SQL backend."""
+    inventory = EquipmentInventory()
+    previous = inventory.repository
+    try:
+        inventory.use_repository(SqlRepository(create_database_engine("sqlite:///:memory:")))
+        equipment = make_equipment(1)
+        inventory.add_equipment(equipment, 2)
+        assert inventory.remove_equipment(equipment, 1) is True
+        assert inventory.get_equipment_stock(equipment.id) == 1
+        assert [item.id for item in inventory.find_equipment(ranges={"motor_power": (3.0, None)})] == [equipment.id]
+        inventory.update_equipment(equipment.id, make_equipment(1, price=90.0))
+        assert inventory.get_equipment(equipment.id).base_price == 90.0
+        order = make_order(1, equipment)
+        inventory.add_order(order)
+        inventory.update_order_status(order.id, "shipped")
+        assert inventory.get_order(order.id).status == "shipped"
+        assert inventory.list_orders(status="shipped").items[0].id == order.id
+
+        assert inventory.bulk_add_equipment([(make_equipment(2), 4), (make_equipment(1), 1)]) == 2
+        assert inventory.get_equipment_stock(equipment.id) == 2
+        assert len(inventory.find_equipment(ranges={"motor_power": (None, None)})) == 2
+        with pytest.raises(ValueError):
+            inventory.bulk_add_equipment([(make_equipment(3), 0)])
+        # The chunk holding the invalid pair is neither written nor indexed
+        with pytest.raises(ValueError):
+            inventory.bulk_add_equipment([(make_equipment(4), 1), (make_equipment(5), 1),
+                                          (make_equipment(6), 0)])
+        assert inventory.get_equipment("EQ-004") is None
+        assert len(inventory.find_equipment(ranges={"motor_power": (None, None)})) == 2
+    finally:
+        inventory.use_repository(previous)
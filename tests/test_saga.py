@@ -0,0 +1,236 @@
+"""Tests for saga compensation and recovery."""
+import asyncio
+import threading
+import pytest
+from sqlalchemy import create_engine
+from src.models.order import Order
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.async_chain import AsyncOrderProcessorChain
+from src.patterns.chain import OrderProcessorChain
+from src.patterns.observer import NotificationSystem, OrderObserver
+from src.patterns.payment_gateway import PaymentGatewayError
+from src.patterns.saga import (
+    COMPENSATED,
+    COMPENSATING,
+    COMPLETED,
+    STEP_COMPENSATION_FAILED,
+    InMemorySagaLog,
+    SqlSagaLog,
+    completed_stages
+)
+from src.patterns.singleton import EquipmentInventory
+
+
+class EventRecorder(OrderObserver):
+    """Observer that records event types."""
+    def __init__(self):
+        self.events = []
+
+    def update(self, order: Order, event_type: str) -> None:
+        self.events.append(event_type)
+
+
+@pytest.fixture
+def sample_equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Saga Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+@pytest.fixture
+def recorder():
+    """Notification system with an event recorder attached."""
+    system = NotificationSystem()
+    recorder = EventRecorder()
+    system.attach(recorder)
+    return system, recorder
+
+
+def make_order(equipment, quantity=1):
+    """Create order for testing."""
+    return Order(equipment=equipment, quantity=quantity, customer_id="CUST001")
+
+
+def test_fulfillment_failure_refunds_payment(sample_equipment, recorder):
+    """Test a failed fulfillment compensates the payment."""
+    system, events = recorder
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    log = InMemorySagaLog()
+    chain = OrderProcessorChain(system, saga_log=log)
+    # Stock disappears between validation and fulfillment
+    chain.stock_validator._validate = lambda order: True
+
+    order = make_order(sample_equipment, 2)
+    assert chain.process_order(order) is False
+    assert order.status == "refunded"
+    assert events.events[-1] == "refunded"
+    assert log.status(order.id) == COMPENSATED
+    assert log.history(order.id) == [
+        ("StockValidator", "completed"),
+        ("PaymentProcessor", "completed"),
+        ("OrderFulfillment", "failed"),
+        ("PaymentProcessor", "compensated"),
+        ("StockValidator", "compensated"),
+    ]
+
+
+def test_successful_saga_is_completed(sample_equipment):
+    """Test a successful order marks the saga completed."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    log = InMemorySagaLog()
+    order = make_order(sample_equipment)
+    assert OrderProcessorChain(saga_log=log).process_order(order) is True
+    assert log.status(order.id) == COMPLETED
+    assert completed_stages(log.history(order.id)) == [
+        "StockValidator", "PaymentProcessor", "OrderFulfillment"
+    ]
+
+
+def test_recovery_resumes_without_rerunning_stages(sample_equipment, recorder, tmp_path):
+    """Test recovery from a persisted log skips completed stages."""
+    system, events = recorder
+    inventory = EquipmentInventory()
+    inventory.add_equipment(sample_equipment, 1)
+    engine = create_engine(f"sqlite:///{tmp_path / 'saga.db'}")
+
+    # Simulate a crash after payment: fulfillment never returns
+    chain = OrderProcessorChain(system, saga_log=SqlSagaLog(engine))
+
+    def crash(order):
+        raise SystemExit("crash")
+
+    chain.order_fulfillment._validate = crash
+    order = make_order(sample_equipment)
+    with pytest.raises(SystemExit):
+        chain.process_order(order)
+    assert events.events == ["stock_validated", "paid"]
+
+    # A new process picks the saga up from the database
+    log = SqlSagaLog(engine)
+    assert [entry[0] for entry in log.unfinished()] == [order.id]
+    results = OrderProcessorChain(system, saga_log=log).recover()
+    assert [(recovery.order.id, recovery.completed) for recovery in results] == [(order.id, True)]
+    assert results[0].order.status == "fulfilled"
+    assert events.events == ["stock_validated", "paid", "fulfilled"]
+    assert inventory.get_equipment_stock(sample_equipment.id) == 0
+    assert log.status(order.id) == COMPLETED
+    assert log.unfinished() == []
+
+
+def test_recovery_finishes_interrupted_compensation(sample_equipment, recorder):
+    """Test recovery continues compensating where it stopped."""
+    system, events = recorder
+    log = InMemorySagaLog()
+    order = make_order(sample_equipment)
+    order.status = "paid"
+    log.begin(order)
+    log.record(order.id, "StockValidator", "completed", "stock_validated")
+    log.record(order.id, "PaymentProcessor", "completed", "paid")
+    log.set_status(order.id, "compensating")
+
+    results = OrderProcessorChain(system, saga_log=log).recover()
+    assert [(recovery.order.id, recovery.completed) for recovery in results] == [(order.id, False)]
+    assert events.events == ["refunded"]
+    assert log.status(order.id) == COMPENSATED
+
+
+def test_async_chain_refunds_through_handler(sample_equipment):
+    """Test async compensation awaits the refund handler."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    refunded = []
+
+    async def refund(order):
+        refunded.append(order.id)
+        return True
+
+    chain = AsyncOrderProcessorChain(refund_handler=refund)
+    chain.stock_validator.processor._validate = lambda order: True
+    order = make_order(sample_equipment, 5)
+    assert asyncio.run(chain.process_order(order)) is False
+    assert refunded == [order.id]
+    assert order.status == "refunded"
+
+
+@pytest.mark.parametrize("outcome", [False, "raise"])
+def test_failed_refund_is_retried_on_recovery(sample_equipment, recorder, outcome):
+    """Test a declined or failing refund keeps the saga compensating for a retry."""
+    system, events = recorder
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    attempts = []
+
+    async def refund(order):
+        attempts.append(order.id)
+        if len(attempts) > 1:
+            return True
+        if outcome == "raise":
+            raise PaymentGatewayError("gateway down")
+        return False
+
+    log = InMemorySagaLog()
+    chain = AsyncOrderProcessorChain(system, refund_handler=refund, saga_log=log)
+    chain.stock_validator.processor._validate = lambda order: True
+    order = make_order(sample_equipment, 5)
+    assert asyncio.run(chain.process_order(order)) is False
+    assert order.status == "paid"
+    assert "refunded" not in events.events
+    assert log.status(order.id) == COMPENSATING
+    assert ("AsyncPaymentProcessor", STEP_COMPENSATION_FAILED) in log.history(order.id)
+
+    results = asyncio.run(chain.recover())
+    assert [(recovery.order.id, recovery.completed) for recovery in results] == [(order.id, False)]
+    assert len(attempts) == 2
+    assert events.events[-1] == "refunded"
+    assert log.status(order.id) == COMPENSATED
+
+
+def test_sync_chain_refunds_through_handler(sample_equipment):
+    """Test sync compensation calls the refund handler and checks its answer."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    log = InMemorySagaLog()
+    chain = OrderProcessorChain(saga_log=log, refund_handler=lambda order: False)
+    chain.stock_validator._validate = lambda order: True
+    order = make_order(sample_equipment, 5)
+    assert chain.process_order(order) is False
+    assert order.status == "paid"
+    assert log.status(order.id) == COMPENSATING
+
+
+def test_async_saga_runs_sql_log_off_the_event_loop(sample_equipment, tmp_path, monkeypatch):
+    """Test blocking saga log calls happen in worker threads."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    log = SqlSagaLog(create_engine(f"sqlite:///{tmp_path / 'saga.db'}"))
+    threads = set()
+    original = log.record
+
+    def record(*args):
+        threads.add(threading.get_ident())
+        original(*args)
+
+    monkeypatch.setattr(log, "record", record)
+    order = make_order(sample_equipment)
+    assert asyncio.run(AsyncOrderProcessorChain(saga_log=log).process_order(order)) is True
+    assert threads and threading.get_ident() not in threads
+    assert log.status(order.id) == COMPLETED
+
+
+def test_in_memory_log_evicts_finished_sagas(sample_equipment):
+    """Test finished sagas beyond the cap are dropped."""
+    log = InMemorySagaLog(max_finished=2)
+    orders = [make_order(sample_equipment) for _ in range(3)]
+    for order in orders:
+        log.begin(order)
+        log.set_status(order.id, COMPLETED)
+    assert log.status(orders[0].id) is None
+    assert log.status(orders[2].id) == COMPLETED
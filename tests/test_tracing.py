@@ -0,0 +1,168 @@
+"""Tests for span tracing."""
+import asyncio
+import subprocess
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.models.order import Order
+from src.models.equipment import Equipment, EquipmentSpecs
+from src.patterns.async_chain import AsyncOrderProcessorChain
+from src.patterns.chain import OrderProcessorChain
+from src.patterns.singleton import EquipmentInventory
+from src.patterns.tracing import (
+    Histogram,
+    InMemorySpanExporter,
+    NDJSONSpanExporter,
+    Tracer,
+    folded_stacks,
+    get_current_trace_id,
+    load_spans,
+    stage_summary,
+    tracer
+)
+
+
+@pytest.fixture
+def exporter():
+    """Attach an in-memory exporter to the global tracer."""
+    exporter = InMemorySpanExporter()
+    tracer.add_exporter(exporter)
+    yield exporter
+    tracer.remove_exporter(exporter)
+
+
+@pytest.fixture
+def sample_equipment():
+    """Create sample equipment for testing."""
+    return Equipment(
+        name="Traced Equipment",
+        description="Test Description",
+        base_price=100.0,
+        category="Test",
+        specs=EquipmentSpecs(
+            weight="75.0",
+            dimensions="200x100x220",
+            material="Steel",
+            color="Black",
+            max_user_weight="150.0",
+            warranty_months="12"
+        )
+    )
+
+
+def test_nested_spans_share_trace_and_link_parent():
+    """Test child spans point at their parent within one trace."""
+    local = Tracer()
+    exporter = InMemorySpanExporter()
+    local.add_exporter(exporter)
+    with local.trace("trace-1"):
+        with local.span("outer"):
+            with local.span("inner", step=1):
+                assert get_current_trace_id() == "trace-1"
+    inner, outer = exporter.spans
+    assert inner.trace_id == outer.trace_id == "trace-1"
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+    assert inner.attributes == {"step": 1}
+    assert get_current_trace_id() is None
+
+
+def test_histogram_buckets():
+    """Test durations land in the right bucket."""
+    histogram = Histogram(buckets=(1.0, 10.0))
+    for value in (0.5, 5.0, 50.0, 1.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["max_ms"] == 50.0
+    assert snapshot["buckets"] == {"le_1": 2, "le_10": 1, "le_inf": 1}
+
+
+def test_sync_chain_emits_stage_spans(exporter, sample_equipment):
+    """Test each sync stage and its notifications are traced."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    order = Order(equipment=sample_equipment, quantity=1, customer_id="CUST001")
+    assert OrderProcessorChain().process_order(order)
+
+    names = [span.name for span in exporter.spans if span.attributes.get("order_id") == order.id]
+    assert "stage.StockValidator" in names
+    assert "stage.PaymentProcessor" in names
+    assert "stage.OrderFulfillment" in names
+    assert "notify.paid" in names
+    assert "stage.PaymentProcessor" in tracer.histograms()
+
+
+def test_async_chain_names_spans_after_wrapped_stage(exporter, sample_equipment):
+    """Test async spans follow tasks and use the wrapped processor name."""
+    EquipmentInventory().add_equipment(sample_equipment, 1)
+    order = Order(equipment=sample_equipment, quantity=1, customer_id="CUST001")
+
+    async def run():
+        with tracer.trace("async-trace"):
+            return await AsyncOrderProcessorChain().process_order(order)
+
+    assert asyncio.run(run())
+    traced = [span for span in exporter.spans if span.trace_id == "async-trace"]
+    names = {span.name for span in traced}
+    assert {"stage.StockValidator", "stage.AsyncPaymentProcessor", "stage.OrderFulfillment"} <= names
+    notify = next(span for span in traced if span.name == "notify.paid")
+    parent = next(span for span in traced if span.span_id == notify.parent_id)
+    assert parent.name == "stage.AsyncPaymentProcessor"
+
+
+def test_api_propagates_trace_id(exporter):
+    """Test the middleware honours and returns X-Trace-Id."""
+    client = TestClient(app)
+    response = client.get("/health", headers={"X-Trace-Id": "abc123"})
+    assert response.headers["X-Trace-Id"] == "abc123"
+    assert any(span.name == "GET /health" and span.trace_id == "abc123" for span in exporter.spans)
+    assert client.get("/health").headers["X-Trace-Id"]
+    assert "GET /health" in client.get("/metrics/spans").json()
+
+
+def test_api_spans_use_route_templates(exporter):
+    """Test request spans are named per route, not per concrete path."""
+    client = TestClient(app)
+    client.get("/orders/first/timeline")
+    client.get("/orders/second/timeline")
+    names = {span.name for span in exporter.spans}
+    assert "GET /orders/{order_id}/timeline" in names
+    assert not any("first" in name or "second" in name for name in names)
+
+
+def test_api_replaces_invalid_trace_id(exporter):
+    """Test oversized or odd client trace IDs are not echoed back."""
+    client = TestClient(app)
+    for bad in ("x" * 65, "abc<script>"):
+        returned = client.get("/health", headers={"X-Trace-Id": bad}).headers["X-Trace-Id"]
+        assert returned != bad and len(returned) == 32
+
+
+def test_ndjson_export_and_report(tmp_path):
+    """Test NDJSON round trip, stage summary, folded stacks and the report script."""
+    path = tmp_path / "spans.ndjson"
+    local = Tracer()
+    ndjson = NDJSONSpanExporter(str(path))
+    local.add_exporter(ndjson)
+    for _ in range(3):
+        with local.trace():
+            with local.span("request"):
+                with local.span("stage"):
+                    pass
+    ndjson.close()
+
+    spans = load_spans(str(path))
+    assert len(spans) == 6
+    summary = stage_summary(spans)
+    assert summary["stage"]["count"] == 3
+    assert summary["request"]["p95_ms"] >= summary["request"]["p50_ms"]
+    assert set(folded_stacks(spans)) == {"request", "request;stage"}
+
+    folded = tmp_path / "stacks.txt"
+    result = subprocess.run(
+        [sys.executable, "scripts/span_report.py", str(path), "--folded", str(folded)],
+        capture_output=True, text=True, check=True
+    )
+    assert "request" in result.stdout
+    assert folded.read_text().splitlines()[1].startswith("request;stage ")